@@ -1,4 +1,6 @@
 from .routes.data.prices import router as prices_router
 from .routes.data.validation import router as validation_router
+from .routes.metrics import router as metrics_router
+from .routes.backtest import router as backtest_router
 
-__all__ = ["prices_router", "validation_router"]
\ No newline at end of file
+__all__ = ["prices_router", "validation_router", "metrics_router", "backtest_router"]
\ No newline at end of file
@@ -0,0 +1,56 @@
+import time
+from datetime import date
+
+from fastapi import APIRouter
+
+from app.backtest.engine import run_strategy_backtest
+from app.backtest.metrics import summary_stats
+from app.core.timing import TimedRoute, timed
+from app.schemas.backtest import BacktestRequest, BacktestResponse
+
+router = APIRouter(prefix="/backtest", tags=["backtest"], route_class=TimedRoute)
+
+
+@router.post("/run", response_model=BacktestResponse)
+async def run_backtest_endpoint(payload: BacktestRequest):
+    """
+    Run a vectorized backtest of a built-in signal over stored daily closes
+    and return summary statistics with the daily equity, return, turnover
+    and cost curves.
+    """
+    t0 = time.perf_counter()
+
+    # 1️⃣ Load the price panel and run the engine
+    result = await run_strategy_backtest(
+        payload.symbols,
+        payload.start,
+        payload.end,
+        strategy=payload.strategy,
+        cost_bps=payload.cost_bps,
+        long_only=payload.long_only,
+        initial_capital=payload.initial_capital,
+        lookback=payload.lookback,
+        skip=payload.skip,
+        fast=payload.fast,
+        slow=payload.slow,
+    )
+
+    # 2️⃣ Summarize
+    with timed("render"):
+        stats = summary_stats(result.returns, result.equity, result.turnover)
+        response = BacktestResponse(
+            start=payload.start,
+            end=payload.end,
+            strategy=payload.strategy,
+            symbols=result.symbols,
+            stats=stats,
+            dates=[date.fromordinal(o) for o in result.days.tolist()],
+            equity=result.equity.tolist(),
+            returns=result.returns.tolist(),
+            turnover=result.turnover.tolist(),
+            costs=result.costs.tolist(),
+            elapsed_ms=int((time.perf_counter() - t0) * 1000),
+        )
+
+    # 3️⃣ Return
+    return response
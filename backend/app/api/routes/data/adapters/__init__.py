@@ -1,2 +1,8 @@
 from .ingest_prices import *
-from .validation import *
\ No newline at end of file
+from .validation import *
+from .price_stream import *
+from .price_columns import *
+from .price_export import *
+from .conditional import *
+from .pagination import *
+from .validation_stream import *
@@ -0,0 +1,67 @@
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.db.crud.data_versions import DataVersion
+
+
+def price_etag(versions: Dict[str, DataVersion], *query_parts) -> str:
+    """
+    Build a strong ETag from the per-symbol data versions plus the query
+    parameters that shape the response (range, format, ...). The versions
+    come from the DB, so every worker builds the same tag for the same data.
+    """
+    h = hashlib.sha1()
+    for symbol in sorted(versions):
+        v = versions[symbol]
+        h.update(f"|{symbol}:{v.row_count}:{v.generation}".encode())
+    for part in query_parts:
+        h.update(f"|{part}".encode())
+    return f'"{h.hexdigest()}"'
+
+
+def last_modified_of(versions: Dict[str, DataVersion]) -> datetime:
+    return max(v.last_modified for v in versions.values())
+
+
+def validator_headers(etag: str, last_modified: datetime) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since
+
+    return False
+
+
+def not_modified_response(etag: str, last_modified: datetime) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def maybe_not_modified(request: Request, etag: str, last_modified: datetime) -> Optional[Response]:
+    """Return a 304 response if the client's cached copy is still current."""
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    return None
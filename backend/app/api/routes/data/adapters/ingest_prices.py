@@ -1,7 +1,8 @@
 from collections import defaultdict
 from datetime import date
-from typing import List
+from typing import List, Optional
 
+from app.core.dates import trading_day_runs, unique_ordinals
 from app.data_ingestion.models import RetryReason
 from app.schemas import (
     IngestPricesResponse,
@@ -26,7 +27,14 @@ def adapt_orchestration_result(
     dry_run: bool,
     fetch_results: list[list[dict]],
     rows_inserted: dict,
+    rows_revised: Optional[dict] = None,
+    compact: bool = False,
 ) -> IngestPricesResponse:
+    """
+    Aggregate per-attempt fetch results into one IngestSymbolResult per symbol.
+    compact=True reports missing dates as (first, last) trading-day runs
+    in missing_ranges and leaves missing_dates empty.
+    """
     per_symbol = defaultdict(list)
 
     # Flatten into symbol buckets
@@ -68,9 +76,9 @@ def adapt_orchestration_result(
         coverage_values = [r.get("coverage") for r in symbol_runs if r.get("coverage") is not None]
         coverage = min(coverage_values) if coverage_values else None
 
-        missing_dates = sorted(
-            {d for r in symbol_runs for d in r.get("missing_dates", [])}
-        )
+        missing = unique_ordinals(d for r in symbol_runs for d in r.get("missing_dates", []))
+        missing_ranges = trading_day_runs(missing) if compact else None
+        missing_dates = [] if compact else [date.fromordinal(o) for o in missing.tolist()]
 
         rows_fetched = sum(
             0 if r["result"].data is None else len(r["result"].data)
@@ -98,8 +106,10 @@ def adapt_orchestration_result(
                 retry_reason=retry_reason,
                 coverage=coverage,
                 missing_dates=missing_dates,
+                missing_ranges=missing_ranges,
                 rows_fetched=rows_fetched,
                 rows_inserted=rows_inserted[symbol],
+                rows_revised=(rows_revised or {}).get(symbol, 0),
                 elapsed_ms=elapsed_ms,
                 error=error,
             )
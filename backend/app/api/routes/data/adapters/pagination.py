@@ -0,0 +1,48 @@
+import base64
+import hashlib
+import json
+from datetime import date
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def _query_fingerprint(symbols: List[str], start: Optional[date], end: Optional[date]) -> str:
+    """Tie a cursor to the query that produced it."""
+    raw = f"{','.join(sorted(set(symbols)))}|{start}|{end}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def encode_page_cursor(
+    symbols: List[str],
+    start: Optional[date],
+    end: Optional[date],
+    last_key: Tuple[str, date]
+) -> str:
+    """Opaque continuation token for the (symbol, date) key after which the next page starts."""
+    symbol, last_date = last_key
+    payload = {"q": _query_fingerprint(symbols, start, end), "s": symbol, "d": last_date.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(
+    cursor: str,
+    symbols: List[str],
+    start: Optional[date],
+    end: Optional[date]
+) -> Tuple[str, date]:
+    """
+    Decode a continuation token back to its (symbol, date) key.
+    Raises 400 for malformed tokens or tokens issued for a different query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = (str(payload["s"]), date.fromisoformat(payload["d"]))
+        fingerprint = payload["q"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if fingerprint != _query_fingerprint(symbols, start, end):
+        raise HTTPException(status_code=400, detail="Pagination cursor does not match this query")
+    return key
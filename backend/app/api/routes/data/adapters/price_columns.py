@@ -0,0 +1,95 @@
+import gzip
+import json
+from datetime import date, datetime
+from typing import AsyncIterable, Dict, List
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.timing import timed
+
+# Bodies smaller than this are not worth a gzip frame
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+
+def _iso_date(value) -> str:
+    """Render a driver date value as YYYY-MM-DD."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    # SQLite hands dates back as ISO strings
+    return str(value)[:10]
+
+
+def _round_float32(values: List[float]) -> List[float]:
+    """Round to float32 precision (~7 significant digits) so the JSON text stays short."""
+    return [float(f"{v:.7g}") for v in values]
+
+
+def _new_series(symbol: str) -> Dict[str, list]:
+    return {"symbol": symbol, "dates": [], "open": [], "high": [], "low": [], "close": [], "volume": []}
+
+
+async def build_columnar_prices(
+    batches: AsyncIterable[List[tuple]],
+    float32: bool = False
+) -> dict:
+    """
+    Pivot raw (symbol, date, open, high, low, close, volume) cursor batches,
+    grouped by symbol and ordered by date, into per-symbol parallel arrays.
+    Each batch is transposed once and sliced per symbol run; no row objects are built.
+    """
+    series: List[Dict[str, list]] = []
+    current = None
+
+    async for batch in batches:
+        if not batch:
+            continue
+        symbols, dates, opens, highs, lows, closes, volumes = zip(*batch)
+
+        run_start = 0
+        for i in range(1, len(symbols) + 1):
+            if i < len(symbols) and symbols[i] == symbols[run_start]:
+                continue
+
+            symbol = symbols[run_start]
+            if current is None or current["symbol"] != symbol:
+                current = _new_series(symbol)
+                series.append(current)
+
+            current["dates"].extend(_iso_date(d) for d in dates[run_start:i])
+            current["open"].extend(opens[run_start:i])
+            current["high"].extend(highs[run_start:i])
+            current["low"].extend(lows[run_start:i])
+            current["close"].extend(closes[run_start:i])
+            current["volume"].extend(volumes[run_start:i])
+            run_start = i
+
+    if float32:
+        for s in series:
+            for field in ("open", "high", "low", "close"):
+                s[field] = _round_float32(s[field])
+
+    return {"format": "columnar", "float32": float32, "series": series}
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def render_columnar_prices(payload: dict, compress: bool = False) -> Response:
+    """
+    Serialize a columnar payload without re-validating it through Pydantic.
+    With compress, bodies of GZIP_MIN_SIZE bytes or more are gzip-encoded;
+    this is the only price response that is, so streamed NDJSON and the
+    already compressed export formats are never buffered by a compressor.
+    """
+    with timed("render"):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        headers = {}
+        if compress and len(body) >= GZIP_MIN_SIZE:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,115 @@
+from datetime import date, datetime
+from typing import AsyncGenerator, AsyncIterable, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.timing import timed
+
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+PRICES_ARROW_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("date", pa.date32()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.int64()),
+])
+
+
+class _ChunkSink:
+    """
+    Minimal writable file object that buffers bytes until drained,
+    so writer output can be yielded as soon as each batch is encoded.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    # SQLite hands dates back as ISO strings
+    return date.fromisoformat(str(value)[:10])
+
+
+def price_rows_to_record_batch(batch: List[tuple]) -> pa.RecordBatch:
+    """
+    Convert raw (symbol, date, open, high, low, close, volume) tuples into
+    one Arrow record batch with PRICES_ARROW_SCHEMA.
+    """
+    symbols, dates, opens, highs, lows, closes, volumes = zip(*batch)
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(symbols, type=pa.string()),
+            pa.array([_as_date(d) for d in dates], type=pa.date32()),
+            pa.array(opens, type=pa.float64()),
+            pa.array(highs, type=pa.float64()),
+            pa.array(lows, type=pa.float64()),
+            pa.array(closes, type=pa.float64()),
+            pa.array([int(v) for v in volumes], type=pa.int64()),
+        ],
+        schema=PRICES_ARROW_SCHEMA,
+    )
+
+
+async def stream_arrow_ipc(batches: AsyncIterable[List[tuple]]) -> AsyncGenerator[bytes, None]:
+    """
+    Encode cursor batches as an Arrow IPC stream, one record batch per cursor batch.
+    Only the batch being encoded is held in memory.
+    """
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, PRICES_ARROW_SCHEMA)
+    yield sink.drain()
+
+    async for batch in batches:
+        if not batch:
+            continue
+        with timed("render"):
+            writer.write_batch(price_rows_to_record_batch(batch))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+async def stream_parquet(batches: AsyncIterable[List[tuple]]) -> AsyncGenerator[bytes, None]:
+    """
+    Encode cursor batches as a Parquet file, one row group per cursor batch.
+    The footer is emitted once the cursor is exhausted.
+    """
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, PRICES_ARROW_SCHEMA, compression="zstd")
+
+    async for batch in batches:
+        if not batch:
+            continue
+        with timed("render"):
+            writer.write_batch(price_rows_to_record_batch(batch))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,60 @@
+import json
+from datetime import date, datetime
+from typing import AsyncIterable, AsyncGenerator, List
+
+from fastapi import Request
+
+from app.core.timing import timed
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    True if the client asked for newline-delimited JSON via the Accept header.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _iso_datetime(value) -> str:
+    """
+    Render a driver date value the same way PriceDataRow serializes its datetime.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return f"{value.isoformat()}T00:00:00"
+    # SQLite hands dates back as ISO strings
+    return datetime.fromisoformat(str(value)).isoformat()
+
+
+def price_rows_to_ndjson(batch: List[tuple]) -> bytes:
+    """
+    Serialize a batch of raw (symbol, date, open, high, low, close, volume)
+    tuples into NDJSON lines matching the PriceDataRow JSON shape.
+    """
+    dumps = json.dumps
+    return "".join(
+        dumps({
+            "symbol": row[0],
+            "date": _iso_datetime(row[1]),
+            "open": float(row[2]),
+            "high": float(row[3]),
+            "low": float(row[4]),
+            "close": float(row[5]),
+            "volume": float(row[6]),
+        }) + "\n"
+        for row in batch
+    ).encode()
+
+
+async def stream_price_ndjson(batches: AsyncIterable[List[tuple]]) -> AsyncGenerator[bytes, None]:
+    """
+    Yield one NDJSON chunk per cursor batch, so the first bytes go out
+    as soon as the first batch is fetched.
+    """
+    async for batch in batches:
+        with timed("render"):
+            chunk = price_rows_to_ndjson(batch)
+        yield chunk
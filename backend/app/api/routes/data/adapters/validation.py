@@ -1,10 +1,20 @@
+from datetime import date
 from typing import List
+from app.core.dates import trading_day_runs, unique_ordinals
 from app.data_validation.models import ValidationResult
-from app.schemas.prices.validation import ValidationResultRow, ValidationIssueRow
+from app.data_validation.repair import RepairReport
+from app.schemas.prices.validation import (
+    RepairFetchRow,
+    RepairPricesResponse,
+    SymbolRepairRow,
+    ValidationIssueRow,
+    ValidationResultRow,
+)
 
-def adapt_validation_result(results: List[ValidationResult]) -> List[ValidationResultRow]:
+def adapt_validation_result(results: List[ValidationResult], compact: bool = False) -> List[ValidationResultRow]:
     """
     Convert domain ValidationResult objects into API-ready Pydantic models.
+    compact=True replaces date lists with (first, last) trading-day runs.
     """
     response = []
     for r in results:
@@ -12,7 +22,8 @@ def adapt_validation_result(results: List[ValidationResult]) -> List[ValidationR
             ValidationIssueRow(
                 code=i.code,
                 description=i.description,
-                affected_dates=i.affected_dates,
+                affected_dates=None if compact else i.affected_dates,
+                affected_ranges=trading_day_runs(unique_ordinals(i.affected_dates)) if compact else None,
                 count=i.count
             )
             for i in r.issues
@@ -30,7 +41,35 @@ def adapt_validation_result(results: List[ValidationResult]) -> List[ValidationR
                 expected_days=5,
                 observed_days=3,
                 missing_dates=r.missing_dates,
+                missing_ranges=trading_day_runs(unique_ordinals(r.missing_dates)) if compact else None,
                 elapsed_ms=r.elapsed_ms
             )
         )
     return response
+
+
+def adapt_repair_report(report: RepairReport, start: date, end: date) -> RepairPricesResponse:
+    """
+    Convert a domain RepairReport into the API response model.
+    """
+    return RepairPricesResponse(
+        start=start,
+        end=end,
+        dry_run=report.dry_run,
+        fetches=[RepairFetchRow(symbols=f.symbols, start=f.start, end=f.end) for f in report.fetches],
+        results=[
+            SymbolRepairRow(
+                symbol=s.symbol,
+                coverage_before=s.coverage_before,
+                coverage_after=s.coverage_after,
+                missing_before=s.missing_before,
+                missing_after=s.missing_after,
+                flagged_before=s.flagged_before,
+                flagged_after=s.flagged_after,
+                rows_inserted=s.rows_inserted,
+                rows_revised=s.rows_revised,
+            )
+            for s in report.symbols
+        ],
+        elapsed_ms=report.elapsed_ms,
+    )
@@ -0,0 +1,64 @@
+import json
+import time
+from typing import AsyncIterable, AsyncGenerator
+
+from fastapi import Request
+
+from app.core.logging import get_logger
+from app.core.timing import timed
+from app.data_validation.models import ValidationResult
+from .validation import adapt_validation_result
+
+logger = get_logger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_sse(request: Request) -> bool:
+    """
+    True if the client asked for server-sent events via the Accept header.
+    """
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _event(kind: str, payload: str, sse: bool) -> bytes:
+    """One NDJSON line, or one SSE event named `kind`, around a JSON object."""
+    if sse:
+        return f"event: {kind}\ndata: {payload}\n\n".encode()
+    return f"{payload}\n".encode()
+
+
+async def stream_validation_events(
+    results: AsyncIterable[ValidationResult],
+    total: int,
+    compact: bool = False,
+    sse: bool = False
+) -> AsyncGenerator[bytes, None]:
+    """
+    Render each ValidationResult as a 'result' event as soon as it arrives:
+    {"type", "completed", "total", "status_counts", "result": ValidationResultRow}.
+    Ends with a 'done' event carrying the final counters and elapsed_ms, or
+    an 'error' event if validation failed part-way.
+    """
+    t0 = time.perf_counter()
+    completed = 0
+    status_counts = {"ok": 0, "partial": 0, "fail": 0}
+
+    def progress(kind: str) -> dict:
+        return {"type": kind, "completed": completed, "total": total, "status_counts": status_counts}
+
+    try:
+        async for result in results:
+            completed += 1
+            status_counts[result.status.value] += 1
+            with timed("render"):
+                (row,) = adapt_validation_result([result], compact=compact)
+                payload = json.dumps({**progress("result"), "result": row.model_dump(mode="json")})
+            yield _event("result", payload, sse)
+    except Exception as e:
+        logger.exception("streamed validation failed after %d/%d symbols", completed, total)
+        yield _event("error", json.dumps({**progress("error"), "error": str(e)}), sse)
+        return
+
+    done = {**progress("done"), "elapsed_ms": int((time.perf_counter() - t0) * 1000)}
+    yield _event("done", json.dumps(done), sse)
@@ -1,30 +1,181 @@
-from fastapi import APIRouter, BackgroundTasks, Query
+from fastapi import APIRouter, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import date
-from typing import List
+from typing import List, Union
 
-from app.core.logging import get_logger
-from app.schemas import GetPricesPayload, PriceDataRow, IngestPricesResponse, IngestPricesRequest
-from app.db.crud import get_prices
-from app.data_ingestion import orchestrate_fetch_and_insert
+from app.core.logging import RateLimitedLogger, correlation_scope, get_correlation_id, get_logger, new_correlation_id
+from app.core.timing import TimedRoute
+from app.schemas import (
+    GetPricesPayload,
+    PriceDataRow,
+    PricesPage,
+    ColumnarPricesResponse,
+    IngestPricesResponse,
+    IngestPricesRequest,
+    ExportPricesRequest,
+    GetReturnsPayload,
+    PriceReturnRow,
+)
+from app.db.crud import (
+    get_prices,
+    get_prices_page,
+    get_resampled_prices,
+    get_returns,
+    iter_price_batches,
+    iter_resampled_batches,
+    get_data_versions,
+    price_cache,
+    resample_cache,
+)
+from app.data_ingestion import orchestrate_fetch_and_insert, orchestrate_fetch_and_upsert
+from .adapters.conditional import last_modified_of, maybe_not_modified, price_etag, validator_headers
 from .adapters.ingest_prices import adapt_orchestration_result
+from .adapters.pagination import decode_page_cursor, encode_page_cursor
+from .adapters.price_columns import accepts_gzip, build_columnar_prices, render_columnar_prices
+from .adapters.price_export import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    stream_arrow_ipc,
+    stream_parquet,
+)
+from .adapters.price_stream import NDJSON_MEDIA_TYPE, stream_price_ndjson, wants_ndjson
 
 
-router = APIRouter(prefix="/market-data", tags=["ohlcv"])
+router = APIRouter(prefix="/market-data", tags=["ohlcv"], route_class=TimedRoute)
 logger = get_logger(__name__)
+# Per-symbol ingestion lines; large jobs would otherwise log thousands of them
+symbol_logger = RateLimitedLogger(logger, interval=1.0)
 
 
 @router.get("/ohlcv/{symbol}", response_model=List[PriceDataRow])
-async def get_prices_single(symbol: str, start: date | None = None, end: date | None = None):
+async def get_prices_single(
+    request: Request,
+    response: Response,
+    symbol: str,
+    start: date | None = None,
+    end: date | None = None,
+    interval: str = Query("1d", pattern=r"^(1d|1w|1mo|[1-9][0-9]*d)$")
+):
+    """
+    Supports conditional GETs: If-None-Match / If-Modified-Since are answered
+    with 304 from the in-memory data version, without touching dbo.prices.
+    interval other than '1d' returns server-side resampled bars.
+    """
+    ndjson = wants_ndjson(request)
+    versions = await get_data_versions([symbol])
+    etag = price_etag(versions, start, end, interval, "ndjson" if ndjson else "json")
+    last_modified = last_modified_of(versions)
+
+    not_modified = maybe_not_modified(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    headers = {**validator_headers(etag, last_modified), "Vary": "Accept"}
+    if ndjson:
+        return StreamingResponse(
+            stream_price_ndjson(_price_batches([symbol], start, end, interval)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+
     rows = []
-    async for row in get_prices([symbol], start, end):
+    async for row in _price_rows([symbol], start, end, interval):
         rows.append(row)
+    response.headers.update(headers)
     return rows
 
 
-@router.post("/ohlcv/query", response_model=List[PriceDataRow])
-async def get_prices_bulk(payload: GetPricesPayload):
+def _price_batches(symbols: List[str], start: date | None, end: date | None, interval: str):
+    """Raw tuple batches for the adapters: stored daily rows or resampled bars."""
+    if interval == "1d":
+        return iter_price_batches(symbols, start, end)
+    return iter_resampled_batches(symbols, start, end, interval)
+
+
+def _price_rows(symbols: List[str], start: date | None, end: date | None, interval: str):
+    if interval == "1d":
+        return get_prices(symbols=symbols, start=start, end=end)
+    return get_resampled_prices(symbols, start, end, interval)
+
+
+@router.post("/ohlcv/query", response_model=Union[List[PriceDataRow], PricesPage, ColumnarPricesResponse])
+async def get_prices_bulk(request: Request, response: Response, payload: GetPricesPayload):
+    """
+    Query stored OHLCV rows. Set page_size to get keyset-paginated PricesPage
+    responses; follow next_cursor until it is null. Set interval to '1w',
+    '1mo' or '<N>d' for resampled bars (not combinable with page_size).
+    """
+    ndjson = wants_ndjson(request)
+    versions = await get_data_versions(payload.symbols)
+    etag = price_etag(
+        versions,
+        payload.start,
+        payload.end,
+        payload.interval,
+        "ndjson" if ndjson else payload.format,
+        payload.float32,
+        payload.page_size,
+        payload.cursor,
+    )
+    headers = {**validator_headers(etag, last_modified_of(versions)), "Vary": "Accept"}
+
+    if payload.page_size is not None:
+        after = None
+        if payload.cursor:
+            after = decode_page_cursor(payload.cursor, payload.symbols, payload.start, payload.end)
+
+        rows, has_more = await get_prices_page(
+            payload.symbols,
+            payload.start,
+            payload.end,
+            page_size=payload.page_size,
+            after=after,
+        )
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_page_cursor(
+                payload.symbols, payload.start, payload.end, (last.symbol, last.date.date())
+            )
+        response.headers.update(headers)
+        return PricesPage(rows=rows, next_cursor=next_cursor)
+
+    if ndjson:
+        return StreamingResponse(
+            stream_price_ndjson(_price_batches(payload.symbols, payload.start, payload.end, payload.interval)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    if payload.format == "columnar":
+        columnar = await build_columnar_prices(
+            _price_batches(payload.symbols, payload.start, payload.end, payload.interval),
+            float32=payload.float32,
+        )
+        rendered = render_columnar_prices(columnar, compress=accepts_gzip(request))
+        rendered.headers.update({**headers, "Vary": "Accept, Accept-Encoding"})
+        return rendered
+
     rows = []
-    async for row in get_prices(
+    async for row in _price_rows(payload.symbols, payload.start, payload.end, payload.interval):
+        rows.append(row)
+    response.headers.update(headers)
+    return rows
+
+
+@router.get("/returns/{symbol}", response_model=List[PriceReturnRow])
+async def get_returns_single(symbol: str, start: date | None = None, end: date | None = None):
+    """Daily returns and rolling volatilities from the derived dbo.price_returns table."""
+    rows = []
+    async for row in get_returns([symbol], start, end):
+        rows.append(row)
+    return rows
+
+
+@router.post("/returns/query", response_model=List[PriceReturnRow])
+async def get_returns_bulk(payload: GetReturnsPayload):
+    rows = []
+    async for row in get_returns(
         symbols=payload.symbols,
         start=payload.start,
         end=payload.end
@@ -33,19 +184,72 @@ async def get_prices_bulk(payload: GetPricesPayload):
     return rows
 
 
+@router.get("/cache/stats")
+async def get_price_cache_stats():
+    """Hit/miss/eviction counters of the in-process price slice and resampled bar caches."""
+    return {**price_cache.stats(), "resampled": resample_cache.stats()}
+
+
+@router.post("/export")
+async def export_prices(payload: ExportPricesRequest):
+    """
+    Stream a dbo.prices slice as an Arrow IPC stream or a Parquet file.
+    Record batches are built per cursor batch, so server memory stays bounded.
+    """
+    batches = iter_price_batches(
+        payload.symbols,
+        payload.start,
+        payload.end,
+        batch_size=payload.batch_rows,
+    )
+
+    if payload.format == "parquet":
+        return StreamingResponse(
+            stream_parquet(batches),
+            media_type=PARQUET_MEDIA_TYPE,
+            headers={"Content-Disposition": 'attachment; filename="prices.parquet"'},
+        )
+
+    return StreamingResponse(
+        stream_arrow_ipc(batches),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="prices.arrows"'},
+    )
+
+
 @router.post("/ingest", response_model=IngestPricesResponse)
 async def ingest_prices(req: IngestPricesRequest):
+    """
+    Fetch and store OHLCV data. With revise=True the whole window is
+    re-fetched and stored bars that changed at the provider are updated.
+    """
+    return await _run_ingestion(req)
 
-    inserted_count, fetch_results = await orchestrate_fetch_and_insert(
-        symbols=req.symbols,
-        start=req.start,
-        end=req.end,
-        interval=req.interval,
-        max_attempts=req.max_attempts,
-        max_concurrent=req.max_concurrent,
-        coverage_threshold=req.coverage_threshold,
-        dry_run=req.dry_run
-    )
+
+async def _run_ingestion(req: IngestPricesRequest) -> IngestPricesResponse:
+    rows_revised = None
+    if req.revise:
+        inserted_count, rows_revised, fetch_results = await orchestrate_fetch_and_upsert(
+            symbols=req.symbols,
+            start=req.start,
+            end=req.end,
+            interval=req.interval,
+            max_attempts=req.max_attempts,
+            max_concurrent=req.max_concurrent,
+            coverage_threshold=req.coverage_threshold,
+            dry_run=req.dry_run
+        )
+    else:
+        inserted_count, fetch_results = await orchestrate_fetch_and_insert(
+            symbols=req.symbols,
+            start=req.start,
+            end=req.end,
+            interval=req.interval,
+            max_attempts=req.max_attempts,
+            max_concurrent=req.max_concurrent,
+            coverage_threshold=req.coverage_threshold,
+            dry_run=req.dry_run
+        )
 
     return adapt_orchestration_result(
         symbols=req.symbols,
@@ -55,6 +259,8 @@ async def ingest_prices(req: IngestPricesRequest):
         dry_run=req.dry_run,
         fetch_results=fetch_results,
         rows_inserted=inserted_count,
+        rows_revised=rows_revised,
+        compact=req.compact_dates,
     )
 
 
@@ -73,38 +279,33 @@ async def ingest_prices_async(req: IngestPricesRequest, background: BackgroundTa
 async def run_background_ingestion(req: IngestPricesRequest):
     """
     Background task that orchestrates fetch & insert, and logs the outcome.
+    Its records carry a job correlation id; the start line links it to the request.
     """
-    try:
-        inserted_count, fetch_results = await orchestrate_fetch_and_insert(
-            symbols=req.symbols,
-            start=req.start,
-            end=req.end,
-            interval=req.interval,
-            max_attempts=req.max_attempts,
-            max_concurrent=req.max_concurrent,
-            coverage_threshold=req.coverage_threshold,
-            dry_run=req.dry_run
-        )
+    request_id = get_correlation_id()
+    with correlation_scope(new_correlation_id("ingest")):
+        logger.info("Async ingestion started: request_id=%s symbols=%d", request_id, len(req.symbols))
+        try:
+            response = await _run_ingestion(req)
 
-        response = adapt_orchestration_result(
-            symbols=req.symbols,
-            start=req.start,
-            end=req.end,
-            interval=req.interval,
-            dry_run=req.dry_run,
-            fetch_results=fetch_results,
-            rows_inserted=inserted_count,
-        )
+            # Failures are always logged; successes are rate-limited
+            for symbol_result in response.results:
+                log = logger.warning if not symbol_result.success else symbol_logger.info
+                log(
+                    "Async ingestion finished: symbol=%s success=%s rows_inserted=%d rows_revised=%d elapsed_ms=%d",
+                    symbol_result.symbol,
+                    symbol_result.success,
+                    symbol_result.rows_inserted,
+                    symbol_result.rows_revised,
+                    symbol_result.elapsed_ms,
+                )
 
-        # Log a summary
-        for symbol_result in response.results:
             logger.info(
-                "Async ingestion finished: symbol=%s success=%s rows_inserted=%d elapsed_ms=%d",
-                symbol_result.symbol,
-                symbol_result.success,
-                symbol_result.rows_inserted,
-                symbol_result.elapsed_ms,
+                "Async ingestion summary: symbols=%d failed=%d rows_inserted=%d rows_revised=%d",
+                len(response.results),
+                sum(1 for r in response.results if not r.success),
+                sum(r.rows_inserted for r in response.results),
+                sum(r.rows_revised for r in response.results),
             )
 
-    except Exception as e:
-        logger.exception("Async ingestion failed for symbols=%s: %s", req.symbols, e)
\ No newline at end of file
+        except Exception as e:
+            logger.exception("Async ingestion failed for symbols=%s: %s", req.symbols, e)
\ No newline at end of file
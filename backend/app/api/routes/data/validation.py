@@ -1,29 +1,135 @@
-from fastapi import APIRouter
+import base64
+from datetime import date
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from typing import List
 
-from app.data_validation.service import validate_symbols
-from .adapters.validation import adapt_validation_result
-from app.schemas.prices.validation import ValidatePricesRequest, ValidationResultRow
+from app.core.timing import TimedRoute
+from app.data_validation.coverage import coverage_of, pack_presence
+from app.data_validation.repair import orchestrate_repair
+from app.data_validation.service import iter_validate_symbols, validate_symbols
+from app.data_validation.validators import coverage_bitmap
+from .adapters.validation import adapt_repair_report, adapt_validation_result
+from .adapters.price_stream import NDJSON_MEDIA_TYPE
+from .adapters.validation_stream import SSE_MEDIA_TYPE, stream_validation_events, wants_sse
+from app.schemas.prices.validation import (
+    CoverageBitmapRequest,
+    CoverageBitmapResponse,
+    CoverageBitmapRow,
+    RepairPricesRequest,
+    RepairPricesResponse,
+    ValidatePricesRequest,
+    ValidationResultRow,
+)
 
-router = APIRouter(prefix="/market-data/validate", tags=["validation"])
+router = APIRouter(prefix="/market-data/validate", tags=["validation"], route_class=TimedRoute)
 
 
 @router.post("/", response_model=List[ValidationResultRow])
 async def validate_prices(payload: ValidatePricesRequest):
     """
     Validate OHLCV data for multiple symbols over a date range.
-    Returns coverage %, missing trading days, missing OHLCV fields, and suspicious prices.
+    Returns coverage %, missing trading days, missing OHLCV fields, suspicious prices
+    and, with anomalies=true, statistical anomalies (return spikes, stale closes,
+    volume outliers, OHLC inconsistencies).
     """
 
-    # 1️⃣ Run validations in parallel using the service helper
+    # 1️⃣ Run validations with one DB scan per symbol chunk
     domain_results = await validate_symbols(
         symbols=payload.symbols,
         start=payload.start,
-        end=payload.end
+        end=payload.end,
+        batched=True,
+        anomalies=payload.anomalies
     )
 
     # 2️⃣ Adapt domain results to API-ready Pydantic models
-    response = adapt_validation_result(domain_results)
+    response = adapt_validation_result(domain_results, compact=payload.compact_dates)
 
     # 3️⃣ Return
     return response
+
+
+@router.post("/stream")
+async def validate_prices_stream(request: Request, payload: ValidatePricesRequest):
+    """
+    Streaming variant of POST /market-data/validate/: each symbol's
+    ValidationResultRow is sent as soon as its chunk is validated, with
+    completed/total progress counters, then a final 'done' event.
+    NDJSON by default; server-sent events with Accept: text/event-stream.
+    """
+    sse = wants_sse(request)
+    results = iter_validate_symbols(
+        payload.symbols,
+        payload.start,
+        payload.end,
+        anomalies=payload.anomalies
+    )
+    return StreamingResponse(
+        stream_validation_events(results, len(payload.symbols), compact=payload.compact_dates, sse=sse),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/coverage", response_model=CoverageBitmapResponse)
+async def coverage_bitmap_endpoint(payload: CoverageBitmapRequest):
+    """
+    Compact coverage heatmap for a whole universe: per symbol, a bitset over
+    the trading days in [start, end] (set = a row is stored), base64-encoded.
+    Built from the maintained price_partitions index without reading prices,
+    so thousands of symbols x decades fit in a few hundred KB.
+    """
+    # 1️⃣ Symbols x trading-days bitmap from the partition index
+    expected, present = await coverage_bitmap(payload.symbols, payload.start, payload.end)
+
+    # 2️⃣ Pack rows to bytes
+    packed = pack_presence(present)
+    coverage = coverage_of(present)
+
+    # 3️⃣ Return
+    return CoverageBitmapResponse(
+        start=payload.start,
+        end=payload.end,
+        trading_days=[date.fromordinal(int(o)) for o in expected],
+        rows=[
+            CoverageBitmapRow(
+                symbol=symbol,
+                coverage=float(coverage[i]),
+                bits=base64.b64encode(packed[i].tobytes()).decode("ascii"),
+            )
+            for i, symbol in enumerate(payload.symbols)
+        ],
+    )
+
+
+@router.post("/repair", response_model=RepairPricesResponse)
+async def repair_prices(payload: RepairPricesRequest):
+    """
+    Validate, then re-ingest only what validation flagged: missing trading
+    days are fetched and inserted, rows with suspicious prices or missing
+    fields are refetched and overwritten. Symbols sharing a range are
+    downloaded together. Reports coverage before and after the repair.
+    """
+    # 1️⃣ Current state
+    before = await validate_symbols(
+        symbols=payload.symbols,
+        start=payload.start,
+        end=payload.end,
+        batched=True
+    )
+
+    # 2️⃣ Plan and run the targeted fetches
+    report = await orchestrate_repair(
+        before,
+        interval=payload.interval,
+        max_attempts=payload.max_attempts,
+        max_concurrent=payload.max_concurrent,
+        coverage_threshold=payload.coverage_threshold,
+        dry_run=payload.dry_run,
+    )
+
+    # 3️⃣ Return
+    return adapt_repair_report(report, payload.start, payload.end)
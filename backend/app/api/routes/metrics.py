@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import CONTENT_TYPE, registry
+from app.db.crud.price_cache import price_cache
+from app.db.crud.price_resample import resample_cache
+
+router = APIRouter(tags=["metrics"])
+
+_CACHES = {"prices": price_cache, "resampled": resample_cache}
+
+
+def _cache_stat(field: str):
+    return lambda: {(name,): cache.stats()[field] for name, cache in _CACHES.items()}
+
+
+registry.callback("price_cache_hits_total", "Cache lookups served from memory", "counter", ("cache",), _cache_stat("hits"))
+registry.callback("price_cache_misses_total", "Cache lookups that went to the database", "counter", ("cache",), _cache_stat("misses"))
+registry.callback("price_cache_hit_ratio", "Hits over lookups since startup", "gauge", ("cache",), _cache_stat("hit_rate"))
+registry.callback("price_cache_bytes", "Bytes held by cached arrays", "gauge", ("cache",), _cache_stat("bytes"))
+registry.callback("price_cache_evictions_total", "Entries evicted to stay under max_bytes", "counter", ("cache",), _cache_stat("evictions"))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
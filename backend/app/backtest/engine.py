@@ -0,0 +1,207 @@
+"""
+Vectorized backtests over a dates x symbols panel.
+
+Every step (returns, weight drift, turnover, costs, equity) is a whole-panel
+NumPy operation; there is no per-bar Python loop, so a 10-year, 1000-symbol
+daily run takes on the order of a second, most of it loading prices.
+"""
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.dates import trading_day_at, trading_day_index, trading_day_ordinals
+from app.db.crud.get_prices import get_prices_arrays
+from app.db.crud.price_arrays import PriceArrays
+from app.strategies.classical import equal_weight_signal, momentum_signal, moving_average_crossover_signal
+
+BPS = 1e-4
+
+
+@dataclass(slots=True)
+class BacktestResult:
+    """
+    Per-bar output of run_backtest. Panels are (n_days x n_symbols), series
+    n_days long; bar t covers the close of day t-1 to the close of day t.
+    """
+    days: np.ndarray            # trading-day ordinals
+    symbols: List[str]
+    weights: np.ndarray         # weights held over each bar, after trading at its start
+    gross_returns: np.ndarray
+    turnover: np.ndarray        # sum of |traded weight| at the start of each bar
+    costs: np.ndarray           # turnover * cost, as a return
+    returns: np.ndarray         # gross_returns - costs
+    equity: np.ndarray
+
+
+def close_panel(arrays: Sequence[PriceArrays], days: np.ndarray) -> np.ndarray:
+    """
+    Closes of each symbol aligned to the trading days `days` (sorted
+    ordinals), one column per entry of `arrays`. Rows on non-trading days
+    are dropped; a missing day carries the previous close forward, and days
+    before a symbol's first close are NaN.
+    """
+    panel = np.full((len(days), len(arrays)), np.nan)
+    if not len(days) or not any(len(a) for a in arrays):
+        return panel
+
+    cols = np.repeat(np.arange(len(arrays)), [len(a) for a in arrays])
+    ordinals = np.concatenate([a.days for a in arrays]).astype(np.int64)
+    rows = np.searchsorted(days, ordinals)
+    hit = rows < len(days)
+    hit[hit] = days[rows[hit]] == ordinals[hit]
+    panel[rows[hit], cols[hit]] = np.concatenate([a.close for a in arrays])[hit]
+    return forward_fill(panel)
+
+
+def forward_fill(panel: np.ndarray) -> np.ndarray:
+    """Replace NaN cells by the last valid value above them in the same column."""
+    index = np.where(np.isnan(panel), 0, np.arange(panel.shape[0])[:, None])
+    np.maximum.accumulate(index, axis=0, out=index)
+    return panel[index, np.arange(panel.shape[1])]
+
+
+async def load_price_panel(symbols: List[str], start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (trading-day ordinals, dates x symbols close panel) for [start, end],
+    read through get_prices_arrays (and so the price cache) and aligned to
+    the app.core.dates trading calendar. Columns follow `symbols`.
+    """
+    arrays = await get_prices_arrays(symbols, start, end)
+    days = trading_day_ordinals(start, end)
+    return days, close_panel([arrays.get(s, PriceArrays.empty(s)) for s in symbols], days)
+
+
+def asset_returns(prices: np.ndarray) -> np.ndarray:
+    """Simple close-to-close returns per bar; 0 for the first bar and where either close is missing."""
+    returns = np.zeros_like(prices)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = prices[1:] / prices[:-1] - 1.0
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def normalize_signals(signals: np.ndarray, long_only: bool = False) -> np.ndarray:
+    """
+    Turn a signal panel into target weights with unit gross exposure per
+    day: w = s / sum(|s|). long_only clips negative signals first. Rows
+    without any signal stay in cash (all zero).
+    """
+    signals = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+    if long_only:
+        signals = np.clip(signals, 0.0, None)
+    gross = np.abs(signals).sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(gross > 0, signals / gross, 0.0)
+
+
+def run_backtest(
+    prices: np.ndarray,
+    targets: np.ndarray,
+    cost_bps: float = 0.0,
+    lag: int = 1,
+    initial_capital: float = 1.0,
+    days: Optional[np.ndarray] = None,
+    symbols: Optional[List[str]] = None
+) -> BacktestResult:
+    """
+    Backtest target weights against a dates x symbols price panel.
+
+    targets[t] is decided at the close of day t and held from day t + lag
+    (lag=1 trades on the next bar, so a signal never sees its own bar).
+    Each bar starts by trading from the drifted weights of the previous
+    bar to the target; turnover is the sum of |trades| and is charged
+    cost_bps per unit before the bar's return. NaN targets are treated as
+    zero, and symbols without a price yet cannot be held.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n_days, n_symbols = prices.shape
+    if targets.shape != prices.shape:
+        raise ValueError(f"targets shape {targets.shape} does not match prices {prices.shape}")
+
+    # Weights held over each bar: targets shifted by the execution lag
+    weights = np.zeros_like(prices)
+    if lag < n_days:
+        weights[lag:] = np.nan_to_num(targets[:n_days - lag])
+    weights[np.isnan(prices)] = 0.0
+
+    returns = asset_returns(prices)
+    gross = (weights * returns).sum(axis=1)
+
+    # What last bar's weights became by its close, before this bar's trades
+    drifted = np.zeros_like(weights)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drifted[1:] = weights[:-1] * (1.0 + returns[:-1]) / (1.0 + gross[:-1, None])
+    drifted[~np.isfinite(drifted)] = 0.0
+
+    turnover = np.abs(weights - drifted).sum(axis=1)
+    costs = turnover * cost_bps * BPS
+    net = gross - costs
+
+    return BacktestResult(
+        days=np.arange(n_days) if days is None else np.asarray(days),
+        symbols=list(symbols) if symbols is not None else [str(i) for i in range(n_symbols)],
+        weights=weights,
+        gross_returns=gross,
+        turnover=turnover,
+        costs=costs,
+        returns=net,
+        equity=initial_capital * np.cumprod(1.0 + net),
+    )
+
+
+def _trim(result: BacktestResult, first: int, initial_capital: float) -> BacktestResult:
+    """Drop the first `first` bars (signal warm-up) and restart equity from initial_capital."""
+    returns = result.returns[first:]
+    return replace(
+        result,
+        days=result.days[first:],
+        weights=result.weights[first:],
+        gross_returns=result.gross_returns[first:],
+        turnover=result.turnover[first:],
+        costs=result.costs[first:],
+        returns=returns,
+        equity=initial_capital * np.cumprod(1.0 + returns),
+    )
+
+
+async def run_strategy_backtest(
+    symbols: List[str],
+    start: date,
+    end: date,
+    strategy: str = "equal_weight",
+    cost_bps: float = 0.0,
+    long_only: bool = False,
+    initial_capital: float = 1.0,
+    lookback: int = 252,
+    skip: int = 21,
+    fast: int = 50,
+    slow: int = 200
+) -> BacktestResult:
+    """
+    Backtest one of the app.strategies.classical signals over [start, end].
+    Prices are loaded from enough trading days before start for the
+    signal's look-back, so the first bar already trades on a full signal.
+    """
+    # One extra day: targets are traded the bar after their signal
+    warmup = {"equal_weight": 0, "momentum": lookback, "ma_crossover": slow}[strategy] + 1
+    history_start = date.fromordinal(int(trading_day_at(trading_day_index(np.array([start.toordinal()])) - warmup)[0]))
+    days, prices = await load_price_panel(symbols, history_start, end)
+
+    if strategy == "momentum":
+        signals = momentum_signal(prices, lookback, skip)
+    elif strategy == "ma_crossover":
+        signals = moving_average_crossover_signal(prices, fast, slow)
+    else:
+        signals = equal_weight_signal(prices)
+
+    result = run_backtest(
+        prices,
+        normalize_signals(signals, long_only=long_only),
+        cost_bps=cost_bps,
+        initial_capital=initial_capital,
+        days=days,
+        symbols=symbols,
+    )
+    return _trim(result, int(np.searchsorted(days, start.toordinal())), initial_capital)
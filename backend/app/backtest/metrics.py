@@ -0,0 +1,43 @@
+from typing import Dict
+
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def drawdowns(equity: np.ndarray) -> np.ndarray:
+    """Fractional distance of each equity value below its running peak (<= 0)."""
+    peak = np.maximum.accumulate(equity)
+    return equity / peak - 1.0
+
+
+def summary_stats(returns: np.ndarray, equity: np.ndarray, turnover: np.ndarray) -> Dict[str, float]:
+    """
+    Headline statistics of a backtest from its per-bar net returns, equity
+    curve and turnover: total return, CAGR, annualized volatility and
+    Sharpe (zero risk-free rate), max drawdown and mean daily turnover.
+    """
+    n = len(returns)
+    if n == 0:
+        return {
+            "total_return": 0.0,
+            "cagr": 0.0,
+            "volatility": 0.0,
+            "sharpe": 0.0,
+            "max_drawdown": 0.0,
+            "avg_turnover": 0.0,
+        }
+
+    total = float(np.prod(1.0 + returns) - 1.0)
+    years = n / TRADING_DAYS_PER_YEAR
+    volatility = float(returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)) if n > 1 else 0.0
+    mean = float(returns.mean() * TRADING_DAYS_PER_YEAR)
+
+    return {
+        "total_return": total,
+        "cagr": float((1.0 + total) ** (1.0 / years) - 1.0) if total > -1.0 else -1.0,
+        "volatility": volatility,
+        "sharpe": mean / volatility if volatility > 0 else 0.0,
+        "max_drawdown": float(drawdowns(equity).min()),
+        "avg_turnover": float(turnover.mean()),
+    }
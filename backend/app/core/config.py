@@ -6,6 +6,10 @@ load_dotenv()
 # Environment
 APP_ENV = os.getenv("APP_ENV", "local")
 
+# Logging: "text" or "json" lines on stdout, written from a listener thread
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Database
 DB_ENGINE = os.getenv("DB_ENGINE", "mssql")
 
@@ -18,4 +22,20 @@ DB_INSTANCE = os.getenv("DB_INSTANCE", "SQLEXPRESS")
 
 # Pool sizing
 DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 1))
-DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 10))
\ No newline at end of file
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 10))
+
+# Price read cache (bytes of cached columnar arrays; 0 disables)
+PRICE_CACHE_MAX_BYTES = int(os.getenv("PRICE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Completed resampled-bar cache (bytes; 0 disables)
+RESAMPLE_CACHE_MAX_BYTES = int(os.getenv("RESAMPLE_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+# IN-list values per statement (SQL Server caps a statement at ~2100 parameters)
+DB_MAX_IN_PARAMS = int(os.getenv("DB_MAX_IN_PARAMS", 1000))
+# Pool connections a single chunked read may use concurrently
+DB_READ_FANOUT = int(os.getenv("DB_READ_FANOUT", 4))
+
+# Fraction of requests given a Server-Timing phase breakdown (0 disables sampling)
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", 0.05))
+# Secret an X-Server-Timing request header must carry to force a breakdown (empty disables forcing)
+SERVER_TIMING_FORCE_TOKEN = os.getenv("SERVER_TIMING_FORCE_TOKEN", "")
@@ -1,12 +1,100 @@
+from datetime import date
+from typing import Iterable, List, Tuple
+from functools import lru_cache
 from pandas.tseries.offsets import CustomBusinessDay
 from pandas.tseries.holiday import USFederalHolidayCalendar
+import numpy as np
 import pandas as pd
 
 # Global business day frequency
 US_BDAY = CustomBusinessDay(calendar=USFederalHolidayCalendar())
 
+# date.toordinal() of 1970-01-01, the numpy datetime64[D] epoch
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Fixed origin for trading-day numbering (a Monday), so indices are stable across queries
+TRADING_INDEX_ORIGIN = np.datetime64("1970-01-05", "D")
+
 def trading_days(start: str | pd.Timestamp, end: str | pd.Timestamp) -> pd.DatetimeIndex:
     """Return business/trading days between start and end, excluding weekends and US federal holidays."""
     cal = USFederalHolidayCalendar()
     holidays = cal.holidays(start=start, end=end)
     return pd.bdate_range(start=start, end=end).difference(holidays)
+
+def trading_day_ordinals(start, end) -> np.ndarray:
+    """trading_days(start, end) as sorted date.toordinal() values (int64)."""
+    return days_to_ordinals(trading_days(start, end).values.astype("datetime64[D]"))
+
+@lru_cache(maxsize=1)
+def _holiday_days() -> np.ndarray:
+    """US federal holidays as datetime64[D], over a range wide enough for any stored history."""
+    holidays = USFederalHolidayCalendar().holidays(start="1970-01-01", end="2100-12-31")
+    return holidays.values.astype("datetime64[D]")
+
+def ordinals_to_days(ordinals: np.ndarray) -> np.ndarray:
+    """Convert date.toordinal() values to datetime64[D]."""
+    return (np.asarray(ordinals, dtype=np.int64) - UNIX_EPOCH_ORDINAL).astype("datetime64[D]")
+
+def days_to_ordinals(days: np.ndarray) -> np.ndarray:
+    """Convert datetime64[D] values to date.toordinal() values."""
+    return np.asarray(days, dtype="datetime64[D]").astype(np.int64) + UNIX_EPOCH_ORDINAL
+
+def trading_day_index(ordinals: np.ndarray) -> np.ndarray:
+    """
+    Number of trading days between TRADING_INDEX_ORIGIN and each date (vectorized).
+    A non-trading date shares the index of the next trading day.
+    """
+    return np.busday_count(TRADING_INDEX_ORIGIN, ordinals_to_days(ordinals), holidays=_holiday_days())
+
+def trading_day_at(index: np.ndarray) -> np.ndarray:
+    """Inverse of trading_day_index: the ordinal of the index-th trading day."""
+    days = np.busday_offset(
+        TRADING_INDEX_ORIGIN, np.asarray(index, dtype=np.int64), roll="forward", holidays=_holiday_days()
+    )
+    return days_to_ordinals(days)
+
+def unique_ordinals(dates: Iterable) -> np.ndarray:
+    """Sorted, de-duplicated date.toordinal() values (int64) of any date/datetime iterable."""
+    return np.unique(np.fromiter((d.toordinal() for d in dates), dtype=np.int64))
+
+def is_trading_day(ordinals: np.ndarray) -> np.ndarray:
+    """Boolean mask of the ordinals that are trading days (vectorized)."""
+    return np.is_busday(ordinals_to_days(ordinals), holidays=_holiday_days())
+
+def trading_day_runs(ordinals: np.ndarray, max_gap: int = 0) -> List[Tuple[date, date]]:
+    """
+    Collapse sorted, unique ordinals into maximal (first, last) runs of
+    consecutive trading days (vectorized). A weekend or holiday between two
+    dates does not break a run; with max_gap > 0, neither do up to max_gap
+    trading days absent from ordinals. A date that is not a trading day
+    itself becomes its own (date, date) run, so expand_trading_day_runs()
+    gives back exactly the input dates.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if not len(ordinals):
+        return []
+    # Non-trading dates share the next trading day's index; keep them out of every run
+    off_calendar = ~is_trading_day(ordinals)
+    split = (np.diff(trading_day_index(ordinals)) > max_gap + 1) | off_calendar[1:] | off_calendar[:-1]
+    breaks = np.flatnonzero(split) + 1
+    firsts = ordinals[np.r_[0, breaks]]
+    lasts = ordinals[np.r_[breaks - 1, len(ordinals) - 1]]
+    return [(date.fromordinal(a), date.fromordinal(b)) for a, b in zip(firsts.tolist(), lasts.tolist())]
+
+def expand_trading_day_runs(runs: Iterable[Tuple[date, date]]) -> List[date]:
+    """
+    Inverse of trading_day_runs: every trading day of every (first, last)
+    run, in order. A single-date run is that date, trading day or not.
+    """
+    runs = list(runs)
+    if not runs:
+        return []
+    firsts = trading_day_index(np.array([a.toordinal() for a, _ in runs], dtype=np.int64))
+    lasts = trading_day_index(np.array([b.toordinal() for _, b in runs], dtype=np.int64))
+    days: List[date] = []
+    for (a, b), lo, hi in zip(runs, firsts.tolist(), lasts.tolist()):
+        if a == b:
+            days.append(a)
+        else:
+            days.extend(date.fromordinal(o) for o in trading_day_at(np.arange(lo, hi + 1)).tolist())
+    return days
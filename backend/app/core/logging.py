@@ -1,30 +1,203 @@
+import json
 import logging
+import queue
 import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from app.core.config import LOG_FORMAT, LOG_LEVEL
+
+# Every application module logs under this namespace (get_logger(__name__))
+APP_LOGGER = "app"
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_listener: Optional[QueueListener] = None
+
 
 def get_logger(name: str = __name__) -> Logger:
     """
-    Returns a pre-configured logger.
-    Structured, deterministic, JSON-friendly output optional.
+    Returns a module logger. Handlers live on the 'app' logger and are
+    installed once by configure_logging(), so loggers fetched at import
+    time pick them up when the app starts.
+    """
+    return logging.getLogger(name)
+
+
+def new_correlation_id(prefix: str = "") -> str:
+    value = uuid.uuid4().hex[:16]
+    return f"{prefix}-{value}" if prefix else value
+
+
+def get_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: str):
+    """Tag every record logged in this block (and tasks it spawns) with correlation_id."""
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+class CorrelationFilter(logging.Filter):
+    """
+    Stamp record.correlation_id from the current context. Runs in the
+    logging call, before the record crosses to the listener thread,
+    where the request's context is no longer visible.
     """
-    logger = logging.getLogger(name)
-    if logger.hasHandlers():
-        # Avoid duplicate handlers in FastAPI reloads
-        return logger
 
-    logger.setLevel(logging.INFO)
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, correlation_id, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+        }
+        if record.exc_text or record.exc_info:
+            payload["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
 
-    # Console handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.INFO)
 
+def _formatter(fmt: str) -> logging.Formatter:
+    if fmt == "json":
+        return JsonFormatter()
     # Formatter: structured, human-readable
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    return logging.Formatter(
+        fmt="%(asctime)s | %(levelname)s | %(name)s | %(correlation_id)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
-    handler.setFormatter(formatter)
 
-    logger.addHandler(handler)
-    logger.propagate = False
-    return logger
+
+class _AppQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render message and traceback text on the calling thread; unlike
+        # QueueHandler's default, the traceback stays in exc_text so the
+        # listener's formatter (text or JSON) decides where it goes
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def configure_logging(fmt: Optional[str] = None, level: Optional[str] = None, stream=None) -> None:
+    """
+    Route the 'app' logger through a queue to a QueueListener thread that
+    formats and writes to stdout, so a slow stdout never blocks the event
+    loop. fmt is 'text' or 'json' (default LOG_FORMAT). Idempotent.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(_formatter(fmt or LOG_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _AppQueueHandler(records)
+    handler.addFilter(CorrelationFilter())
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.handlers = [handler]
+    app_logger.setLevel(level or LOG_LEVEL)
+    app_logger.propagate = False
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    logging.getLogger(APP_LOGGER).handlers = []
+
+
+class RateLimitedLogger:
+    """
+    Logger wrapper for hot loops: each message template is emitted at most
+    once per `interval` seconds. Suppressed calls are counted and reported
+    on the next emitted record of that template.
+    """
+
+    def __init__(self, logger: Logger, interval: float = 1.0):
+        self.logger = logger
+        self.interval = interval
+        self._state: Dict[str, Tuple[float, int]] = {}
+
+    def log(self, level: int, msg: str, *args) -> bool:
+        """Log unless this template was logged within `interval`; returns whether it was emitted."""
+        if not self.logger.isEnabledFor(level):
+            return False
+        now = time.monotonic()
+        last, suppressed = self._state.get(msg, (float("-inf"), 0))
+        if now - last < self.interval:
+            self._state[msg] = (last, suppressed + 1)
+            return False
+        self._state[msg] = (now, 0)
+        if suppressed:
+            msg = f"{msg} (+{suppressed} similar suppressed)"
+        self.logger.log(level, msg, *args)
+        return True
+
+    def debug(self, msg: str, *args) -> bool:
+        return self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args) -> bool:
+        return self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg: str, *args) -> bool:
+        return self.log(logging.WARNING, msg, *args)
+
+
+class CorrelationIdMiddleware:
+    """
+    Plain ASGI middleware binding each HTTP request to a correlation id:
+    the client's X-Request-ID if sent, else a new one, echoed back in the
+    response. Background tasks run in the same context and inherit it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((v for k, v in scope.get("headers", ()) if k == REQUEST_ID_HEADER), None)
+        correlation_id = incoming.decode("latin-1")[:64] if incoming else new_correlation_id()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (REQUEST_ID_HEADER, correlation_id.encode("latin-1"))],
+                }
+            await send(message)
+
+        with correlation_scope(correlation_id):
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,152 @@
+"""
+Per-request phase timing, reported as a Server-Timing header and a log line.
+
+ServerTimingMiddleware starts a phase table for sampled requests; code on
+the request path adds to it with `timed(name)` / `add_phase(name, seconds)`.
+Unsampled requests have no table, so those helpers cost one ContextVar
+lookup. Tasks spawned by the request (fan-out reads, streaming bodies)
+inherit the same table, so concurrent phases are summed, not wall time.
+"""
+import functools
+import hmac
+import inspect
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+
+from app.core.config import SERVER_TIMING_FORCE_TOKEN, SERVER_TIMING_SAMPLE_RATE
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Trusted clients can force a breakdown for one request regardless of sampling
+# by sending the configured SERVER_TIMING_FORCE_TOKEN in this header
+FORCE_HEADER = b"x-server-timing"
+
+_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_phases", default=None)
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """Add seconds to a phase of the current request, if it is being timed."""
+    phases = _phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name: str):
+    """Time the enclosed block into a phase of the current request."""
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - t0
+
+
+def _header_value(phases: Dict[str, float]) -> bytes:
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items()).encode()
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that marks when the endpoint returns. The gap up to the
+    response start is FastAPI's response_model validation and JSON
+    encoding, reported as the 'serialize' phase.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_return(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _mark_return(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        phases = _phases.get()
+        # Returned Response objects are sent as-is, without FastAPI serialization
+        if phases is not None and not isinstance(result, Response):
+            phases["_returned"] = time.perf_counter()
+        return result
+
+    return wrapper
+
+
+class ServerTimingMiddleware:
+    """
+    Plain ASGI middleware that samples SERVER_TIMING_SAMPLE_RATE of HTTP
+    requests (plus any whose X-Server-Timing header carries force_token)
+    and reports their phase durations. The header carries the phases finished before the response
+    starts; for streamed bodies the log line, written after the last chunk,
+    has the complete breakdown.
+    """
+
+    # Without a token, X-Server-Timing is ignored and only sampling applies
+    force_token: str = SERVER_TIMING_FORCE_TOKEN
+
+    def __init__(self, app, sample_rate: Optional[float] = None, force_token: Optional[str] = None):
+        self.app = app
+        self.sample_rate = SERVER_TIMING_SAMPLE_RATE if sample_rate is None else sample_rate
+        if force_token is not None:
+            self.force_token = force_token
+
+    def _sampled(self, scope) -> bool:
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return True
+        if not self.force_token:
+            return False
+        token = self.force_token.encode()
+        return any(
+            name == FORCE_HEADER and hmac.compare_digest(value, token)
+            for name, value in scope.get("headers", ())
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        token = _phases.set(phases)
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                now = time.perf_counter()
+                returned = phases.pop("_returned", None)
+                if returned is not None:
+                    phases["serialize"] = phases.get("serialize", 0.0) + now - returned
+                reported = {**phases, "total": now - t0}
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"server-timing", _header_value(reported))],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _phases.reset(token)
+            phases.pop("_returned", None)
+            route = scope.get("route")
+            logger.info(
+                "request timing: method=%s route=%s status=%d total_ms=%.2f %s",
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                (time.perf_counter() - t0) * 1000,
+                " ".join(f"{name}_ms={seconds * 1000:.2f}" for name, seconds in phases.items()),
+            )
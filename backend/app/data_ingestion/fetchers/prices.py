@@ -1,4 +1,6 @@
 import time
+from datetime import timedelta
+
 import yfinance as yf
 
 from app.data_ingestion.models import FetchRequest, FetchResult
@@ -10,7 +12,8 @@ def _download_sync(req: FetchRequest):
     df = yf.download(
         tickers=symbol,
         start=req.start,
-        end=req.end,
+        # FetchRequest.end is inclusive like every range in the app; yfinance's is exclusive
+        end=req.end + timedelta(days=1),
         interval=req.interval,
         group_by="ticker",
         auto_adjust=req.auto_adjust,
@@ -1,9 +1,11 @@
 import pandas as pd
 from dataclasses import dataclass
 from datetime import date
-from enum import Enum
 from typing import Optional
 
+# Defined with the response schemas, which must not import this package
+from app.schemas.prices.ingest_prices import RetryReason
+
 
 @dataclass(slots=True)
 class FetchRequest:
@@ -33,9 +35,3 @@ class PriceInsertRow:
     close: float
     volume: float
 
-
-class RetryReason(str, Enum):
-    NONE = "none"
-    EMPTY = "empty_data"
-    PARTIAL = "partial_coverage"
-    EXCEPTION = "fetch_exception"
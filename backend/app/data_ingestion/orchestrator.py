@@ -1,14 +1,15 @@
 import asyncio
 import pandas as pd
-from typing import List
+from typing import List, Tuple
 from datetime import date
 
 from .models import RetryReason
 from app.core.dates import trading_days
+from app.core.metrics import PROVIDER_FETCH_SECONDS
 from app.data_ingestion.fetchers.prices import fetch_prices
 from app.data_ingestion.retry import retry_info
 from app.data_ingestion.models import FetchRequest, PriceInsertRow
-from app.db.crud import bulk_insert_prices_chunked, get_price_keys
+from app.db.crud import bulk_insert_prices_chunked, get_price_keys, upsert_prices_chunked
 from .utils import get_missing_date_ranges
 
 
@@ -29,6 +30,7 @@ async def fetch_with_retries(
             FetchRequest(symbol=symbol, start=start, end=end, interval=interval)
         )
         info = retry_info(result, start, end, coverage_threshold)
+        PROVIDER_FETCH_SECONDS.labels(info["retry_reason"].value).observe(result.elapsed_ms / 1000)
         if info["retry_reason"] == RetryReason.NONE:
             return { "symbol": symbol, "result": result, "attempts": attempt, **info }
         else:
@@ -132,13 +134,27 @@ async def fetch_symbols_parallel(
     interval: str = "1d",
     max_attempts: int = 3,
     max_concurrent: int = 5,
-    coverage_threshold: float = 0.95
+    coverage_threshold: float = 0.95,
+    refetch_stored: bool = False
 ):
-    """Fetch multiple symbols in parallel with retries."""
+    """
+    Fetch multiple symbols in parallel with retries.
+    Only missing dates are fetched unless refetch_stored is set, in which
+    case the whole window is fetched again (revision checks).
+    """
     semaphore = asyncio.Semaphore(max_concurrent)
 
     async def sem_fetch(symbol):
         async with semaphore:
+            if refetch_stored:
+                return await fetch_range_resilient(
+                    symbol=symbol,
+                    start=start,
+                    end=end,
+                    interval=interval,
+                    max_attempts=max_attempts,
+                    coverage_threshold=coverage_threshold,
+                )
             return await fetch_missing_prices(symbol, start, end, interval, max_attempts, coverage_threshold)
 
     tasks = [sem_fetch(s) for s in symbols]
@@ -146,6 +162,72 @@ async def fetch_symbols_parallel(
     return results
 
 
+async def fetch_batches_parallel(
+    batches: List[Tuple[List[str], date, date]],
+    interval: str = "1d",
+    max_attempts: int = 3,
+    max_concurrent: int = 5,
+    coverage_threshold: float = 0.95
+):
+    """
+    Fetch (symbols, start, end) batches in parallel with retries. Each
+    batch is one provider download: its tickers are passed space-separated,
+    which yfinance fetches in a single request.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def sem_fetch(symbols, start, end):
+        async with semaphore:
+            return await fetch_range_resilient(
+                symbol=" ".join(symbols),
+                start=start,
+                end=end,
+                interval=interval,
+                max_attempts=max_attempts,
+                coverage_threshold=coverage_threshold,
+            )
+
+    tasks = [sem_fetch(*batch) for batch in batches]
+    results = await asyncio.gather(*tasks)
+    return results
+
+
+def _fetched_frames(fetch_results):
+    """
+    Yield (symbol, DataFrame) for every non-empty fetch result, normalized to
+    columns date, symbol, Open, High, Low, Close, Volume without duplicate keys.
+    """
+    for symbol_results in fetch_results:
+        for r in symbol_results:
+            fetch_result = r["result"]
+
+            if fetch_result and not fetch_result.empty:
+                df = fetch_result.data
+
+                # If multi-index columns (symbol, OHLCV), stack it
+                if isinstance(df.columns, pd.MultiIndex):
+                    df = df.stack(level=0, future_stack=True).rename_axis(["date", "symbol"]).reset_index()
+                    # Now df has columns: date, symbol, Open, High, Low, Close, Volume
+                    # Multi-ticker downloads pad tickers without a bar that day with NaN rows
+                    df = df.dropna(subset=["Open", "High", "Low", "Close"], how="all")
+
+                # Drop duplicate (symbol, date) rows
+                df = df.drop_duplicates(subset=["symbol", "date"], keep="last")
+                yield r["symbol"], df
+
+
+def _insert_row(row) -> PriceInsertRow:
+    return PriceInsertRow(
+        symbol=row["symbol"],
+        date=row["date"],
+        open=row["Open"],
+        high=row["High"],
+        low=row["Low"],
+        close=row["Close"],
+        volume=row["Volume"],
+    )
+
+
 async def orchestrate_fetch_and_insert(
     symbols: list[str],
     start: date,
@@ -173,42 +255,101 @@ async def orchestrate_fetch_and_insert(
 
     rows_to_insert: list[PriceInsertRow] = []
 
-    for symbol_results in fetch_results:
-        for r in symbol_results:
-            symbol = r["symbol"]
-            existing_keys = await get_price_keys(symbol, start, end)
-            existing_set = set(existing_keys)
-            fetch_result = r["result"]
+    for symbol, df in _fetched_frames(fetch_results):
+        existing_keys = await get_price_keys(symbol, start, end)
+        existing_set = set(existing_keys)
 
-            if fetch_result and not fetch_result.empty:
-                df = fetch_result.data
+        for _, row in df.iterrows():
+            if (row["symbol"], row["date"]) not in existing_set:
+                rows_to_insert.append(_insert_row(row))
 
-                # If multi-index columns (symbol, OHLCV), stack it
-                if isinstance(df.columns, pd.MultiIndex):
-                    df = df.stack(level=0, future_stack=True).rename_axis(["date", "symbol"]).reset_index()
-                    # Now df has columns: date, symbol, Open, High, Low, Close, Volume
+    # Insert all rows into the DB
+    if not dry_run:
+        inserted_count = await bulk_insert_prices_chunked(rows_to_insert, chunk_size=chunk_size)
+    else:
+        inserted_count = {symbol: 0 for symbol in symbols}
 
-                # Drop duplicate (symbol, date) rows
-                df = df.drop_duplicates(subset=["symbol", "date"], keep="last")
+    return inserted_count, fetch_results
 
-                for _, row in df.iterrows():
-                    if (row["symbol"], row["date"]) not in existing_set:
-                        rows_to_insert.append(
-                            PriceInsertRow(
-                                symbol=row["symbol"],
-                                date=row["date"],
-                                open=row["Open"],
-                                high=row["High"],
-                                low=row["Low"],
-                                close=row["Close"],
-                                volume=row["Volume"],
-                            )
-                        )
 
-    # Insert all rows into the DB
+async def orchestrate_fetch_and_upsert(
+    symbols: list[str],
+    start: date,
+    end: date,
+    interval: str = "1d",
+    max_attempts: int = 3,
+    max_concurrent: int = 5,
+    coverage_threshold: float = 0.95,
+    dry_run: bool = False,
+    chunk_size: int = 1000
+):
+    """
+    Revision run: re-fetch the whole window for every symbol, insert new
+    bars and update stored bars whose values changed at the provider.
+
+    Returns (inserted_by_symbol, revised_by_symbol, fetch_results).
+    """
+    fetch_results = await fetch_symbols_parallel(
+        symbols,
+        start,
+        end,
+        interval,
+        max_attempts,
+        max_concurrent,
+        coverage_threshold,
+        refetch_stored=True
+    )
+
+    rows_to_upsert: list[PriceInsertRow] = [
+        _insert_row(row)
+        for _, df in _fetched_frames(fetch_results)
+        for _, row in df.iterrows()
+    ]
+
     if not dry_run:
-        inserted_count = await bulk_insert_prices_chunked(rows_to_insert, chunk_size=chunk_size)
+        inserted_count, revised_count = await upsert_prices_chunked(rows_to_upsert, chunk_size=chunk_size)
+    else:
+        inserted_count = {symbol: 0 for symbol in symbols}
+        revised_count = {symbol: 0 for symbol in symbols}
+
+    return inserted_count, revised_count, fetch_results
+
+
+async def orchestrate_batched_upsert(
+    batches: List[Tuple[List[str], date, date]],
+    interval: str = "1d",
+    max_attempts: int = 3,
+    max_concurrent: int = 5,
+    coverage_threshold: float = 0.95,
+    dry_run: bool = False,
+    chunk_size: int = 1000
+):
+    """
+    Fetch (symbols, start, end) batches, one download per batch, and upsert
+    the bars: missing ones are inserted, stored ones that differ are
+    overwritten. Used by targeted repairs.
+
+    Returns (inserted_by_symbol, revised_by_symbol, fetch_results).
+    """
+    fetch_results = await fetch_batches_parallel(
+        batches,
+        interval,
+        max_attempts,
+        max_concurrent,
+        coverage_threshold
+    )
+
+    rows_to_upsert: list[PriceInsertRow] = [
+        _insert_row(row)
+        for _, df in _fetched_frames(fetch_results)
+        for _, row in df.iterrows()
+    ]
+
+    if not dry_run:
+        inserted_count, revised_count = await upsert_prices_chunked(rows_to_upsert, chunk_size=chunk_size)
     else:
+        symbols = {symbol for batch_symbols, _, _ in batches for symbol in batch_symbols}
         inserted_count = {symbol: 0 for symbol in symbols}
+        revised_count = {symbol: 0 for symbol in symbols}
 
-    return inserted_count, fetch_results
\ No newline at end of file
+    return inserted_count, revised_count, fetch_results
@@ -0,0 +1,165 @@
+import warnings
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.data_validation.models import ValidationIssue
+from app.db.crud.price_arrays import PriceArrays
+
+# A close-to-close log return is a spike above this many robust sigmas of
+# the symbol's own returns, and never below RETURN_SPIKE_MIN_ABS (~28%)
+RETURN_SPIKE_Z = 8.0
+RETURN_SPIKE_MIN_ABS = 0.25
+
+# This many consecutive stored days with an identical close are stale
+STALE_CLOSE_RUN = 5
+
+# Volume more than this factor above or below the symbol's median
+VOLUME_OUTLIER_RATIO = 10.0
+
+# MAD -> standard deviation for normally distributed data
+_MAD_SCALE = 1.4826
+
+ANOMALY_DESCRIPTIONS = {
+    "RETURN_SPIKE": "rows with an outsized close-to-close return",
+    "STALE_CLOSE": f"rows repeating the previous close ({STALE_CLOSE_RUN}+ days in a row)",
+    "VOLUME_OUTLIER": f"rows with volume over {VOLUME_OUTLIER_RATIO:g}x off the median",
+    "OHLC_INCONSISTENT": "rows with open or close outside [low, high]",
+}
+
+
+@dataclass(slots=True)
+class PricePanel:
+    """
+    OHLCV as (n_symbols x len(days)) float64 matrices over a trading-day grid.
+    Cells without a stored row are NaN.
+    """
+    days: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def price_panel(arrays: Sequence[PriceArrays], expected: np.ndarray) -> PricePanel:
+    """
+    Scatter per-symbol columns onto the trading-day grid `expected`
+    (sorted ordinals), one panel row per entry of `arrays`. Rows on
+    non-trading days have no column and are dropped.
+    """
+    shape = (len(arrays), len(expected))
+    columns = {name: np.full(shape, np.nan) for name in ("open", "high", "low", "close", "volume")}
+    if not len(expected) or not any(len(a) for a in arrays):
+        return PricePanel(expected, **columns)
+
+    rows = np.repeat(np.arange(len(arrays)), [len(a) for a in arrays])
+    ordinals = np.concatenate([a.days for a in arrays]).astype(np.int64)
+    cols = np.searchsorted(expected, ordinals)
+    hit = cols < len(expected)
+    hit[hit] = expected[cols[hit]] == ordinals[hit]
+
+    for name, panel in columns.items():
+        values = np.concatenate([getattr(a, name) for a in arrays]).astype(np.float64)
+        panel[rows[hit], cols[hit]] = values[hit]
+    return PricePanel(expected, **columns)
+
+
+def _row_median(values: np.ndarray) -> np.ndarray:
+    # All-NaN rows (symbols without data) give NaN without a warning
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=1, keepdims=True)
+
+
+def _previous_observed(valid: np.ndarray) -> np.ndarray:
+    """Column of each cell's previous valid cell in its row (-1 if none)."""
+    index = np.where(valid, np.arange(valid.shape[1]), -1)
+    last = np.maximum.accumulate(index, axis=1)
+    return np.concatenate([np.full((valid.shape[0], 1), -1), last[:, :-1]], axis=1)
+
+
+def _streak_lengths(flags: np.ndarray) -> np.ndarray:
+    """For each True cell, the length of the run of True cells it belongs to (row-wise)."""
+    index = np.arange(flags.shape[1])
+    since = index - np.maximum.accumulate(np.where(flags, -1, index), axis=1)
+    until = (index - np.maximum.accumulate(np.where(flags[:, ::-1], -1, index), axis=1))[:, ::-1]
+    return np.where(flags, since + until - 1, 0)
+
+
+def return_spikes(panel: PricePanel) -> np.ndarray:
+    """Log return against the previous stored close beyond the symbol's robust spike threshold."""
+    close = panel.close
+    valid = close > 0
+    prev = _previous_observed(valid)
+    has_prev = valid & (prev >= 0)
+
+    previous_close = np.take_along_axis(close, np.maximum(prev, 0), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(has_prev, np.log(close / previous_close), np.nan)
+
+    median = _row_median(returns)
+    sigma = _MAD_SCALE * _row_median(np.abs(returns - median))
+    threshold = np.fmax(RETURN_SPIKE_Z * sigma, RETURN_SPIKE_MIN_ABS)
+    with np.errstate(invalid="ignore"):
+        return has_prev & (np.abs(returns - median) > threshold)
+
+
+def stale_closes(panel: PricePanel) -> np.ndarray:
+    """Days repeating the previous day's close within a run of STALE_CLOSE_RUN+ identical closes."""
+    close = panel.close
+    flags = np.zeros(close.shape, dtype=bool)
+    if close.shape[1] < 2:
+        return flags
+    # repeats[:, j]: day j + 1 has the same stored close as day j
+    repeats = close[:, 1:] == close[:, :-1]
+    flags[:, 1:] = repeats & (_streak_lengths(repeats) >= STALE_CLOSE_RUN - 1)
+    return flags
+
+
+def volume_outliers(panel: PricePanel) -> np.ndarray:
+    """Volume more than VOLUME_OUTLIER_RATIO above or below the symbol's median volume."""
+    volume = panel.volume
+    median = _row_median(volume)
+    with np.errstate(invalid="ignore"):
+        return (median > 0) & (
+            (volume > median * VOLUME_OUTLIER_RATIO) | (volume < median / VOLUME_OUTLIER_RATIO)
+        )
+
+
+def ohlc_inconsistent(panel: PricePanel) -> np.ndarray:
+    """Open or close outside the day's [low, high] range."""
+    with np.errstate(invalid="ignore"):
+        return (
+            (panel.close > panel.high) | (panel.close < panel.low)
+            | (panel.open > panel.high) | (panel.open < panel.low)
+        )
+
+
+def detect_anomalies(panel: PricePanel) -> Dict[str, np.ndarray]:
+    """Every anomaly check over the whole panel: code -> (n_symbols x n_days) bool matrix."""
+    return {
+        "RETURN_SPIKE": return_spikes(panel),
+        "STALE_CLOSE": stale_closes(panel),
+        "VOLUME_OUTLIER": volume_outliers(panel),
+        "OHLC_INCONSISTENT": ohlc_inconsistent(panel),
+    }
+
+
+def anomaly_issues(flags: Dict[str, np.ndarray], row: int, days: np.ndarray) -> List[ValidationIssue]:
+    """One symbol's panel row of detect_anomalies() as ValidationIssues."""
+    issues = []
+    for code, matrix in flags.items():
+        affected = [date.fromordinal(int(o)) for o in days[matrix[row]]]
+        if affected:
+            issues.append(
+                ValidationIssue(
+                    code=code,
+                    description=f"{len(affected)} {ANOMALY_DESCRIPTIONS[code]}",
+                    affected_dates=affected,
+                    count=len(affected)
+                )
+            )
+    return issues
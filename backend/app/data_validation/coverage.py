@@ -0,0 +1,51 @@
+from datetime import date
+from typing import List
+
+import numpy as np
+
+
+def presence_matrix(
+    expected: np.ndarray,
+    symbol_index: np.ndarray,
+    ordinals: np.ndarray,
+    n_symbols: int
+) -> np.ndarray:
+    """
+    Existing-date bitmap: a (n_symbols x len(expected)) bool matrix with
+    [i, j] set when symbol i has a stored row on trading day expected[j].
+
+    expected holds sorted trading-day ordinals; symbol_index/ordinals are
+    parallel arrays, one entry per stored row. Rows on non-trading days
+    have no column and are ignored.
+    """
+    present = np.zeros((n_symbols, len(expected)), dtype=bool)
+    if len(expected) == 0 or len(ordinals) == 0:
+        return present
+
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    columns = np.searchsorted(expected, ordinals)
+    hit = columns < len(expected)
+    hit[hit] = expected[columns[hit]] == ordinals[hit]
+    present[np.asarray(symbol_index)[hit], columns[hit]] = True
+    return present
+
+
+def coverage_of(present: np.ndarray) -> np.ndarray:
+    """Share of expected trading days present, per symbol row (0.0 when nothing is expected)."""
+    n_days = present.shape[1]
+    if n_days == 0:
+        return np.zeros(present.shape[0])
+    return present.sum(axis=1) / n_days
+
+
+def missing_dates_of(present_row: np.ndarray, expected: np.ndarray) -> List[date]:
+    """Expected trading days absent from one symbol's bitmap row, as dates."""
+    return [date.fromordinal(int(o)) for o in expected[~present_row]]
+
+
+def pack_presence(present: np.ndarray) -> np.ndarray:
+    """
+    Pack each bitmap row into bytes, least significant bit first: day j of
+    a row is bit (j % 8) of byte (j // 8). Returns (n_symbols x ceil(n_days / 8)) uint8.
+    """
+    return np.packbits(present, axis=1, bitorder="little")
@@ -1,27 +1,35 @@
-from typing import Any
-from app.db.connection import get_connection
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, Dict, List, Tuple
+from app.core.config import DB_MAX_IN_PARAMS
+from app.core.metrics import observe_query
+from app.db.connection import get_connection, release_connection
+from app.db.crud.fanout import fetchall_chunked
+from app.db.crud.price_arrays import to_ordinal
 
 # --- SQL Queries ---
 
 # 1. Symbol summary: first/last date and number of observed rows
 SYMBOL_SUMMARY = """
 SELECT
-    symbol,
-    MIN([date]) AS first_date,
-    MAX([date]) AS last_date,
+    s.symbol,
+    MIN(p.[date]) AS first_date,
+    MAX(p.[date]) AS last_date,
     COUNT(*) AS observed_days
-FROM prices
-WHERE symbol = ?
-  AND [date] BETWEEN ? AND ?
-GROUP BY symbol;
+FROM prices p
+JOIN symbols s ON s.symbol_id = p.symbol_id
+WHERE s.symbol = ?
+  AND p.[date] BETWEEN ? AND ?
+GROUP BY s.symbol;
 """
 
 # 2. Rows with missing OHLCV fields
 MISSING_OHLCV = """
-SELECT [date] AS invalid_rows
-FROM prices
-WHERE symbol = ?
-  AND [date] BETWEEN ? AND ?
+SELECT p.[date] AS invalid_rows
+FROM prices p
+JOIN symbols s ON s.symbol_id = p.symbol_id
+WHERE s.symbol = ?
+  AND p.[date] BETWEEN ? AND ?
   AND (
       open IS NULL OR
       high IS NULL OR
@@ -33,10 +41,11 @@ WHERE symbol = ?
 
 # 3. Suspicious or invalid price rows
 SUSPICIOUS_PRICES = """
-SELECT [date] AS suspicious_rows
-FROM prices
-WHERE symbol = ?
-  AND [date] BETWEEN ? AND ?
+SELECT p.[date] AS suspicious_rows
+FROM prices p
+JOIN symbols s ON s.symbol_id = p.symbol_id
+WHERE s.symbol = ?
+  AND p.[date] BETWEEN ? AND ?
   AND (
       open <= 0 OR
       high <= 0 OR
@@ -48,15 +57,58 @@ WHERE symbol = ?
 
 # 4. Existing dates for gap detection
 EXISTING_DATES = """
-SELECT [date]
-FROM prices
-WHERE symbol = ?
-  AND [date] BETWEEN ? AND ?
-ORDER BY [date] ASC;
+SELECT p.[date]
+FROM prices p
+JOIN symbols s ON s.symbol_id = p.symbol_id
+WHERE s.symbol = ?
+  AND p.[date] BETWEEN ? AND ?
+ORDER BY p.[date] ASC;
 """
 
+# 5. Row-level flags of the (symbol, month) partitions being revalidated.
+# Only flagged rows come back; presence comes from dbo.price_partitions.
+FLAG_MISSING_FIELDS = 1
+FLAG_SUSPICIOUS = 2
+
+# Bump when the row-level rules above change, so cached partition results are recomputed
+VALIDATION_RULES_VERSION = 1
+
+# Each range costs three parameters
+_RANGES_PER_STATEMENT = DB_MAX_IN_PARAMS // 3
+
+def build_partition_scan(ranges: List[Tuple[int, date, date]]) -> tuple:
+    """SQL for flagged rows in the given (symbol_id, from, to-exclusive) date ranges."""
+    sql = f"""
+    SELECT symbol_id, [date], flags
+    FROM (
+        SELECT
+            p.symbol_id,
+            p.[date],
+            CASE WHEN p.[open] IS NULL OR p.[high] IS NULL OR p.[low] IS NULL
+                      OR p.[close] IS NULL OR p.[volume] IS NULL
+                 THEN {FLAG_MISSING_FIELDS} ELSE 0 END
+            + CASE WHEN p.[open] <= 0 OR p.[high] <= 0 OR p.[low] <= 0
+                        OR p.[close] <= 0 OR p.[high] < p.[low]
+                   THEN {FLAG_SUSPICIOUS} ELSE 0 END AS flags
+        FROM dbo.prices p
+        WHERE {' OR '.join('(p.symbol_id = ? AND p.[date] >= ? AND p.[date] < ?)' for _ in ranges)}
+    ) f
+    WHERE flags > 0
+    ORDER BY symbol_id, [date] ASC;
+    """
+    return sql, [value for r in ranges for value in r]
+
 # --- Async query helpers ---
 
+@asynccontextmanager
+async def _connection():
+    conn = await get_connection()
+    try:
+        yield conn
+    finally:
+        await release_connection(conn)
+
+
 async def fetch_one(conn, sql: str, params: tuple) -> Any:
     """
     Execute a SQL query that returns a single value.
@@ -83,7 +135,7 @@ async def get_symbol_summary(symbol: str, start: str, end: str) -> dict:
     """
     Returns a dict with first_date, last_date, and observed_days.
     """
-    async with get_connection() as conn:
+    async with _connection() as conn:
         row = await fetch_all(conn, SYMBOL_SUMMARY, (symbol, start, end))
         if row:
             return {"first_date": row[0][1], "last_date": row[0][2], "observed_days": row[0][3]}
@@ -91,15 +143,96 @@ async def get_symbol_summary(symbol: str, start: str, end: str) -> dict:
 
 
 async def get_missing_ohlcv_dates(symbol: str, start: str, end: str) -> list[str]:
-    async with get_connection() as conn:
+    async with _connection() as conn:
         return await fetch_all(conn, MISSING_OHLCV, (symbol, start, end))
 
 
 async def get_suspicious_price_dates(symbol: str, start: str, end: str) -> list[str]:
-    async with get_connection() as conn:
+    async with _connection() as conn:
         return await fetch_all(conn, SUSPICIOUS_PRICES, (symbol, start, end))
 
 
 async def get_existing_dates(symbol: str, start: str, end: str) -> list:
-    async with get_connection() as conn:
+    async with _connection() as conn:
         return await fetch_all(conn, EXISTING_DATES, (symbol, start, end))
+
+
+
+# --- Partition result cache ---
+
+async def scan_partition_rows(ranges: List[Tuple[int, date, date]]) -> List[tuple]:
+    """
+    (symbol_id, date, flags) for every flagged row in the given
+    (symbol_id, from, to-exclusive) ranges, chunks read concurrently.
+    """
+    return await fetchall_chunked(
+        "validation_scan",
+        ranges,
+        build_partition_scan,
+        chunk_size=_RANGES_PER_STATEMENT,
+    )
+
+
+async def load_partition_results(
+    symbol_ids: List[int],
+    start: date,
+    end: date
+) -> Dict[Tuple[int, int], Tuple[int, int, int, int]]:
+    """
+    Cached findings per (symbol_id, month ordinal):
+    (version, rules_version, missing_fields_mask, suspicious_mask).
+    """
+    def build(chunk: list):
+        sql = f"""
+            SELECT symbol_id, [month], version, rules_version, missing_fields_mask, suspicious_mask
+            FROM dbo.validation_partitions
+            WHERE symbol_id IN ({','.join('?' for _ in chunk)})
+              AND [month] >= ? AND [month] <= ?
+        """
+        return sql, list(chunk) + [start.replace(day=1), end]
+
+    rows = await fetchall_chunked("validation_partitions", sorted(set(symbol_ids)), build)
+    return {
+        (int(r[0]), to_ordinal(r[1])): (int(r[2]), int(r[3]), int(r[4]), int(r[5]))
+        for r in rows
+    }
+
+
+async def store_partition_results(results: List[Tuple[int, date, int, int, int]]) -> None:
+    """
+    Replace cached findings for (symbol_id, month, version,
+    missing_fields_mask, suspicious_mask) rows under VALIDATION_RULES_VERSION.
+    Each row is one MERGE under HOLDLOCK, so concurrent validations of the
+    same symbol neither collide on the key nor leave a half-replaced row.
+    """
+    if not results:
+        return
+    async with _connection() as conn:
+        async with conn.cursor() as cur:
+            with observe_query("validation_partitions_store"):
+                await cur.executemany(
+                    """
+                    MERGE dbo.validation_partitions WITH (HOLDLOCK) AS t
+                    USING (
+                        SELECT ? AS symbol_id, ? AS [month], ? AS version, ? AS rules_version,
+                               ? AS missing_fields_mask, ? AS suspicious_mask
+                    ) AS s
+                    ON t.symbol_id = s.symbol_id AND t.[month] = s.[month]
+                    WHEN MATCHED THEN
+                        UPDATE SET
+                            version = s.version,
+                            rules_version = s.rules_version,
+                            missing_fields_mask = s.missing_fields_mask,
+                            suspicious_mask = s.suspicious_mask,
+                            computed_at = SYSUTCDATETIME()
+                    WHEN NOT MATCHED THEN
+                        INSERT (
+                            symbol_id, [month], version, rules_version,
+                            missing_fields_mask, suspicious_mask, computed_at
+                        ) VALUES (
+                            s.symbol_id, s.[month], s.version, s.rules_version,
+                            s.missing_fields_mask, s.suspicious_mask, SYSUTCDATETIME()
+                        );
+                    """,
+                    [(r[0], r[1], r[2], VALIDATION_RULES_VERSION, r[3], r[4]) for r in results]
+                )
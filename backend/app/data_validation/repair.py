@@ -0,0 +1,151 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Tuple
+
+from app.core.dates import trading_day_runs, unique_ordinals
+from app.data_ingestion.orchestrator import orchestrate_batched_upsert
+from app.data_validation.models import ValidationResult
+from app.data_validation.validators import validate_symbols_batched
+
+# Stored rows with these findings are refetched and overwritten
+OVERWRITE_CODES = ("SUSPICIOUS_PRICE", "MISSING_FIELDS")
+
+# Runs of one symbol at most this many trading days apart are fetched as one
+# range: a few extra days in one download are cheaper than another request
+REPAIR_MERGE_GAP = 5
+
+# Tickers per provider download
+REPAIR_BATCH_SYMBOLS = 20
+
+
+@dataclass(slots=True)
+class RepairFetch:
+    """One planned provider download: several symbols over one date range."""
+    symbols: List[str]
+    start: date
+    end: date
+
+
+@dataclass(slots=True)
+class SymbolRepair:
+    """Before/after validation state of one repaired symbol."""
+    symbol: str
+    coverage_before: float
+    coverage_after: float
+    missing_before: int
+    missing_after: int
+    flagged_before: int
+    flagged_after: int
+    rows_inserted: int
+    rows_revised: int
+
+
+@dataclass(slots=True)
+class RepairReport:
+    fetches: List[RepairFetch]
+    symbols: List[SymbolRepair]
+    dry_run: bool
+    elapsed_ms: int
+
+
+def _flagged_count(result: ValidationResult) -> int:
+    return sum(i.count for i in result.issues if i.code in OVERWRITE_CODES)
+
+
+def repair_ranges(result: ValidationResult, merge_gap: int = REPAIR_MERGE_GAP) -> List[Tuple[date, date]]:
+    """
+    Trading-day ranges to refetch for one symbol: its missing days plus the
+    rows flagged with an OVERWRITE_CODES issue, merged across gaps of up to
+    merge_gap trading days.
+    """
+    dates = list(result.missing_dates)
+    for issue in result.issues:
+        if issue.code in OVERWRITE_CODES:
+            dates.extend(issue.affected_dates)
+    return trading_day_runs(unique_ordinals(dates), max_gap=merge_gap)
+
+
+def plan_repair(
+    results: List[ValidationResult],
+    merge_gap: int = REPAIR_MERGE_GAP,
+    batch_symbols: int = REPAIR_BATCH_SYMBOLS
+) -> List[RepairFetch]:
+    """
+    Minimal set of downloads covering every symbol's repair_ranges().
+    Symbols needing the same range share a download, up to batch_symbols
+    tickers each. Symbols without findings are not fetched.
+    """
+    by_range: Dict[Tuple[date, date], List[str]] = defaultdict(list)
+    for result in results:
+        for span in repair_ranges(result, merge_gap):
+            by_range[span].append(result.symbol)
+
+    return [
+        RepairFetch(symbols[i:i + batch_symbols], start, end)
+        for (start, end), symbols in sorted(by_range.items())
+        for i in range(0, len(symbols), batch_symbols)
+    ]
+
+
+async def orchestrate_repair(
+    results: List[ValidationResult],
+    interval: str = "1d",
+    max_attempts: int = 3,
+    max_concurrent: int = 5,
+    coverage_threshold: float = 0.95,
+    dry_run: bool = False
+) -> RepairReport:
+    """
+    Repair what validation found: plan the fetches, run them through the
+    ingestion orchestrator (missing bars inserted, flagged bars overwritten)
+    and revalidate the repaired symbols over their original windows.
+    """
+    start_time = time.perf_counter()
+    fetches = plan_repair(results)
+    inserted: Dict[str, int] = {}
+    revised: Dict[str, int] = {}
+
+    if fetches:
+        inserted, revised, _ = await orchestrate_batched_upsert(
+            [(f.symbols, f.start, f.end) for f in fetches],
+            interval=interval,
+            max_attempts=max_attempts,
+            max_concurrent=max_concurrent,
+            coverage_threshold=coverage_threshold,
+            dry_run=dry_run,
+        )
+
+    repaired = {symbol for f in fetches for symbol in f.symbols}
+    before = [r for r in results if r.symbol in repaired]
+
+    # Revalidate per original window; a dry run changed nothing
+    after: Dict[str, ValidationResult] = {r.symbol: r for r in before}
+    if not dry_run:
+        windows: Dict[Tuple[date, date], List[str]] = defaultdict(list)
+        for r in before:
+            windows[(r.start, r.end)].append(r.symbol)
+        for (start, end), symbols in windows.items():
+            for r in await validate_symbols_batched(symbols, start, end):
+                after[r.symbol] = r
+
+    return RepairReport(
+        fetches=fetches,
+        symbols=[
+            SymbolRepair(
+                symbol=r.symbol,
+                coverage_before=r.coverage,
+                coverage_after=after[r.symbol].coverage,
+                missing_before=len(r.missing_dates),
+                missing_after=len(after[r.symbol].missing_dates),
+                flagged_before=_flagged_count(r),
+                flagged_after=_flagged_count(after[r.symbol]),
+                rows_inserted=inserted.get(r.symbol, 0),
+                rows_revised=revised.get(r.symbol, 0),
+            )
+            for r in before
+        ],
+        dry_run=dry_run,
+        elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+    )
@@ -1,14 +1,30 @@
 import asyncio
 from datetime import date
-from typing import List
+from typing import AsyncGenerator, List, Set
 
 from .models import ValidationResult
-from .validators import validate_symbol
+from .validators import validate_symbol, validate_symbols_batched
 
-async def validate_symbols(symbols: List[str], start: date, end: date, max_concurrent: int = 5):
+# Symbols per batched validation when streaming; smaller chunks report sooner
+STREAM_CHUNK_SYMBOLS = 25
+
+async def validate_symbols(
+    symbols: List[str],
+    start: date,
+    end: date,
+    max_concurrent: int = 5,
+    batched: bool = False,
+    anomalies: bool = False
+):
     """
     Validate multiple symbols concurrently with bounded concurrency.
+    batched=True reads all symbols with one scan per IN-list chunk instead
+    of four queries per symbol; results are the same. anomalies=True
+    (batched only) adds the statistical anomaly checks.
     """
+    if batched:
+        return await validate_symbols_batched(symbols, start, end, anomalies=anomalies)
+
     semaphore = asyncio.Semaphore(max_concurrent)
     results: List[ValidationResult] = []
 
@@ -19,3 +35,44 @@ async def validate_symbols(symbols: List[str], start: date, end: date, max_concu
     tasks = [sem_task(sym) for sym in symbols]
     results = await asyncio.gather(*tasks)
     return results
+
+
+async def iter_validate_symbols(
+    symbols: List[str],
+    start: date,
+    end: date,
+    max_concurrent: int = 5,
+    chunk_size: int = STREAM_CHUNK_SYMBOLS,
+    anomalies: bool = False
+) -> AsyncGenerator[ValidationResult, None]:
+    """
+    Validate symbols in batched chunks, up to max_concurrent chunks at a
+    time, and yield each result as soon as its chunk finishes (completion
+    order, not input order). A chunk is only started when a slot frees up,
+    so at most max_concurrent chunks are running or waiting to be read by
+    the consumer; in-flight chunks are cancelled if it stops early.
+    """
+    offsets = iter(range(0, len(symbols), chunk_size))
+
+    def start_next(pending: Set[asyncio.Task]) -> None:
+        i = next(offsets, None)
+        if i is not None:
+            pending.add(asyncio.ensure_future(
+                validate_symbols_batched(symbols[i:i + chunk_size], start, end, anomalies=anomalies)
+            ))
+
+    pending: Set[asyncio.Task] = set()
+    for _ in range(max(max_concurrent, 1)):
+        start_next(pending)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results = task.result()
+                start_next(pending)
+                for result in results:
+                    yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
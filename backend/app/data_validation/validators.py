@@ -1,10 +1,19 @@
 import time
+from collections import defaultdict
 from datetime import date
-from typing import List
+from typing import Dict, List, Sequence, Tuple
 
-from app.core.dates import trading_days
+import numpy as np
+
+from app.core.dates import trading_day_ordinals
+from app.data_validation.anomalies import anomaly_issues, detect_anomalies, price_panel
+from app.data_validation.coverage import coverage_of, missing_dates_of, presence_matrix
 from app.data_validation.models import ValidationResult, ValidationIssue, ValidationStatus
 from app.data_validation import queries
+from app.db.crud.get_prices import get_prices_arrays
+from app.db.crud.price_arrays import to_ordinal
+from app.db.crud.price_partitions import expand_day_masks, get_price_partitions, next_month
+from app.db.crud.symbols import resolve_symbol_ids
 
 
 async def validate_symbol(symbol: str, start: date, end: date) -> ValidationResult:
@@ -19,19 +28,62 @@ async def validate_symbol(symbol: str, start: date, end: date) -> ValidationResu
     last_date = summary.get("last_date")
     observed_days = summary.get("observed_days", 0)
 
-    # 2️⃣ Generate expected trading days
-    expected_dates = trading_days(start, end)
-    expected_days = len(expected_dates)
-
-    # 3️⃣ Existing dates from DB
+    # 2️⃣ Existing dates from DB, as a one-row bitmap over the expected trading days
     existing_dates = await queries.get_existing_dates(symbol, start, end)
-    existing_dates_set = set(existing_dates)
+    expected = trading_day_ordinals(start, end)
+    present = presence_matrix(
+        expected,
+        np.zeros(len(existing_dates), dtype=np.intp),
+        np.fromiter((to_ordinal(d) for d in existing_dates), dtype=np.int64, count=len(existing_dates)),
+        n_symbols=1,
+    )
+
+    # 3️⃣ Missing OHLCV and suspicious/outlier prices
+    missing_ohlcv_dates = await queries.get_missing_ohlcv_dates(symbol, start, end)
+    suspicious_dates = await queries.get_suspicious_price_dates(symbol, start, end)
+
+    return _build_result(
+        symbol,
+        start,
+        end,
+        expected,
+        present[0],
+        coverage_of(present)[0],
+        first_date,
+        last_date,
+        observed_days,
+        missing_ohlcv_dates,
+        suspicious_dates,
+        elapsed_ms=(time.perf_counter() - start_time) * 1000,
+    )
+
 
-    # 4️⃣ Calculate coverage
-    coverage = len(existing_dates_set) / len(expected_dates) if len(expected_dates) > 0 else 0.0
+def _build_result(
+    symbol: str,
+    start: date,
+    end: date,
+    expected: np.ndarray,
+    present_row: np.ndarray,
+    coverage: float,
+    first_date,
+    last_date,
+    observed_days: int,
+    missing_ohlcv_dates: list,
+    suspicious_dates: list,
+    elapsed_ms: float,
+    anomalies: Sequence[ValidationIssue] = (),
+) -> ValidationResult:
+    """
+    Turn one symbol's query results into a ValidationResult. Shared by the
+    per-symbol and batched paths so both report identical findings.
+    present_row is the symbol's row of the existing-date bitmap over
+    `expected` (trading-day ordinals). anomalies are appended as found
+    by validate_anomalies().
+    """
+    expected_days = len(expected)
 
-    # 5️⃣ Detect missing dates
-    missing_dates = [d for d in expected_dates if d not in existing_dates_set]
+    # 4️⃣ Detect missing dates
+    missing_dates = missing_dates_of(present_row, expected)
 
     issues: List[ValidationIssue] = []
 
@@ -46,7 +98,6 @@ async def validate_symbol(symbol: str, start: date, end: date) -> ValidationResu
         )
 
     # 6️⃣ Missing OHLCV
-    missing_ohlcv_dates = await queries.get_missing_ohlcv_dates(symbol, start, end)
     missing_ohlcv_count = len(missing_ohlcv_dates)
     if missing_ohlcv_count:
         issues.append(
@@ -59,7 +110,6 @@ async def validate_symbol(symbol: str, start: date, end: date) -> ValidationResu
         )
 
     # 7️⃣ Suspicious/outlier prices
-    suspicious_dates = await queries.get_suspicious_price_dates(symbol, start, end)
     suspicious_count = len(suspicious_dates)
     if suspicious_count:
         issues.append(
@@ -71,28 +121,199 @@ async def validate_symbol(symbol: str, start: date, end: date) -> ValidationResu
             )
         )
 
+    # Return spikes, stale closes, volume outliers, OHLC inconsistencies
+    issues.extend(anomalies)
+
     fails = len(missing_dates) + missing_ohlcv_count + suspicious_count
     status = ValidationStatus.PARTIAL
-    if fails == 0:
+    if fails == 0 and not anomalies:
         status = ValidationStatus.OK
     elif fails == expected_days:
         status = ValidationStatus.FAIL
 
-    end_time = time.perf_counter()
-    elapsed = (end_time - start_time) * 1000
-
     # 8️⃣ Return full ValidationResult
     return ValidationResult(
         symbol=symbol,
         start=start,
         end=end,
         status=status,
-        coverage=coverage,
+        coverage=float(coverage),
         expected_days=expected_days,
         observed_days=observed_days,
         first_date=first_date,
         last_date=last_date,
         missing_dates=missing_dates,
         issues=issues,
-        elapsed_ms=elapsed
+        elapsed_ms=elapsed_ms
     )
+
+
+async def _revalidate_partitions(stale: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    Recompute (missing_fields_mask, suspicious_mask) for stale
+    (symbol_id, month ordinal, version) partitions and cache them.
+    Adjacent months of a symbol are scanned as one date range.
+    """
+    ranges = []
+    for symbol_id, month, _ in stale:
+        lo = date.fromordinal(month)
+        hi = next_month(lo)
+        if ranges and ranges[-1][0] == symbol_id and ranges[-1][2] == lo:
+            ranges[-1] = (symbol_id, ranges[-1][1], hi)
+        else:
+            ranges.append((symbol_id, lo, hi))
+
+    masks: Dict[Tuple[int, int], List[int]] = {(symbol_id, month): [0, 0] for symbol_id, month, _ in stale}
+    for symbol_id, d, flags in await queries.scan_partition_rows(ranges):
+        day = date.fromordinal(to_ordinal(d))
+        partition = masks[(symbol_id, day.replace(day=1).toordinal())]
+        if flags & queries.FLAG_MISSING_FIELDS:
+            partition[0] |= 1 << (day.day - 1)
+        if flags & queries.FLAG_SUSPICIOUS:
+            partition[1] |= 1 << (day.day - 1)
+
+    await queries.store_partition_results([
+        (symbol_id, date.fromordinal(month), version, *masks[(symbol_id, month)])
+        for symbol_id, month, version in stale
+    ])
+    return {key: (m[0], m[1]) for key, m in masks.items()}
+
+
+def _dates_in_window(months: np.ndarray, masks: np.ndarray, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(partition index, ordinal) of the days set in masks that fall within [lo, hi]."""
+    partition, ordinals = expand_day_masks(months, masks)
+    keep = (ordinals >= lo) & (ordinals <= hi)
+    return partition[keep], ordinals[keep]
+
+
+def _dates_by_row(rows: np.ndarray, ordinals: np.ndarray) -> Dict[int, List[date]]:
+    by_row: Dict[int, List[date]] = defaultdict(list)
+    for row, o in zip(rows.tolist(), ordinals.tolist()):
+        by_row[row].append(date.fromordinal(o))
+    return by_row
+
+
+async def validate_anomalies(symbols: List[str], start: date, end: date) -> Dict[str, List[ValidationIssue]]:
+    """
+    Statistical anomaly issues per symbol, from one vectorized pass over a
+    symbols x trading-days panel of the stored prices (see anomalies.py).
+    """
+    arrays = await get_prices_arrays(symbols, start, end)
+    ordered = sorted(arrays)
+    panel = price_panel([arrays[s] for s in ordered], trading_day_ordinals(start, end))
+    flags = detect_anomalies(panel)
+    return {symbol: anomaly_issues(flags, row, panel.days) for row, symbol in enumerate(ordered)}
+
+
+async def validate_symbols_batched(
+    symbols: List[str],
+    start: date,
+    end: date,
+    anomalies: bool = False
+) -> List[ValidationResult]:
+    """
+    Validate many symbols incrementally from the (symbol, month) partition index.
+
+    Presence comes from dbo.price_partitions day masks, maintained on write.
+    Row-level findings are cached per partition in dbo.validation_partitions
+    with the partition version they were computed against; only partitions
+    whose version changed since are rescanned. Work is thus proportional
+    to new data, not to history. Findings match validate_symbol;
+    elapsed_ms is the whole batch's time. anomalies=True also runs
+    validate_anomalies(), which reads the prices themselves.
+    """
+    start_time = time.perf_counter()
+
+    symbol_ids = await resolve_symbol_ids(symbols)
+    ids = sorted(set(symbol_ids.values()))
+    partitions = await get_price_partitions(ids, start, end) if ids else []
+
+    cached = await queries.load_partition_results(ids, start, end) if partitions else {}
+
+    def is_current(symbol_id: int, month: int, version: int) -> bool:
+        entry = cached.get((symbol_id, month))
+        return entry is not None and entry[:2] == (version, queries.VALIDATION_RULES_VERSION)
+
+    stale = [
+        (symbol_id, month, version)
+        for symbol_id, month, _, version in partitions
+        if not is_current(symbol_id, month, version)
+    ]
+    fresh = await _revalidate_partitions(stale) if stale else {}
+
+    def findings(symbol_id: int, month: int) -> Tuple[int, int]:
+        if (symbol_id, month) in fresh:
+            return fresh[(symbol_id, month)]
+        return cached[(symbol_id, month)][2:]
+
+    # One row per symbol with data, plus an empty last row for symbols without
+    row_of = {symbol_id: i for i, symbol_id in enumerate(sorted({p[0] for p in partitions}))}
+    part_rows = np.array([row_of[p[0]] for p in partitions], dtype=np.intp)
+    months = np.array([p[1] for p in partitions], dtype=np.int64)
+    day_masks = np.array([p[2] for p in partitions], dtype=np.int64)
+    flag_masks = np.array([findings(p[0], p[1]) for p in partitions], dtype=np.int64).reshape(-1, 2)
+
+    lo, hi = start.toordinal(), end.toordinal()
+    stored_part, stored = _dates_in_window(months, day_masks, lo, hi)
+    stored_rows = part_rows[stored_part]
+
+    # Gaps and coverage for the whole batch as one symbols x trading-days bitmap
+    expected = trading_day_ordinals(start, end)
+    present = presence_matrix(expected, stored_rows, stored, n_symbols=len(row_of) + 1)
+    coverage = coverage_of(present)
+
+    # stored is ordered by (symbol_id, month, day), so each row's dates are one sorted run
+    bounds = np.searchsorted(stored_rows, np.arange(len(row_of) + 1), side="left")
+    bounds_end = np.searchsorted(stored_rows, np.arange(len(row_of) + 1), side="right")
+
+    missing_part, missing_fields = _dates_in_window(months, flag_masks[:, 0], lo, hi)
+    suspicious_part, suspicious = _dates_in_window(months, flag_masks[:, 1], lo, hi)
+    missing_by_row = _dates_by_row(part_rows[missing_part], missing_fields)
+    suspicious_by_row = _dates_by_row(part_rows[suspicious_part], suspicious)
+    anomaly_issues_by_symbol = await validate_anomalies(symbols, start, end) if anomalies else {}
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    results = []
+    for symbol in symbols:
+        row = row_of.get(symbol_ids.get(symbol), len(row_of))
+        first, last = bounds[row], bounds_end[row]
+        results.append(
+            _build_result(
+                symbol,
+                start,
+                end,
+                expected,
+                present[row],
+                coverage[row],
+                date.fromordinal(int(stored[first])) if last > first else None,
+                date.fromordinal(int(stored[last - 1])) if last > first else None,
+                int(last - first),
+                missing_by_row.get(row, []),
+                suspicious_by_row.get(row, []),
+                elapsed_ms=elapsed_ms,
+                anomalies=anomaly_issues_by_symbol.get(symbol, ()),
+            )
+        )
+    return results
+
+
+async def coverage_bitmap(symbols: List[str], start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Existing-date bitmap for many symbols, read from the price_partitions
+    index only (no price rows). Returns (trading-day ordinals, bool matrix
+    with one row per entry of `symbols`); unknown symbols get empty rows.
+    """
+    symbol_ids = await resolve_symbol_ids(symbols)
+    ids = sorted(set(symbol_ids.values()))
+    partitions = await get_price_partitions(ids, start, end) if ids else []
+
+    # One row per stored symbol_id, plus an empty last row for symbols without
+    row_of = {symbol_id: i for i, symbol_id in enumerate(ids)}
+    part_rows = np.array([row_of[p[0]] for p in partitions], dtype=np.intp)
+    months = np.array([p[1] for p in partitions], dtype=np.int64)
+    day_masks = np.array([p[2] for p in partitions], dtype=np.int64)
+    stored_part, stored = _dates_in_window(months, day_masks, start.toordinal(), end.toordinal())
+
+    expected = trading_day_ordinals(start, end)
+    present = presence_matrix(expected, part_rows[stored_part], stored, n_symbols=len(row_of) + 1)
+    return expected, present[[row_of.get(symbol_ids.get(s), len(row_of)) for s in symbols]]
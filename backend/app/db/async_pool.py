@@ -14,12 +14,33 @@ from app.core.config import (
     DB_POOL_MIN,
     DB_POOL_MAX,
 )
+from app.core.metrics import registry
 
 # Global pool
 _pool = None
 _pool_lock = asyncio.Lock()
 
 
+def _pool_stats():
+    """Connection counts for db_pool_connections; sqlite has a single connection, no pool."""
+    if _pool is None or DB_ENGINE == "sqlite":
+        return {}
+    return {
+        ("size",): _pool.size,
+        ("free",): _pool.freesize,
+        ("max",): _pool.maxsize,
+    }
+
+
+registry.callback(
+    "db_pool_connections",
+    "aioodbc pool connections by state (size, free, max)",
+    "gauge",
+    ("state",),
+    _pool_stats,
+)
+
+
 def _build_mssql_dsn() -> str:
     """Build ODBC connection string for SQL Server."""
     drivers = [driver for driver in pyodbc.drivers() if "SQL Server" in driver and "ODBC" in driver]
@@ -1,4 +1,7 @@
+import time
 import app.db.async_pool as async_pool
+from app.core.metrics import DB_POOL_ACQUIRE_SECONDS
+from app.core.timing import add_phase
 
 async def get_connection():
     """
@@ -7,7 +10,15 @@ async def get_connection():
     if async_pool._pool is None:
         raise RuntimeError("Database pool not initialized")
 
-    return async_pool._pool if not hasattr(async_pool._pool, "acquire") else await async_pool._pool.acquire()
+    if not hasattr(async_pool._pool, "acquire"):
+        return async_pool._pool
+
+    t0 = time.perf_counter()
+    conn = await async_pool._pool.acquire()
+    elapsed = time.perf_counter() - t0
+    DB_POOL_ACQUIRE_SECONDS.observe(elapsed)
+    add_phase("pool", elapsed)
+    return conn
 
 
 async def release_connection(conn):
@@ -1,3 +1,12 @@
+from .symbols import *
 from .insert_prices import *
 from .get_prices import *
-from .get_price_keys import *
\ No newline at end of file
+from .get_price_keys import *
+from .data_versions import *
+from .price_arrays import *
+from .price_cache import *
+from .get_prices_page import *
+from .price_returns import *
+from .price_partitions import *
+from .price_resample import *
+from .upsert_prices import *
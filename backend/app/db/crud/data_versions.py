@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List
+from app.db.crud.fanout import fetchall_chunked
+from app.db.crud.symbols import resolve_symbol_ids
+
+# Last-Modified of a symbol without stored rows
+_NEVER = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class DataVersion:
+    """
+    Version of one symbol's stored price data, read from dbo.price_partitions.
+
+    row_count sums the partitions' row counts; generation sums their
+    versions, which every write touching a month bumps, so it only grows.
+    last_modified is the latest partition modified_at. Nothing is kept in
+    memory: every worker and process reads the same values, including after
+    writes made by scripts or other workers.
+    """
+    row_count: int
+    generation: int
+    last_modified: datetime
+
+
+async def get_data_versions(symbols: List[str]) -> Dict[str, DataVersion]:
+    """
+    Return the data version of each symbol, read from the DB on every call
+    (one grouped query per IN-list chunk over a few partition rows per
+    symbol and year). Unknown symbols and symbols without rows get row_count 0.
+    """
+    ids = await resolve_symbol_ids(symbols)
+
+    rows = await fetchall_chunked(
+        "data_versions",
+        sorted(set(ids.values())),
+        lambda chunk: (
+            f"""
+            SELECT symbol_id, SUM(row_count), SUM(version), MAX(modified_at)
+            FROM dbo.price_partitions
+            WHERE symbol_id IN ({','.join('?' for _ in chunk)})
+            GROUP BY symbol_id
+            """,
+            chunk,
+        ),
+    )
+    by_id = {
+        int(row[0]): (int(row[1]), int(row[2]), row[3].replace(tzinfo=timezone.utc, microsecond=0))
+        for row in rows
+    }
+
+    versions: Dict[str, DataVersion] = {}
+    for symbol in symbols:
+        stored = by_id.get(ids.get(symbol))
+        versions[symbol] = DataVersion(*stored) if stored else DataVersion(0, 0, _NEVER)
+    return versions
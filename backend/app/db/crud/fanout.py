@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Callable, List, Sequence, Tuple
+
+from app.core.config import DB_MAX_IN_PARAMS, DB_READ_FANOUT
+from app.core.metrics import DB_QUERY_SECONDS, observe_query
+from app.core.timing import add_phase
+from app.db.connection import get_connection, release_connection
+
+# Builds (sql, params) for one chunk of IN-list values
+ChunkQuery = Callable[[list], Tuple[str, list]]
+
+# Fetched batches buffered per chunk while an earlier chunk is still being consumed
+_QUEUE_BATCHES = 2
+
+_DONE = object()
+
+
+def in_chunks(values: Sequence, size: int = DB_MAX_IN_PARAMS) -> List[list]:
+    """
+    Split IN-list values into chunks that keep each statement well under
+    SQL Server's ~2100 parameter limit. Order is preserved, so chunks of
+    sorted ids give results that concatenate into sorted order.
+    """
+    values = list(values)
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+async def _fetchall_one(query: str, sql: str, params: list) -> List[tuple]:
+    conn = await get_connection()
+    try:
+        async with conn.cursor() as cursor:
+            with observe_query(query):
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+    finally:
+        await release_connection(conn)
+
+
+async def _stream_one(query: str, sql: str, params: list, batch_size: int) -> AsyncGenerator[List[tuple], None]:
+    histogram = DB_QUERY_SECONDS.labels(query)
+    conn = await get_connection()
+    try:
+        async with conn.cursor() as cursor:
+            t0 = time.perf_counter()
+            await cursor.execute(sql, params)
+            while True:
+                batch = await cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                spent = time.perf_counter() - t0
+                yield batch
+                t0 = time.perf_counter() - spent
+            elapsed = time.perf_counter() - t0
+            histogram.observe(elapsed)
+            add_phase("sql", elapsed)
+    finally:
+        await release_connection(conn)
+
+
+async def fetchall_chunked(
+    query: str,
+    values: Sequence,
+    build: ChunkQuery,
+    chunk_size: int = DB_MAX_IN_PARAMS,
+    concurrency: int = DB_READ_FANOUT
+) -> List[tuple]:
+    """
+    Run build(chunk) for every chunk of values and return all rows, in chunk order.
+    Chunks run concurrently on separate pool connections (at most `concurrency` at once).
+    Each chunk is timed as db_query_duration_seconds{query=query}.
+    """
+    chunks = in_chunks(values, chunk_size)
+    if not chunks:
+        return []
+    if len(chunks) == 1:
+        return await _fetchall_one(query, *build(chunks[0]))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chunk: list) -> List[tuple]:
+        async with semaphore:
+            return await _fetchall_one(query, *build(chunk))
+
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return [row for rows in results for row in rows]
+
+
+async def stream_chunked(
+    query: str,
+    values: Sequence,
+    build: ChunkQuery,
+    batch_size: int,
+    chunk_size: int = DB_MAX_IN_PARAMS,
+    concurrency: int = DB_READ_FANOUT
+) -> AsyncGenerator[List[tuple], None]:
+    """
+    Stream fetchmany() batches of build(chunk) for every chunk of values as
+    one ordered stream: all of chunk 0, then chunk 1, ...
+
+    Up to `concurrency` chunks are read ahead on their own pool connections,
+    each buffering at most _QUEUE_BATCHES batches, so memory stays bounded.
+    Time spent in execute/fetchmany (not waiting on the consumer) is
+    recorded per chunk as db_query_duration_seconds{query=query}.
+    """
+    chunks = in_chunks(values, chunk_size)
+    if not chunks:
+        return
+    if len(chunks) == 1:
+        # Nothing to read ahead: stream on the caller's task, without a queue
+        async for batch in _stream_one(query, *build(chunks[0]), batch_size):
+            yield batch
+        return
+
+    queues = [asyncio.Queue(maxsize=_QUEUE_BATCHES) for _ in chunks]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    histogram = DB_QUERY_SECONDS.labels(query)
+
+    async def produce(chunk: list, queue: asyncio.Queue) -> None:
+        async with semaphore:
+            try:
+                conn = await get_connection()
+                try:
+                    async with conn.cursor() as cursor:
+                        t0 = time.perf_counter()
+                        await cursor.execute(*build(chunk))
+                        while True:
+                            batch = await cursor.fetchmany(batch_size)
+                            if not batch:
+                                break
+                            spent = time.perf_counter() - t0
+                            await queue.put(batch)
+                            t0 = time.perf_counter() - spent
+                        elapsed = time.perf_counter() - t0
+                        histogram.observe(elapsed)
+                        add_phase("sql", elapsed)
+                finally:
+                    await release_connection(conn)
+            except Exception as exc:
+                # Re-raised by the consumer when it reaches this chunk
+                await queue.put(exc)
+                return
+            await queue.put(_DONE)
+
+    # Tasks are started in chunk order, so the semaphore admits them in the order they are consumed
+    tasks = [asyncio.create_task(produce(chunk, queue)) for chunk, queue in zip(chunks, queues)]
+    try:
+        for queue in queues:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,8 @@
 from typing import Set, Tuple
 from datetime import date
+from app.core.metrics import observe_query
 from app.db.connection import get_connection, release_connection
+from app.db.crud.symbols import resolve_symbol_ids
 
 async def get_price_keys(symbol: str, start: date, end: date) -> Set[Tuple[str, date]]:
     """
@@ -10,18 +12,23 @@ async def get_price_keys(symbol: str, start: date, end: date) -> Set[Tuple[str,
     if not symbol:
         return set()
 
+    symbol_id = (await resolve_symbol_ids([symbol])).get(symbol)
+    if symbol_id is None:
+        return set()
+
     conn = await get_connection()
     try:
         async with conn.cursor() as cursor:
             sql = """
-                SELECT symbol, [date]
+                SELECT [date]
                 FROM dbo.prices
-                WHERE symbol = ?
+                WHERE symbol_id = ?
                   AND [date] >= ?
                   AND [date] <= ?
             """
-            await cursor.execute(sql, [symbol, start, end])
-            rows = await cursor.fetchall()
-            return {(row[0], row[1]) for row in rows}
+            with observe_query("price_keys"):
+                await cursor.execute(sql, [symbol_id, start, end])
+                rows = await cursor.fetchall()
+            return {(symbol, row[0]) for row in rows}
     finally:
         await release_connection(conn)
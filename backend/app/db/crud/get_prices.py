@@ -1,47 +1,239 @@
-from typing import AsyncGenerator, List
+import time
+from dataclasses import replace
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 from datetime import date, timedelta
-from app.db.connection import get_connection, release_connection
+from app.core.timing import add_phase, timed
+from app.db.crud.fanout import stream_chunked
+from app.db.crud.data_versions import DataVersion, get_data_versions
+from app.db.crud.price_arrays import PriceArrays, PriceArraysBuilder
+from app.db.crud.price_cache import price_cache
+from app.db.crud.symbols import in_symbol_id_order, resolve_symbol_ids
 from app.schemas.prices.price_row import PriceDataRow
 #from app.core.logging import get_logger
 
 #log = get_logger(__name__)
 
+# Rows per cursor.fetchmany() round trip for batched readers
+PRICE_FETCH_BATCH_SIZE = 5000
+# Larger round trips when decoding straight into NumPy arrays
+PRICE_ARRAY_BATCH_SIZE = 50_000
+
+
+def _lookback_start(start: date, lookback: int) -> date:
+    if lookback > 0:
+        return start - timedelta(days=lookback-1)
+    return start
+
+
+def _padded_ids(symbol_ids: List[int]) -> List[int]:
+    """
+    Pad an IN list to the next power of two by repeating its last id.
+    Only a handful of distinct statement texts then exist, so prepared
+    statements and cached plans are reused instead of compiled per list length.
+    """
+    size = 1
+    while size < len(symbol_ids):
+        size *= 2
+    return list(symbol_ids) + [symbol_ids[-1]] * (size - len(symbol_ids))
+
+
+def _build_prices_query(
+    symbol_ids: List[int],
+    start: date,
+    end: date,
+    lookback: int = 0
+) -> Tuple[str, list]:
+    """
+    Build the SQL and parameters shared by the price readers.
+    Filters on the integer symbol_id key (a None start/end is unbounded);
+    rows come back in clustered-key (symbol_id, date) order with the ticker joined back in.
+    """
+    symbol_ids = _padded_ids(symbol_ids)
+    clauses = [f"p.symbol_id IN ({','.join('?' for _ in symbol_ids)})"]
+    params: list = list(symbol_ids)
+    if start is not None:
+        clauses.append("p.date >= ?")
+        params.append(_lookback_start(start, lookback))
+    if end is not None:
+        clauses.append("p.date <= ?")
+        params.append(end)
+
+    sql = f"""
+        SELECT s.symbol, p.date, p.[open], p.[high], p.[low], p.[close], p.volume
+        FROM dbo.prices p
+        JOIN dbo.symbols s ON s.symbol_id = p.symbol_id
+        WHERE {' AND '.join(clauses)}
+        ORDER BY p.symbol_id, p.date ASC
+    """
+    return sql, params
+
+
+async def _fetch_price_arrays(
+    symbols: List[str],
+    start: date,
+    end: date,
+    versions: Optional[Dict[str, DataVersion]] = None
+) -> Dict[str, PriceArrays]:
+    """
+    Read the given symbols from the DB straight into per-symbol column arrays.
+
+    Buffers are preallocated from each symbol's stored row count (its data
+    version, loaded here unless the caller already has it) and filled
+    column-wise per fetchmany batch, so no per-row model, datetime or list
+    of tuples is kept.
+    """
+    if versions is None:
+        versions = await get_data_versions(symbols)
+    # The row count covers all history; a bounded range can hold at most ~5 rows per 7 days
+    span = (end - start).days * 5 // 7 + 8 if start is not None and end is not None else None
+    builders = {
+        s: PriceArraysBuilder(s, versions[s].row_count if span is None else min(versions[s].row_count, span))
+        for s in symbols
+    }
+    # The DB compares symbols case-insensitively; map rows back to the requested spelling
+    requested = {s.upper(): builders[s] for s in symbols}
+
+    async for batch in iter_price_batches(symbols, start, end, batch_size=PRICE_ARRAY_BATCH_SIZE):
+        with timed("decode"):
+            names, dates, opens, highs, lows, closes, volumes = zip(*batch)
+            # Rows are grouped by symbol, so each batch is a few contiguous runs
+            run_start = 0
+            for i in range(1, len(names) + 1):
+                if i < len(names) and names[i] == names[run_start]:
+                    continue
+                builder = requested.get(str(names[run_start]).upper())
+                if builder is not None:
+                    builder.extend(
+                        dates[run_start:i],
+                        opens[run_start:i],
+                        highs[run_start:i],
+                        lows[run_start:i],
+                        closes[run_start:i],
+                        volumes[run_start:i],
+                    )
+                run_start = i
+
+    return {s: builder.build() for s, builder in builders.items()}
+
+
+async def get_prices_arrays(
+    symbols: List[str],
+    start: date,
+    end: date
+) -> Dict[str, PriceArrays]:
+    """
+    Per-symbol NumPy columns (int32 day ordinals, float64 OHLC, int64 volume)
+    for the given range, for analytic callers that would otherwise rebuild
+    DataFrames from PriceDataRow objects.
+    Slices are served from the in-process price cache where possible, once
+    checked against the stored data versions; only the missing symbols are
+    read from the DB.
+    """
+    wanted = sorted(set(symbols))
+    versions = await get_data_versions(wanted)
+    arrays: Dict[str, PriceArrays] = {}
+    misses = []
+    for symbol in wanted:
+        price_cache.check_version(symbol, versions[symbol].generation)
+        cached = price_cache.get(symbol, start, end)
+        if cached is None:
+            misses.append(symbol)
+        else:
+            arrays[symbol] = cached if cached.symbol == symbol else replace(cached, symbol=symbol)
+
+    if misses:
+        # Taken before the read: a write committing meanwhile keeps its slice out of the cache
+        generations = {symbol: price_cache.generation(symbol) for symbol in misses}
+        fetched = await _fetch_price_arrays(misses, start, end, versions)
+        for symbol, symbol_arrays in fetched.items():
+            price_cache.put(symbol, start, end, symbol_arrays, generations[symbol])
+        arrays.update(fetched)
+
+    return arrays
+
+
+async def _cached_slices(symbols: List[str], start: date, end: date) -> Optional[Dict[str, PriceArrays]]:
+    """Every requested slice from the price cache, or None if any of them is missing."""
+    wanted = sorted(set(symbols))
+    versions = await get_data_versions(wanted)
+    cached: Dict[str, PriceArrays] = {}
+    for symbol in wanted:
+        price_cache.check_version(symbol, versions[symbol].generation)
+        arrays = price_cache.get(symbol, start, end)
+        if arrays is None:
+            return None
+        cached[symbol] = arrays if arrays.symbol == symbol else replace(arrays, symbol=symbol)
+    return cached
+
+
 async def get_prices(
     symbols: List[str],
     start: date,
     end: date,
     lookback: int = 0
 ) -> AsyncGenerator[PriceDataRow, None]:
-    """Fetch price rows for the given symbols and date range."""
+    """
+    Fetch price rows for the given symbols and date range.
+    When every slice is already in the price cache the rows are built from
+    the cached arrays; otherwise they are streamed from the cursor batch by
+    batch, so the whole result is never held at once.
+    """
     if not symbols:
         return
-    
-    if lookback > 0:
-        start = start - timedelta(days=lookback-1) 
-
-    conn = await get_connection()
-    try:
-        async with conn.cursor() as cursor:
-            sql = f"""
-                SELECT symbol, date, [open], [high], [low], [close], volume
-                FROM dbo.prices
-                WHERE symbol IN ({','.join('?' for _ in symbols)})
-                  AND date >= ?
-                  AND date <= ?
-                ORDER BY symbol, date ASC
-            """
-            params = symbols + [start, end]
-            await cursor.execute(sql, params)
-
-            async for row in cursor:
-                yield PriceDataRow(
-                    symbol=row[0],
-                    date=row[1],
-                    open=row[2],
-                    high=row[3],
-                    low=row[4],
-                    close=row[5],
-                    volume=row[6]
-                )
-    finally:
-        await release_connection(conn)
+
+    if start is not None:
+        start = _lookback_start(start, lookback)
+
+    cached = await _cached_slices(symbols, start, end) if price_cache.enabled else None
+    if cached is not None:
+        # Same symbol order as the streamed rows
+        for symbol in await in_symbol_id_order(cached):
+            with timed("validate"):
+                rows = list(cached[symbol].to_rows())
+            for row in rows:
+                yield row
+        return
+
+    async for batch in iter_price_batches(symbols, start, end):
+        # Rows are yielded as they are built; only the construction is timed
+        validate = 0.0
+        for row in batch:
+            t0 = time.perf_counter()
+            price_row = PriceDataRow(
+                symbol=row[0],
+                date=row[1],
+                open=row[2],
+                high=row[3],
+                low=row[4],
+                close=row[5],
+                volume=row[6]
+            )
+            validate += time.perf_counter() - t0
+            yield price_row
+        add_phase("validate", validate)
+
+
+async def iter_price_batches(
+    symbols: List[str],
+    start: date,
+    end: date,
+    lookback: int = 0,
+    batch_size: int = PRICE_FETCH_BATCH_SIZE
+) -> AsyncGenerator[List[tuple], None]:
+    """
+    Fetch raw price tuples (symbol, date, open, high, low, close, volume)
+    in cursor-sized batches, grouped by symbol. No per-row models are built, so callers can
+    stream or pivot large result sets with flat memory.
+    """
+    symbol_ids = sorted(set((await resolve_symbol_ids(symbols)).values())) if symbols else []
+    if not symbol_ids:
+        return
+
+    # Large universes are split into IN-list chunks read concurrently; sorted ids keep the merged stream ordered
+    async for batch in stream_chunked(
+        "prices_range",
+        symbol_ids,
+        lambda chunk: _build_prices_query(chunk, start, end, lookback),
+        batch_size=batch_size,
+    ):
+        yield batch
@@ -0,0 +1,94 @@
+from typing import List, Optional, Tuple
+from datetime import date
+from app.core.metrics import observe_query
+from app.core.timing import timed
+from app.db.connection import get_connection, release_connection
+from app.db.crud.fanout import in_chunks
+from app.db.crud.symbols import resolve_symbol_ids
+from app.schemas.prices.price_row import PriceDataRow
+
+
+async def get_prices_page(
+    symbols: List[str],
+    start: date,
+    end: date,
+    page_size: int,
+    after: Optional[Tuple[str, date]] = None
+) -> Tuple[List[PriceDataRow], bool]:
+    """
+    Fetch one keyset page in clustered-key (symbol_id, date) order, starting
+    strictly after the `after` (symbol, date) key. Each branch of the
+    predicate is a range seek on the (symbol_id, date) key; no OFFSET scan.
+
+    Returns (rows, has_more).
+    """
+    ids = await resolve_symbol_ids(symbols)
+    wanted = sorted(set(ids.values()))
+    params: list = []
+    branches = []
+
+    # Open-ended bounds are simply left out of the predicate
+    end_sql, end_params = (" AND p.date <= ?", [end]) if end is not None else ("", [])
+    start_sql, start_params = (" AND p.date >= ?", [start]) if start is not None else ("", [])
+
+    if after is not None:
+        after_symbol, after_date = after
+        after_id = (await resolve_symbol_ids([after_symbol])).get(after_symbol)
+        if after_id is None:
+            return [], False
+        if after_id in wanted:
+            branches.append(f"(p.symbol_id = ? AND p.date > ?{end_sql})")
+            params += [after_id, after_date] + end_params
+        wanted = [i for i in wanted if i > after_id]
+
+    # Remaining ids go in IN-list chunks; later chunks are only read if the page is not full yet
+    chunks = in_chunks(wanted) or [[]]
+    fetched: list = []
+
+    conn = await get_connection()
+    try:
+        async with conn.cursor() as cursor:
+            for chunk in chunks:
+                chunk_branches = list(branches)
+                chunk_params = list(params)
+                if chunk:
+                    chunk_branches.append(
+                        f"(p.symbol_id IN ({','.join('?' for _ in chunk)}){start_sql}{end_sql})"
+                    )
+                    chunk_params += chunk + start_params + end_params
+                if not chunk_branches:
+                    break
+
+                sql = f"""
+                    SELECT TOP (?) s.symbol, p.date, p.[open], p.[high], p.[low], p.[close], p.volume
+                    FROM dbo.prices p
+                    JOIN dbo.symbols s ON s.symbol_id = p.symbol_id
+                    WHERE {' OR '.join(chunk_branches)}
+                    ORDER BY p.symbol_id, p.date ASC
+                """
+                # One extra row tells us whether another page exists
+                with observe_query("prices_page"):
+                    await cursor.execute(sql, [page_size + 1 - len(fetched)] + chunk_params)
+                    fetched += await cursor.fetchall()
+                if len(fetched) > page_size:
+                    break
+
+                # The after-key branch belongs to ids before every chunk; only run it once
+                branches, params = [], []
+    finally:
+        await release_connection(conn)
+
+    with timed("validate"):
+        rows = [
+            PriceDataRow(
+                symbol=row[0],
+                date=row[1],
+                open=row[2],
+                high=row[3],
+                low=row[4],
+                close=row[5],
+                volume=row[6]
+            )
+            for row in fetched[:page_size]
+        ]
+    return rows, len(fetched) > page_size
@@ -1,7 +1,14 @@
 from collections import defaultdict
 from typing import Iterable, List, Optional
 from app.schemas.prices.price_row import PriceDataRow
+from app.core.metrics import PRICE_ROWS_WRITTEN, observe_query
 from app.db.connection import get_connection, release_connection
+from app.db.crud.fanout import fetchall_chunked
+from app.db.crud.price_cache import price_cache
+from app.db.crud.price_partitions import refresh_price_partitions
+from app.db.crud.price_resample import resample_cache
+from app.db.crud.price_returns import refresh_price_returns
+from app.db.crud.symbols import resolve_symbol_ids
 
 def chunked(iterable: List, size: int = 1000):
     """Yield successive chunks from a list."""
@@ -17,6 +24,8 @@ async def bulk_insert_prices_chunked(
     Bulk insert PriceDataRow objects into dbo.prices in chunks.
     Duplicate (symbol, date) rows are skipped via unique constraint.
     Avoids IntegrityError by pre-filtering against DB and tracking intra-batch inserts.
+    dbo.price_returns is refreshed from each symbol's earliest inserted date,
+    and dbo.price_partitions for the months the new rows fall in.
 
     Args:
         rows: Iterable of PriceDataRow
@@ -32,24 +41,31 @@ async def bulk_insert_prices_chunked(
 
     total_inserted = 0
     inserted_by_symbol = defaultdict(int)
+    inserted_ranges = {}
+
+    # Map tickers to dbo.symbols ids, registering new symbols
+    symbol_ids = await resolve_symbol_ids((r.symbol for r in rows), create=True)
+
     conn = await get_connection()
     try:
         async with conn.cursor() as cursor:
             cursor.fast_executemany = True
 
             # 1️⃣ Pre-fetch existing keys from the DB
-            symbols = list({r.symbol for r in rows})
-            if symbols:
-                sql = f"""
-                    SELECT symbol, date
+            ids = sorted(set(symbol_ids.values()))
+            existing_rows = await fetchall_chunked(
+                "price_keys_prefetch",
+                ids,
+                lambda chunk: (
+                    f"""
+                    SELECT symbol_id, date
                     FROM dbo.prices
-                    WHERE symbol IN ({','.join('?' for _ in symbols)})
-                """
-                await cursor.execute(sql, symbols)
-                existing_rows = await cursor.fetchall()
-                existing_keys = {(row[0], row[1]) for row in existing_rows}
-            else:
-                existing_keys = set()
+                    WHERE symbol_id IN ({','.join('?' for _ in chunk)})
+                    """,
+                    chunk,
+                ),
+            )
+            existing_keys = {(row[0], row[1]) for row in existing_rows}
 
             # 2️⃣ Track keys inserted during this run to avoid intra-batch duplicates
             inserted_keys = set()
@@ -58,35 +74,56 @@ async def bulk_insert_prices_chunked(
             for batch in chunked(rows, chunk_size):
                 batch_filtered = [
                     r for r in batch
-                    if (r.symbol, r.date.date()) not in existing_keys
-                    and (r.symbol, r.date.date()) not in inserted_keys
+                    if (symbol_ids[r.symbol], r.date.date()) not in existing_keys
+                    and (symbol_ids[r.symbol], r.date.date()) not in inserted_keys
                 ]
 
                 if not batch_filtered:
                     continue
 
                 values = [
-                    (r.symbol, r.date.date(), r.open, r.high, r.low, r.close, r.volume)
+                    (symbol_ids[r.symbol], r.date.date(), r.open, r.high, r.low, r.close, r.volume)
                     for r in batch_filtered
                 ]
 
-                await cursor.executemany(
-                    """
-                    INSERT INTO dbo.prices (
-                        symbol, date, [open], [high], [low], [close], [volume]
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    values
-                )
+                with observe_query("prices_insert"):
+                    await cursor.executemany(
+                        """
+                        INSERT INTO dbo.prices (
+                            symbol_id, date, [open], [high], [low], [close], [volume]
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        values
+                    )
 
                 # Update inserted_keys and total count
                 for r in batch_filtered:
-                    inserted_keys.add((r.symbol, r.date.date()))
+                    d = r.date.date()
+                    inserted_keys.add((symbol_ids[r.symbol], d))
                     inserted_by_symbol[r.symbol] += 1
+                    lo, hi = inserted_ranges.get(r.symbol, (d, d))
+                    inserted_ranges[r.symbol] = (min(lo, d), max(hi, d))
                 if return_count:
                     total_inserted += len(batch_filtered)
 
+            # 4️⃣ Recompute derived returns from each symbol's earliest new row
+            await refresh_price_returns(
+                cursor,
+                {symbol_ids[symbol]: lo for symbol, (lo, _) in inserted_ranges.items()}
+            )
+
+            # 5️⃣ Re-index the (symbol, month) partitions the new rows fall in
+            await refresh_price_partitions(
+                cursor,
+                {symbol_ids[symbol]: bounds for symbol, bounds in inserted_ranges.items()}
+            )
+
     finally:
+        # Batches are autocommitted, so record whatever landed even on failure
+        PRICE_ROWS_WRITTEN.labels("inserted").inc(sum(inserted_by_symbol.values()))
+        for symbol, (lo, hi) in inserted_ranges.items():
+            price_cache.invalidate(symbol, lo, hi)
+            resample_cache.invalidate(symbol, lo, hi)
         await release_connection(conn)
 
     return inserted_by_symbol if return_count else None
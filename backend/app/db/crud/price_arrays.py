@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from app.schemas.prices.price_row import PriceDataRow
+
+
+def to_ordinal(value) -> int:
+    """Convert a driver date value (date, datetime or ISO string) to a proleptic ordinal."""
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    # SQLite hands dates back as ISO strings
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+@dataclass(slots=True)
+class PriceArrays:
+    """
+    Compact columnar OHLCV series for one symbol.
+
+    days holds date.toordinal() values (int32), sorted ascending.
+    """
+    symbol: str
+    days: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.days.nbytes + self.open.nbytes + self.high.nbytes
+            + self.low.nbytes + self.close.nbytes + self.volume.nbytes
+        )
+
+    @classmethod
+    def empty(cls, symbol: str) -> "PriceArrays":
+        f = np.empty(0, dtype=np.float64)
+        return cls(symbol, np.empty(0, dtype=np.int32), f, f, f, f, np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_rows(cls, symbol: str, rows: Iterable[tuple]) -> "PriceArrays":
+        """Build from raw (symbol, date, open, high, low, close, volume) tuples of one symbol."""
+        rows = list(rows)
+        if not rows:
+            return cls.empty(symbol)
+        _, dates, opens, highs, lows, closes, volumes = zip(*rows)
+        return cls(
+            symbol=symbol,
+            days=np.fromiter((to_ordinal(d) for d in dates), dtype=np.int32, count=len(rows)),
+            open=np.asarray(opens, dtype=np.float64),
+            high=np.asarray(highs, dtype=np.float64),
+            low=np.asarray(lows, dtype=np.float64),
+            close=np.asarray(closes, dtype=np.float64),
+            volume=np.asarray(volumes, dtype=np.float64).astype(np.int64),
+        )
+
+    def slice(self, start: Optional[date], end: Optional[date]) -> "PriceArrays":
+        """Return the [start, end] sub-range as array views (no copy)."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, to_ordinal(start), side="left"))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, to_ordinal(end), side="right"))
+        return PriceArrays(
+            self.symbol,
+            self.days[lo:hi],
+            self.open[lo:hi],
+            self.high[lo:hi],
+            self.low[lo:hi],
+            self.close[lo:hi],
+            self.volume[lo:hi],
+        )
+
+    def to_rows(self) -> Iterator[PriceDataRow]:
+        for d, o, h, l, c, v in zip(
+            self.days.tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+        ):
+            yield PriceDataRow(
+                symbol=self.symbol,
+                date=date.fromordinal(d),
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v
+            )
+
+
+class PriceArraysBuilder:
+    """
+    Fills one symbol's preallocated column arrays from cursor batches.
+
+    Capacity should come from a row count; if it turns out too small the
+    buffers grow geometrically, so a stale hint costs a copy, not an error.
+    """
+    __slots__ = ("symbol", "size", "days", "open", "high", "low", "close", "volume")
+
+    def __init__(self, symbol: str, capacity: int = 0):
+        self.symbol = symbol
+        self.size = 0
+        capacity = max(int(capacity), 16)
+        self.days = np.empty(capacity, dtype=np.int32)
+        self.open = np.empty(capacity, dtype=np.float64)
+        self.high = np.empty(capacity, dtype=np.float64)
+        self.low = np.empty(capacity, dtype=np.float64)
+        self.close = np.empty(capacity, dtype=np.float64)
+        self.volume = np.empty(capacity, dtype=np.int64)
+
+    def _reserve(self, n: int) -> None:
+        needed = self.size + n
+        capacity = len(self.days)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("days", "open", "high", "low", "close", "volume"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def extend(self, dates, opens, highs, lows, closes, volumes) -> None:
+        """Append equally long column sequences (one symbol's run of a batch)."""
+        n = len(dates)
+        if not n:
+            return
+        self._reserve(n)
+        lo, hi = self.size, self.size + n
+        self.days[lo:hi] = np.fromiter((to_ordinal(d) for d in dates), dtype=np.int32, count=n)
+        self.open[lo:hi] = opens
+        self.high[lo:hi] = highs
+        self.low[lo:hi] = lows
+        self.close[lo:hi] = closes
+        self.volume[lo:hi] = volumes
+        self.size = hi
+
+    def build(self) -> PriceArrays:
+        """Trim to the filled length; buffers with much spare room are copied so it can be freed."""
+        n = self.size
+        compact = n < len(self.days) // 2
+        columns = [
+            a[:n].copy() if compact else a[:n]
+            for a in (self.days, self.open, self.high, self.low, self.close, self.volume)
+        ]
+        return PriceArrays(self.symbol, *columns)
@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import PRICE_CACHE_MAX_BYTES
+from app.db.crud.price_arrays import PriceArrays
+
+CacheKey = Tuple[str, Optional[date], Optional[date]]
+
+
+def _covers(outer_start, outer_end, start, end) -> bool:
+    """True if [outer_start, outer_end] contains [start, end]; None means unbounded."""
+    if outer_start is not None and (start is None or start < outer_start):
+        return False
+    if outer_end is not None and (end is None or end > outer_end):
+        return False
+    return True
+
+
+def _overlaps(a_start, a_end, b_start, b_end) -> bool:
+    if a_end is not None and b_start is not None and a_end < b_start:
+        return False
+    if b_end is not None and a_start is not None and b_end < a_start:
+        return False
+    return True
+
+
+class PriceSliceCache:
+    """
+    Memory-bounded LRU of per-symbol price slices keyed by (symbol, start, end).
+
+    Symbols are matched case-insensitively, like the DB collation.
+    A lookup is served from an exact entry or by slicing any cached entry
+    whose range covers the requested one. Writes invalidate only the entries
+    of the written symbols whose range overlaps the written dates.
+
+    Every invalidation also bumps the symbol's generation. Readers take
+    generation() before reading the DB and pass it to put(), so a slice read
+    before a write that committed meanwhile is never cached. Writes made
+    elsewhere are caught by check_version() against the DB's data version.
+    """
+
+    def __init__(self, max_bytes: int = PRICE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, PriceArrays]" = OrderedDict()
+        self._by_symbol: Dict[str, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        # Bumped by clear(), which invalidates every symbol at once
+        self._epoch = 0
+        # Stored data generation per symbol as of the last check_version()
+        self._data_generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, symbol: str, start: Optional[date], end: Optional[date]) -> Optional[PriceArrays]:
+        if not self.enabled:
+            return None
+
+        symbol = symbol.upper()
+        key = (symbol, start, end)
+        arrays = self._entries.get(key)
+        if arrays is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return arrays
+
+        for other in self._by_symbol.get(symbol, ()):
+            if _covers(other[1], other[2], start, end):
+                self._entries.move_to_end(other)
+                self.hits += 1
+                return self._entries[other].slice(start, end)
+
+        self.misses += 1
+        return None
+
+    def generation(self, symbol: str) -> Tuple[int, int]:
+        """Token for put(): changes whenever cached slices of symbol are invalidated."""
+        return self._epoch, self._generations.get(symbol.upper(), 0)
+
+    def check_version(self, symbol: str, generation: int) -> None:
+        """
+        Drop every cached slice of symbol if its stored data generation (see
+        get_data_versions) moved since the last check: a write by another
+        worker or process that this one never invalidated for.
+        """
+        symbol = symbol.upper()
+        if self._data_generations.get(symbol, generation) != generation:
+            self.invalidate(symbol)
+        self._data_generations[symbol] = generation
+
+    def put(
+        self,
+        symbol: str,
+        start: Optional[date],
+        end: Optional[date],
+        arrays: PriceArrays,
+        generation: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """Cache a slice; skipped if generation no longer matches (a write landed since)."""
+        if not self.enabled or arrays.nbytes > self.max_bytes // 4:
+            # Never let one huge slice flush the whole cache
+            return
+        if generation is not None and generation != self.generation(symbol):
+            return
+
+        symbol = symbol.upper()
+        key = (symbol, start, end)
+        self._remove(key)
+        self._entries[key] = arrays
+        self._by_symbol.setdefault(symbol, set()).add(key)
+        self._bytes += arrays.nbytes
+
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> None:
+        """Drop cached slices of symbol that overlap [start, end]."""
+        symbol = symbol.upper()
+        # Reads in flight may cover the written dates whatever is cached now
+        self._generations[symbol] = self._generations.get(symbol, 0) + 1
+        for key in list(self._by_symbol.get(symbol, ())):
+            if _overlaps(key[1], key[2], start, end):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._generations.clear()
+        self._entries.clear()
+        self._by_symbol.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        arrays = self._entries.pop(key, None)
+        if arrays is None:
+            return
+        self._bytes -= arrays.nbytes
+        keys = self._by_symbol.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_symbol[key[0]]
+
+
+# Process-wide cache used by get_prices and invalidated by the insert path
+price_cache = PriceSliceCache()
@@ -0,0 +1,102 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.metrics import observe_query
+from app.db.crud.fanout import fetchall_chunked
+from app.db.crud.price_arrays import to_ordinal
+
+# Bit (day - 1) of a partition's day_mask is set when that calendar day has a row
+_DAY_BITS = np.arange(31, dtype=np.int64)
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def expand_day_masks(months: np.ndarray, masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unpack partition day masks into stored dates (vectorized).
+
+    months holds each partition's first-day ordinal, masks its day_mask.
+    Returns (partition index, date ordinal) arrays, one entry per stored
+    day, ordered by partition then day.
+    """
+    months = np.asarray(months, dtype=np.int64)
+    masks = np.asarray(masks, dtype=np.int64)
+    bits = (masks[:, None] >> _DAY_BITS) & 1
+    partition, day = np.nonzero(bits)
+    return partition, months[partition] + day
+
+
+async def refresh_price_partitions(cursor, changed: Dict[int, Tuple[date, date]]) -> None:
+    """
+    Rebuild dbo.price_partitions for the months each symbol_id's write
+    touched (inclusive (lo, hi) dates), bump their version and stamp
+    modified_at (read back by get_data_versions). Only those
+    months are aggregated, so the cost follows the write, not the history.
+    """
+    for symbol_id, (lo, hi) in changed.items():
+        with observe_query("price_partitions_refresh"):
+            await cursor.execute(
+                """
+                MERGE dbo.price_partitions AS t
+                USING (
+                    SELECT
+                        symbol_id,
+                        DATEFROMPARTS(YEAR([date]), MONTH([date]), 1) AS [month],
+                        CAST(SUM(POWER(CAST(2 AS BIGINT), DAY([date]) - 1)) AS INT) AS day_mask,
+                        COUNT(*) AS row_count
+                    FROM dbo.prices
+                    WHERE symbol_id = ? AND [date] >= ? AND [date] < ?
+                    GROUP BY symbol_id, DATEFROMPARTS(YEAR([date]), MONTH([date]), 1)
+                ) AS s
+                ON t.symbol_id = s.symbol_id AND t.[month] = s.[month]
+                WHEN MATCHED THEN
+                    UPDATE SET
+                        day_mask = s.day_mask,
+                        row_count = s.row_count,
+                        version = t.version + 1,
+                        modified_at = SYSUTCDATETIME()
+                WHEN NOT MATCHED THEN
+                    INSERT (symbol_id, [month], day_mask, row_count, version, modified_at)
+                    VALUES (s.symbol_id, s.[month], s.day_mask, s.row_count, 1, SYSUTCDATETIME());
+                """,
+                (symbol_id, month_start(lo), next_month(hi))
+            )
+
+
+async def get_price_partitions(
+    symbol_ids: List[int],
+    start: Optional[date],
+    end: Optional[date]
+) -> List[Tuple[int, int, int, int]]:
+    """
+    (symbol_id, month ordinal, day_mask, version) for every stored partition
+    of the given symbols overlapping [start, end] (None = unbounded),
+    ordered by (symbol_id, month).
+    """
+    def build(chunk: list):
+        clauses = [f"symbol_id IN ({','.join('?' for _ in chunk)})"]
+        params: list = list(chunk)
+        if start is not None:
+            clauses.append("[month] >= ?")
+            params.append(month_start(start))
+        if end is not None:
+            clauses.append("[month] <= ?")
+            params.append(end)
+        sql = f"""
+            SELECT symbol_id, [month], day_mask, version
+            FROM dbo.price_partitions
+            WHERE {' AND '.join(clauses)}
+            ORDER BY symbol_id, [month]
+        """
+        return sql, params
+
+    rows = await fetchall_chunked("price_partitions", sorted(set(symbol_ids)), build)
+    return [(int(r[0]), to_ordinal(r[1]), int(r[2]), int(r[3])) for r in rows]
@@ -0,0 +1,363 @@
+import re
+from collections import OrderedDict
+from datetime import date
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import RESAMPLE_CACHE_MAX_BYTES
+from app.core.dates import days_to_ordinals, ordinals_to_days, trading_day_at, trading_day_index
+from app.core.timing import timed
+from app.db.crud.data_versions import get_data_versions
+from app.db.crud.get_prices import get_prices_arrays
+from app.db.crud.price_arrays import PriceArrays
+from app.db.crud.symbols import in_symbol_id_order
+from app.schemas.prices.price_row import PriceDataRow
+
+# "1w" (Mon-Sun weeks), "1mo" (calendar months) or "<N>d" (N trading days)
+RESAMPLE_INTERVAL_PATTERN = r"^(1w|1mo|[1-9][0-9]*d)$"
+
+_N_DAYS = re.compile(r"^([1-9][0-9]*)d$")
+
+
+def _trading_days_per_bar(interval: str) -> Optional[int]:
+    match = _N_DAYS.match(interval)
+    return int(match.group(1)) if match else None
+
+
+def period_keys(days: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Map date ordinals to integer period keys (vectorized).
+    Keys are anchored at fixed origins, so the same date always lands in
+    the same period whatever range was queried.
+    """
+    days = np.asarray(days, dtype=np.int64)
+    if interval == "1w":
+        # Ordinal 1 (0001-01-01) is a Monday
+        return (days - 1) // 7
+    if interval == "1mo":
+        return ordinals_to_days(days).astype("datetime64[M]").astype(np.int64)
+    n = _trading_days_per_bar(interval)
+    if n is None:
+        raise ValueError(f"Unsupported resample interval: {interval}")
+    return trading_day_index(days) // n
+
+
+def period_bounds(keys: np.ndarray, interval: str) -> Tuple[np.ndarray, np.ndarray]:
+    """First and last calendar date ordinals (inclusive) of each period key."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if interval == "1w":
+        first = keys * 7 + 1
+        return first, first + 6
+    if interval == "1mo":
+        months = keys.astype("datetime64[M]")
+        first = days_to_ordinals(months.astype("datetime64[D]"))
+        return first, days_to_ordinals((months + 1).astype("datetime64[D]")) - 1
+    n = _trading_days_per_bar(interval)
+    if n is None:
+        raise ValueError(f"Unsupported resample interval: {interval}")
+    # A period ends the day before the next one's first trading day, so it owns any holidays in between
+    return trading_day_at(keys * n), trading_day_at((keys + 1) * n) - 1
+
+
+def resample_arrays(arrays: PriceArrays, interval: str) -> PriceArrays:
+    """
+    Aggregate daily bars into interval bars with one vectorized group-by:
+    first open, max high, min low, last close, summed volume.
+    Each bar is dated by its first trading day present in the data.
+    """
+    if len(arrays) == 0:
+        return arrays
+
+    keys = period_keys(arrays.days, interval)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    return PriceArrays(
+        symbol=arrays.symbol,
+        days=arrays.days[starts],
+        open=arrays.open[starts],
+        high=np.maximum.reduceat(arrays.high, starts),
+        low=np.minimum.reduceat(arrays.low, starts),
+        close=arrays.close[ends],
+        volume=np.add.reduceat(arrays.volume, starts),
+    )
+
+
+def _columns(arrays: PriceArrays) -> tuple:
+    return arrays.days, arrays.open, arrays.high, arrays.low, arrays.close, arrays.volume
+
+
+def _take(arrays: PriceArrays, lo: int, hi: int, symbol: Optional[str] = None) -> PriceArrays:
+    """Rows lo..hi-1 as views, optionally relabelled to symbol."""
+    return PriceArrays(symbol or arrays.symbol, *(a[lo:hi] for a in _columns(arrays)))
+
+
+def _concat(a: PriceArrays, b: PriceArrays) -> PriceArrays:
+    return PriceArrays(
+        a.symbol,
+        np.concatenate([a.days, b.days]),
+        np.concatenate([a.open, b.open]),
+        np.concatenate([a.high, b.high]),
+        np.concatenate([a.low, b.low]),
+        np.concatenate([a.close, b.close]),
+        np.concatenate([a.volume, b.volume]),
+    )
+
+
+class ResampledBarCache:
+    """
+    Memory-bounded LRU of completed resampled bars, one entry per (symbol, interval).
+
+    Each entry holds the bars of a contiguous run of completed period keys
+    [key_lo, key_hi] (periods without data simply have no bar). Completed
+    periods never change unless older rows are inserted, which the insert
+    path reports through invalidate(), or which check_version() notices when
+    another process wrote them. As in PriceSliceCache, put() takes the
+    generation() seen before the read and drops bars computed from data a
+    write has invalidated since.
+    """
+
+    def __init__(self, max_bytes: int = RESAMPLE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, int, PriceArrays]]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._data_generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, symbol: str, interval: str, key_lo: int, key_hi: int) -> Optional[PriceArrays]:
+        """Bars for periods key_lo..key_hi if every one of them is cached."""
+        if not self.enabled:
+            return None
+
+        entry_key = (symbol.upper(), interval)
+        entry = self._entries.get(entry_key)
+        if entry is None or key_lo < entry[0] or key_hi > entry[1]:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        bars = entry[2]
+        keys = period_keys(bars.days, interval)
+        lo = int(np.searchsorted(keys, key_lo, side="left"))
+        hi = int(np.searchsorted(keys, key_hi, side="right"))
+        return _take(bars, lo, hi)
+
+    def generation(self, symbol: str) -> Tuple[int, int]:
+        """Token for put(): changes whenever cached bars of symbol are invalidated."""
+        return self._epoch, self._generations.get(symbol.upper(), 0)
+
+    def check_version(self, symbol: str, generation: int) -> None:
+        """Drop the symbol's bars if its stored data generation moved (see PriceSliceCache)."""
+        symbol = symbol.upper()
+        if self._data_generations.get(symbol, generation) != generation:
+            self.invalidate(symbol)
+        self._data_generations[symbol] = generation
+
+    def put(
+        self,
+        symbol: str,
+        interval: str,
+        key_lo: int,
+        key_hi: int,
+        bars: PriceArrays,
+        generation: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """Store completed bars for periods key_lo..key_hi, merging with an adjacent cached run."""
+        if not self.enabled or key_hi < key_lo or bars.nbytes > self.max_bytes // 4:
+            return
+        if generation is not None and generation != self.generation(symbol):
+            return
+
+        entry_key = (symbol.upper(), interval)
+        current = self._entries.get(entry_key)
+        if current is not None and current[0] <= key_hi + 1 and key_lo <= current[1] + 1:
+            old_lo, old_hi, old_bars = current
+            old_keys = period_keys(old_bars.days, interval)
+            # Keep cached bars outside the new run, take the new run as authoritative
+            lo = int(np.searchsorted(old_keys, key_lo, side="left"))
+            hi = int(np.searchsorted(old_keys, key_hi, side="right"))
+            bars = _concat(_concat(_take(old_bars, 0, lo), bars), _take(old_bars, hi, len(old_bars)))
+            key_lo, key_hi = min(key_lo, old_lo), max(key_hi, old_hi)
+
+        self._remove(entry_key)
+        self._entries[entry_key] = (key_lo, key_hi, bars)
+        self._bytes += bars.nbytes
+
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> None:
+        """Drop cached bars of symbol whose periods may include dates in [start, end]."""
+        symbol = symbol.upper()
+        self._generations[symbol] = self._generations.get(symbol, 0) + 1
+        for entry_key in [k for k in self._entries if k[0] == symbol]:
+            key_lo, key_hi, _ = self._entries[entry_key]
+            interval = entry_key[1]
+            first, _ = period_bounds(np.array([key_lo]), interval)
+            _, last = period_bounds(np.array([key_hi]), interval)
+            if (start is None or start.toordinal() <= last[0]) and (end is None or end.toordinal() >= first[0]):
+                self._remove(entry_key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._generations.clear()
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, entry_key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._bytes -= entry[2].nbytes
+
+
+# Process-wide cache of completed bars, invalidated by the insert path
+resample_cache = ResampledBarCache()
+
+
+async def get_resampled_arrays(
+    symbols: List[str],
+    start: Optional[date],
+    end: Optional[date],
+    interval: str,
+    today: Optional[date] = None
+) -> Dict[str, PriceArrays]:
+    """
+    Resampled bars per symbol for the periods touching [start, end].
+
+    The range is widened to whole periods, so edge bars are never partial.
+    Completed periods (ending before today) come from resample_cache when
+    all of them are cached and the symbol's stored data version is
+    unchanged; then only the still-open periods are read as daily rows.
+    Without a start every daily row is read.
+    """
+    today = today or date.today()
+    end = min(end or today, today)
+    if start is not None and start > end:
+        return {symbol: PriceArrays.empty(symbol) for symbol in set(symbols)}
+
+    if start is None:
+        daily = await get_prices_arrays(symbols, None, end)
+        return {symbol: resample_arrays(arrays, interval) for symbol, arrays in daily.items()}
+
+    key_lo, key_hi = (int(k) for k in period_keys(np.array([start.toordinal(), end.toordinal()]), interval))
+    keys = np.arange(key_lo, key_hi + 1)
+    firsts, lasts = period_bounds(keys, interval)
+    completed = lasts < today.toordinal()
+    last_completed = int(keys[completed][-1]) if completed.any() else None
+    first_open = int(keys[~completed][0]) if not completed.all() else None
+
+    range_start = date.fromordinal(int(firsts[0]))
+    range_end = date.fromordinal(int(lasts[-1]))
+    open_start = date.fromordinal(int(firsts[~completed][0])) if first_open is not None else None
+
+    cached: Dict[str, PriceArrays] = {}
+    if last_completed is not None and resample_cache.enabled:
+        versions = await get_data_versions(sorted(set(symbols)))
+        for symbol in sorted(set(symbols)):
+            resample_cache.check_version(symbol, versions[symbol].generation)
+            bars = resample_cache.get(symbol, interval, key_lo, last_completed)
+            if bars is not None:
+                cached[symbol] = bars
+
+    misses = [s for s in sorted(set(symbols)) if s not in cached]
+    result: Dict[str, PriceArrays] = {}
+
+    if misses:
+        generations = {symbol: resample_cache.generation(symbol) for symbol in misses}
+        daily = await get_prices_arrays(misses, range_start, range_end)
+        for symbol, arrays in daily.items():
+            bars = resample_arrays(arrays, interval)
+            if last_completed is not None:
+                done = bars.slice(None, date.fromordinal(int(lasts[completed][-1])))
+                resample_cache.put(symbol, interval, key_lo, last_completed, done, generations[symbol])
+            result[symbol] = bars
+
+    if cached:
+        if open_start is not None:
+            daily = await get_prices_arrays(list(cached), open_start, range_end)
+        else:
+            daily = {}
+        for symbol, bars in cached.items():
+            bars = _take(bars, 0, len(bars), symbol)
+            if symbol in daily:
+                bars = _concat(bars, resample_arrays(daily[symbol], interval))
+            result[symbol] = bars
+
+    return result
+
+
+async def get_resampled_prices(
+    symbols: List[str],
+    start: Optional[date],
+    end: Optional[date],
+    interval: str
+) -> AsyncGenerator[PriceDataRow, None]:
+    """
+    Resampled OHLCV bars as PriceDataRow, grouped by symbol in symbol_id
+    order (like get_prices) and ordered by date.
+    """
+    if not symbols:
+        return
+
+    arrays = await get_resampled_arrays(symbols, start, end, interval)
+    for symbol in await in_symbol_id_order(arrays):
+        with timed("validate"):
+            rows = list(arrays[symbol].to_rows())
+        for row in rows:
+            yield row
+
+
+async def iter_resampled_batches(
+    symbols: List[str],
+    start: Optional[date],
+    end: Optional[date],
+    interval: str
+) -> AsyncGenerator[List[tuple], None]:
+    """
+    Resampled bars as raw (symbol, date, open, high, low, close, volume)
+    batches (one per symbol, in symbol_id order), for the NDJSON and
+    columnar adapters.
+    """
+    if not symbols:
+        return
+
+    arrays = await get_resampled_arrays(symbols, start, end, interval)
+    for symbol in await in_symbol_id_order(arrays):
+        bars = arrays[symbol]
+        if len(bars) == 0:
+            continue
+        yield list(zip(
+            [symbol] * len(bars),
+            [date.fromordinal(d) for d in bars.days.tolist()],
+            bars.open.tolist(),
+            bars.high.tolist(),
+            bars.low.tolist(),
+            bars.close.tolist(),
+            bars.volume.tolist(),
+        ))
@@ -0,0 +1,186 @@
+from datetime import date
+from typing import AsyncGenerator, Dict, Optional
+
+import numpy as np
+
+from app.core.metrics import observe_query
+from app.core.timing import timed
+from app.db.crud.fanout import stream_chunked
+from app.db.crud.get_prices import PRICE_FETCH_BATCH_SIZE, _lookback_start
+from app.db.crud.symbols import resolve_symbol_ids
+from app.schemas.prices.price_returns import PriceReturnRow
+
+# Trailing windows (in rows) of the stored log-return volatilities
+VOL_WINDOWS = (20, 60)
+
+# Closes before the first changed row needed to refill every window
+_CONTEXT_ROWS = max(VOL_WINDOWS)
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing sample standard deviation (ddof=1) over `window` rows.
+    NaN until the window is full or while it contains a NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    out[window - 1:] = windows.std(axis=1, ddof=1)
+    return out
+
+
+def compute_returns(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Daily simple and log returns plus rolling log-return volatilities
+    for one symbol's closes, in date order. The first row has no return.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    simple = np.full(len(closes), np.nan)
+    log = np.full(len(closes), np.nan)
+
+    if len(closes) > 1:
+        prev, cur = closes[:-1], closes[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(prev != 0, cur / prev, np.nan)
+            simple[1:] = ratio - 1
+            log[1:] = np.where(ratio > 0, np.log(ratio), np.nan)
+
+    result = {"simple_return": simple, "log_return": log}
+    for window in VOL_WINDOWS:
+        result[f"vol_{window}"] = _rolling_std(log, window)
+    return result
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+async def refresh_price_returns(cursor, changed: Dict[int, Optional[date]]) -> int:
+    """
+    Recompute dbo.price_returns for each symbol_id from its first changed
+    date onwards (None = whole history). Only that tail plus the
+    _CONTEXT_ROWS closes before it are read; earlier returns are untouched.
+
+    Returns the number of return rows written.
+    """
+    written = 0
+    for symbol_id, since in changed.items():
+        with observe_query("returns_context"):
+            if since is None:
+                await cursor.execute(
+                    "SELECT [date], [close] FROM dbo.prices WHERE symbol_id = ? ORDER BY [date]",
+                    (symbol_id,)
+                )
+            else:
+                await cursor.execute(
+                    f"""
+                    SELECT [date], [close]
+                    FROM dbo.prices
+                    WHERE symbol_id = ?
+                      AND [date] >= COALESCE((
+                          SELECT MIN(c.[date]) FROM (
+                              SELECT TOP ({_CONTEXT_ROWS}) [date]
+                              FROM dbo.prices
+                              WHERE symbol_id = ? AND [date] < ?
+                              ORDER BY [date] DESC
+                          ) c
+                      ), ?)
+                    ORDER BY [date]
+                    """,
+                    (symbol_id, symbol_id, since, since)
+                )
+            rows = await cursor.fetchall()
+        if not rows:
+            continue
+
+        dates = [r[0] for r in rows]
+        returns = compute_returns(np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows)))
+
+        # Context rows were only read to fill the windows; write from `since` on
+        first = 0
+        if since is not None:
+            first = next((i for i, d in enumerate(dates) if str(d)[:10] >= since.isoformat()), len(dates))
+
+        values = [
+            (
+                symbol_id,
+                dates[i],
+                _nullable(returns["simple_return"][i]),
+                _nullable(returns["log_return"][i]),
+                _nullable(returns["vol_20"][i]),
+                _nullable(returns["vol_60"][i]),
+            )
+            for i in range(first, len(dates))
+        ]
+        if not values:
+            continue
+
+        with observe_query("returns_write"):
+            await cursor.execute(
+                "DELETE FROM dbo.price_returns WHERE symbol_id = ? AND [date] >= ?",
+                (symbol_id, dates[first])
+            )
+            await cursor.executemany(
+                """
+                INSERT INTO dbo.price_returns (
+                    symbol_id, [date], simple_return, log_return, vol_20, vol_60
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                values
+            )
+        written += len(values)
+
+    return written
+
+
+async def get_returns(
+    symbols: list,
+    start: date,
+    end: date,
+    lookback: int = 0
+) -> AsyncGenerator[PriceReturnRow, None]:
+    """
+    Fetch stored daily returns and volatilities for the given symbols and
+    date range, with the same filters and ordering as get_prices.
+    """
+    symbol_ids = sorted(set((await resolve_symbol_ids(symbols)).values())) if symbols else []
+    if not symbol_ids:
+        return
+
+    start = _lookback_start(start, lookback) if start is not None else None
+
+    def build(chunk: list):
+        clauses = [f"r.symbol_id IN ({','.join('?' for _ in chunk)})"]
+        params: list = list(chunk)
+        if start is not None:
+            clauses.append("r.[date] >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("r.[date] <= ?")
+            params.append(end)
+
+        sql = f"""
+            SELECT s.symbol, r.[date], r.simple_return, r.log_return, r.vol_20, r.vol_60
+            FROM dbo.price_returns r
+            JOIN dbo.symbols s ON s.symbol_id = r.symbol_id
+            WHERE {' AND '.join(clauses)}
+            ORDER BY r.symbol_id, r.[date] ASC
+        """
+        return sql, params
+
+    async for batch in stream_chunked("price_returns", symbol_ids, build, batch_size=PRICE_FETCH_BATCH_SIZE):
+        with timed("validate"):
+            rows = [
+                PriceReturnRow(
+                    symbol=row[0],
+                    date=row[1],
+                    simple_return=row[2],
+                    log_return=row[3],
+                    vol_20=row[4],
+                    vol_60=row[5],
+                )
+                for row in batch
+            ]
+        for row in rows:
+            yield row
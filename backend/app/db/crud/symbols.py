@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List
+from app.core.metrics import observe_query
+from app.db.connection import get_connection, release_connection
+from app.db.crud.fanout import in_chunks
+
+# In-process symbol <-> symbol_id mapping for dbo.symbols.
+# Keys are upper-cased to match the case-insensitive DB collation.
+_ids: Dict[str, int] = {}
+_symbols: Dict[int, str] = {}
+
+
+def _remember(symbol_id: int, symbol: str) -> None:
+    _ids[symbol.upper()] = symbol_id
+    _symbols[symbol_id] = symbol
+
+
+async def _load_symbol_ids(cursor, symbols: List[str]) -> None:
+    for chunk in in_chunks(symbols):
+        sql = f"""
+            SELECT symbol_id, symbol
+            FROM dbo.symbols
+            WHERE symbol IN ({','.join('?' for _ in chunk)})
+        """
+        with observe_query("symbols_lookup"):
+            await cursor.execute(sql, chunk)
+            rows = await cursor.fetchall()
+        for row in rows:
+            _remember(int(row[0]), row[1])
+
+
+async def resolve_symbol_ids(symbols: Iterable[str], create: bool = False) -> Dict[str, int]:
+    """
+    Map ticker strings to symbol_ids, serving known symbols from memory.
+
+    Unknown symbols are looked up in IN-list chunks. With create=True, symbols
+    still missing are inserted into dbo.symbols first (used by the write path);
+    otherwise they are simply absent from the result.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    missing = [s for s in symbols if s.upper() not in _ids]
+
+    if missing:
+        conn = await get_connection()
+        try:
+            async with conn.cursor() as cursor:
+                await _load_symbol_ids(cursor, missing)
+
+                missing = [s for s in missing if s.upper() not in _ids]
+                if missing and create:
+                    # A VALUES constructor takes at most 1000 rows
+                    for chunk in in_chunks(missing):
+                        sql = f"""
+                            INSERT INTO dbo.symbols (symbol)
+                            SELECT v.symbol
+                            FROM (VALUES {','.join('(?)' for _ in chunk)}) AS v(symbol)
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM dbo.symbols s WHERE s.symbol = v.symbol
+                            )
+                        """
+                        with observe_query("symbols_insert"):
+                            await cursor.execute(sql, chunk)
+                    await _load_symbol_ids(cursor, missing)
+        finally:
+            await release_connection(conn)
+
+    return {s: _ids[s.upper()] for s in symbols if s.upper() in _ids}
+
+
+async def in_symbol_id_order(symbols: Iterable[str]) -> List[str]:
+    """
+    Distinct symbols sorted by symbol_id, the clustered-key order the SQL
+    readers return rows in, so results served from arrays list symbols in
+    the same order. Unknown symbols have no rows and are left out.
+    """
+    ids = await resolve_symbol_ids(symbols)
+    return sorted(ids, key=ids.__getitem__)
+
+
+def symbol_for_id(symbol_id: int) -> str:
+    """Reverse lookup for ids previously returned by resolve_symbol_ids."""
+    return _symbols[symbol_id]
+
+
+def clear_symbol_cache() -> None:
+    _ids.clear()
+    _symbols.clear()
@@ -0,0 +1,167 @@
+from collections import defaultdict
+from contextlib import suppress
+from datetime import date
+from typing import Dict, Iterable, Tuple
+from app.schemas.prices.price_row import PriceDataRow
+from app.core.metrics import PRICE_ROWS_WRITTEN, observe_query
+from app.db.connection import get_connection, release_connection
+from app.db.crud.insert_prices import chunked
+from app.db.crud.price_cache import price_cache
+from app.db.crud.price_partitions import refresh_price_partitions
+from app.db.crud.price_resample import resample_cache
+from app.db.crud.price_returns import refresh_price_returns
+from app.db.crud.symbols import resolve_symbol_ids
+
+# Digits prices are compared at; provider float noise below this is not a revision
+REVISION_PRECISION = 6
+
+# Column-by-column comparison of a stored row p with its incoming row i.
+# A checksum would cost the same per row but can collide and miss revisions.
+_ROW_DIFFERS = " OR ".join(
+    [
+        f"ROUND(p.[{c}], {REVISION_PRECISION}) <> ROUND(i.[{c}], {REVISION_PRECISION})"
+        for c in ("open", "high", "low", "close")
+    ]
+    + ["p.[volume] <> i.[volume]"]
+)
+
+# Temp tables live as long as the pooled session, so a leftover from a
+# failed upsert is dropped before the next one creates its own
+_DROP_INCOMING = "IF OBJECT_ID('tempdb..#incoming') IS NOT NULL DROP TABLE #incoming"
+
+
+def _track(keys, symbol_by_id: Dict[int, str], counts: Dict[str, int], ranges: Dict[str, Tuple[date, date]]) -> None:
+    """Tally OUTPUT (symbol_id, date) keys per symbol and widen each symbol's changed range."""
+    for symbol_id, d in keys:
+        d = d if isinstance(d, date) else date.fromisoformat(str(d)[:10])
+        symbol = symbol_by_id[symbol_id]
+        counts[symbol] += 1
+        lo, hi = ranges.get(symbol, (d, d))
+        ranges[symbol] = (min(lo, d), max(hi, d))
+
+
+async def upsert_prices_chunked(
+    rows: Iterable[PriceDataRow],
+    chunk_size: int = 1000
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Insert new PriceDataRow objects and revise stored bars that changed.
+
+    Rows are staged in a #incoming temp table, then one set-based UPDATE
+    compares each OHLCV column (prices rounded to REVISION_PRECISION digits)
+    against the stored row in dbo.prices and rewrites only the rows that
+    differ; a second statement inserts the keys not stored yet.
+
+    Returns (inserted_by_symbol, revised_by_symbol).
+    """
+    # Last row wins for duplicate (symbol, date) keys in the input
+    latest = {}
+    for r in rows:
+        latest[(r.symbol.upper(), r.date.date())] = r
+    rows = list(latest.values())
+
+    inserted_by_symbol: Dict[str, int] = defaultdict(int)
+    revised_by_symbol: Dict[str, int] = defaultdict(int)
+    if not rows:
+        return inserted_by_symbol, revised_by_symbol
+
+    changed_ranges: Dict[str, Tuple[date, date]] = {}
+    symbol_ids = await resolve_symbol_ids((r.symbol for r in rows), create=True)
+    symbol_by_id = {symbol_id: symbol for symbol, symbol_id in symbol_ids.items()}
+
+    conn = await get_connection()
+    try:
+        async with conn.cursor() as cursor:
+            cursor.fast_executemany = True
+
+            # 1️⃣ Stage the incoming rows
+            await cursor.execute(_DROP_INCOMING)
+            await cursor.execute(
+                """
+                CREATE TABLE #incoming (
+                    symbol_id INT NOT NULL,
+                    [date] DATE NOT NULL,
+                    [open] FLOAT NOT NULL,
+                    [high] FLOAT NOT NULL,
+                    [low] FLOAT NOT NULL,
+                    [close] FLOAT NOT NULL,
+                    [volume] BIGINT NOT NULL,
+                    PRIMARY KEY (symbol_id, [date])
+                )
+                """
+            )
+            try:
+                for batch in chunked(rows, chunk_size):
+                    with observe_query("upsert_stage"):
+                        await cursor.executemany(
+                            """
+                            INSERT INTO #incoming (symbol_id, [date], [open], [high], [low], [close], [volume])
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            """,
+                            [
+                                (symbol_ids[r.symbol], r.date.date(), r.open, r.high, r.low, r.close, r.volume)
+                                for r in batch
+                            ]
+                        )
+
+                # 2️⃣ Revise stored rows that differ
+                with observe_query("upsert_revise"):
+                    await cursor.execute(
+                        f"""
+                        UPDATE p
+                        SET p.[open] = i.[open],
+                            p.[high] = i.[high],
+                            p.[low] = i.[low],
+                            p.[close] = i.[close],
+                            p.[volume] = i.[volume]
+                        OUTPUT inserted.symbol_id, inserted.[date]
+                        FROM dbo.prices p
+                        JOIN #incoming i ON i.symbol_id = p.symbol_id AND i.[date] = p.[date]
+                        WHERE {_ROW_DIFFERS}
+                        """
+                    )
+                    _track(await cursor.fetchall(), symbol_by_id, revised_by_symbol, changed_ranges)
+
+                # 3️⃣ Insert keys not stored yet
+                with observe_query("upsert_insert"):
+                    await cursor.execute(
+                        """
+                        INSERT INTO dbo.prices (symbol_id, [date], [open], [high], [low], [close], [volume])
+                        OUTPUT inserted.symbol_id, inserted.[date]
+                        SELECT i.symbol_id, i.[date], i.[open], i.[high], i.[low], i.[close], i.[volume]
+                        FROM #incoming i
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM dbo.prices p
+                            WHERE p.symbol_id = i.symbol_id AND p.[date] = i.[date]
+                        )
+                        """
+                    )
+                    _track(await cursor.fetchall(), symbol_by_id, inserted_by_symbol, changed_ranges)
+
+                # 4️⃣ Recompute derived returns from each symbol's earliest changed row
+                await refresh_price_returns(
+                    cursor,
+                    {symbol_ids[symbol]: lo for symbol, (lo, _) in changed_ranges.items()}
+                )
+
+                # 5️⃣ Re-index the (symbol, month) partitions that changed
+                await refresh_price_partitions(
+                    cursor,
+                    {symbol_ids[symbol]: bounds for symbol, bounds in changed_ranges.items()}
+                )
+            except Exception:
+                # The original error matters more than a failed cleanup
+                with suppress(Exception):
+                    await cursor.execute(_DROP_INCOMING)
+                raise
+            await cursor.execute(_DROP_INCOMING)
+
+    finally:
+        PRICE_ROWS_WRITTEN.labels("inserted").inc(sum(inserted_by_symbol.values()))
+        PRICE_ROWS_WRITTEN.labels("revised").inc(sum(revised_by_symbol.values()))
+        for symbol, (lo, hi) in changed_ranges.items():
+            price_cache.invalidate(symbol, lo, hi)
+            resample_cache.invalidate(symbol, lo, hi)
+        await release_connection(conn)
+
+    return inserted_by_symbol, revised_by_symbol
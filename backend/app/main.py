@@ -2,21 +2,28 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.async_pool import init_db_pool, close_db_pool
-from app.api import prices_router, validation_router
+from app.api import prices_router, validation_router, metrics_router, backtest_router
+from app.core.logging import CorrelationIdMiddleware, configure_logging, shutdown_logging
+from app.core.metrics import RequestMetricsMiddleware
+from app.core.timing import ServerTimingMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    configure_logging()
     await init_db_pool()
     yield
     # Shutdown
     await close_db_pool()
+    shutdown_logging()
 
 app = FastAPI(title="QuantApp", lifespan=lifespan)
 
 # Include routers
 app.include_router(prices_router)
 app.include_router(validation_router)
+app.include_router(metrics_router)
+app.include_router(backtest_router)
 
 
 origins = [
@@ -33,6 +40,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request phase breakdown (pool, sql, validate, serialize, render) for sampled requests
+app.add_middleware(ServerTimingMiddleware)
+
+# Outermost, so latency includes CORS handling
+app.add_middleware(RequestMetricsMiddleware)
+
+# Binds X-Request-ID to every log record of the request, including background tasks
+app.add_middleware(CorrelationIdMiddleware)
+
 @app.get("/")
 async def root():
     return {"status": "ok"}
\ No newline at end of file
@@ -1 +1,2 @@
-from .prices import *
\ No newline at end of file
+from .prices import *
+from .backtest import *
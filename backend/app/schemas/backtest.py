@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Dict, List, Literal
+from pydantic import BaseModel, Field, field_validator
+
+
+class BacktestRequest(BaseModel):
+    """
+    Payload for a vectorized backtest of a built-in signal over stored prices.
+    """
+
+    symbols: List[str] = Field(..., min_length=1, description="Universe of ticker symbols")
+    start: date = Field(..., description="First trading day of the backtest (inclusive)")
+    end: date = Field(..., description="Last trading day of the backtest (inclusive)")
+    strategy: Literal["equal_weight", "momentum", "ma_crossover"] = Field(default="equal_weight", description="Signal from app.strategies.classical")
+    cost_bps: float = Field(default=5.0, ge=0.0, description="Trading cost per unit of turnover, in basis points")
+    long_only: bool = Field(default=False, description="If True, negative signals are flattened instead of shorted")
+    initial_capital: float = Field(default=1.0, gt=0.0, description="Starting equity")
+    lookback: int = Field(default=252, ge=2, description="Momentum look-back in trading days")
+    skip: int = Field(default=21, ge=0, description="Most recent trading days excluded from momentum")
+    fast: int = Field(default=50, ge=1, description="Fast moving-average window")
+    slow: int = Field(default=200, ge=2, description="Slow moving-average window")
+
+    @field_validator("symbols")
+    def normalize_symbols(cls, v: List[str]) -> List[str]:
+        # Each symbol is one panel column; a repeated ticker would get double weight
+        normalized = list(dict.fromkeys(s.strip().upper() for s in v if s.strip()))
+        if not normalized:
+            raise ValueError("symbols list cannot be empty after normalization")
+        return normalized
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbols": ["AAPL", "MSFT", "GOOG"],
+                "start": "2015-01-01",
+                "end": "2024-12-31",
+                "strategy": "momentum",
+                "cost_bps": 5.0,
+                "long_only": True
+            }
+        }
+    }
+
+
+class BacktestResponse(BaseModel):
+    """
+    Summary statistics and per-day curves of a backtest.
+    """
+
+    start: date
+    end: date
+    strategy: str
+    symbols: List[str]
+    stats: Dict[str, float]
+    dates: List[date]
+    equity: List[float]
+    returns: List[float]
+    turnover: List[float]
+    costs: List[float]
+    elapsed_ms: int
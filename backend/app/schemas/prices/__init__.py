@@ -1,3 +1,7 @@
 from .get_prices import *
 from .ingest_prices import *
-from .price_row import *
\ No newline at end of file
+from .price_row import *
+from .price_columns import *
+from .export_prices import *
+from .price_page import *
+from .price_returns import *
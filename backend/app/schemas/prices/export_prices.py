@@ -0,0 +1,48 @@
+from datetime import date
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+
+
+class ExportPricesRequest(BaseModel):
+    """
+    Payload for bulk-exporting stored OHLCV data as Arrow IPC or Parquet.
+    """
+    symbols: List[str] = Field(..., min_length=1, description="List of ticker symbols to export")
+    start: Optional[date] = Field(default=None, description="Optional start date (inclusive)")
+    end: Optional[date] = Field(default=None, description="Optional end date (inclusive)")
+    format: Literal["arrow", "parquet"] = Field(
+        default="arrow",
+        description="'arrow' for an Arrow IPC stream, 'parquet' for a Parquet file"
+    )
+    batch_rows: int = Field(
+        default=50_000,
+        ge=1_000,
+        le=1_000_000,
+        description="Rows per record batch / Parquet row group"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbols": ["AAPL", "MSFT"],
+                "start": "2015-01-01",
+                "end": "2024-12-31",
+                "format": "parquet",
+                "batch_rows": 50000
+            }
+        }
+    }
+
+    @field_validator("symbols")
+    def normalize_symbols(cls, v: List[str]) -> List[str]:
+        normalized = [s.strip().upper() for s in v if s.strip()]
+        if not normalized:
+            raise ValueError("symbols list cannot be empty after normalization")
+        return normalized
+
+    @field_validator("end")
+    def validate_date_range(cls, v: Optional[date], info) -> Optional[date]:
+        start = info.data.get("start")
+        if start and v and v < start:
+            raise ValueError("end date must be >= start date")
+        return v
@@ -1,5 +1,5 @@
 from datetime import date
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Literal, Optional
 
 class FetchPricesRequest(BaseModel):
@@ -58,13 +58,38 @@ class GetPricesPayload(BaseModel):
         default=None,
         description="Optional end date (inclusive)"
     )
+    interval: str = Field(
+        default="1d",
+        pattern=r"^(1d|1w|1mo|[1-9][0-9]*d)$",
+        description="Bar size: '1d' (stored rows), '1w', '1mo' or '<N>d' (N trading days)"
+    )
+    format: Literal["rows", "columnar"] = Field(
+        default="rows",
+        description="'rows' for a list of bars, 'columnar' for per-symbol parallel arrays"
+    )
+    float32: bool = Field(
+        default=False,
+        description="Round prices to float32 precision (columnar format only)"
+    )
+    page_size: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=50_000,
+        description="If set, return one page of rows plus a continuation cursor"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque continuation token from a previous page's next_cursor"
+    )
 
     model_config = {
         "json_schema_extra": {
             "example": {
                 "symbols": ["AAPL", "MSFT"],
                 "start": "2023-01-01",
-                "end": "2023-12-31"
+                "end": "2023-12-31",
+                "format": "rows",
+                "float32": False
             }
         }
     }
@@ -82,3 +107,9 @@ class GetPricesPayload(BaseModel):
         if start and v and v < start:
             raise ValueError("end date must be >= start date")
         return v
+
+    @model_validator(mode="after")
+    def validate_paging_interval(self) -> "GetPricesPayload":
+        if self.page_size is not None and self.interval != "1d":
+            raise ValueError("page_size is only supported for interval '1d'")
+        return self
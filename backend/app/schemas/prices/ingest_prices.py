@@ -1,8 +1,14 @@
 from datetime import date
-from typing import List, Optional
+from enum import Enum
+from typing import List, Optional, Tuple
 from pydantic import BaseModel, Field
 
-from app.data_ingestion.models import RetryReason
+
+class RetryReason(str, Enum):
+    NONE = "none"
+    EMPTY = "empty_data"
+    PARTIAL = "partial_coverage"
+    EXCEPTION = "fetch_exception"
 
 
 class IngestPricesRequest(BaseModel):
@@ -18,6 +24,8 @@ class IngestPricesRequest(BaseModel):
     max_concurrent: int = Field(default=5, ge=1, description="Maximum number of symbols to fetch concurrently")
     coverage_threshold: float = Field(default=0.95, ge=0.0, le=1.0, description="Minimum coverage required to consider a fetch successful")
     dry_run: bool = Field(default=False, description="If True, fetch but do not insert into the database")
+    revise: bool = Field(default=False, description="If True, re-fetch the whole window and update stored bars that changed")
+    compact_dates: bool = Field(default=False, description="If True, report missing dates as (first, last) trading-day runs in missing_ranges instead of one entry per date")
 
     model_config = {
         "json_schema_extra": {
@@ -29,7 +37,9 @@ class IngestPricesRequest(BaseModel):
                 "max_attempts": 3,
                 "max_concurrent": 5,
                 "coverage_threshold": 0.95,
-                "dry_run": False
+                "dry_run": False,
+                "revise": False,
+                "compact_dates": False
             }
         }
     }
@@ -46,8 +56,10 @@ class IngestSymbolResult(BaseModel):
     retry_reason: RetryReason
     coverage: Optional[float] = None
     missing_dates: List[date] = Field(default_factory=list)
+    missing_ranges: Optional[List[Tuple[date, date]]] = None
     rows_fetched: int
     rows_inserted: int
+    rows_revised: int = 0
     elapsed_ms: int
     error: Optional[str] = None
 
@@ -62,6 +74,7 @@ class IngestSymbolResult(BaseModel):
                 "missing_dates": [],
                 "rows_fetched": 252,
                 "rows_inserted": 252,
+                "rows_revised": 0,
                 "elapsed_ms": 1345,
                 "error": None
             }
@@ -103,6 +116,7 @@ class IngestPricesResponse(BaseModel):
                         "missing_dates": [],
                         "rows_fetched": 252,
                         "rows_inserted": 252,
+                        "rows_revised": 0,
                         "elapsed_ms": 1345,
                         "error": None
                     },
@@ -115,6 +129,7 @@ class IngestPricesResponse(BaseModel):
                         "missing_dates": [],
                         "rows_fetched": 252,
                         "rows_inserted": 252,
+                        "rows_revised": 0,
                         "elapsed_ms": 1102,
                         "error": None
                     }
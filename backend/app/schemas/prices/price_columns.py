@@ -0,0 +1,45 @@
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class ColumnarPriceSeries(BaseModel):
+    """
+    OHLCV bars for one symbol as parallel arrays (index i is one bar).
+    """
+    symbol: str = Field(..., max_length=32, description="Ticker symbol")
+    dates: List[date] = Field(default_factory=list, description="Bar dates, ascending")
+    open: List[float] = Field(default_factory=list)
+    high: List[float] = Field(default_factory=list)
+    low: List[float] = Field(default_factory=list)
+    close: List[float] = Field(default_factory=list)
+    volume: List[float] = Field(default_factory=list)
+
+
+class ColumnarPricesResponse(BaseModel):
+    """
+    Columnar response shape for /market-data/ohlcv/query (format="columnar").
+    """
+    format: str = "columnar"
+    float32: bool = False
+    series: List[ColumnarPriceSeries]
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "format": "columnar",
+                "float32": False,
+                "series": [
+                    {
+                        "symbol": "AAPL",
+                        "dates": ["2023-01-03", "2023-01-04"],
+                        "open": [130.28, 126.89],
+                        "high": [130.9, 128.66],
+                        "low": [124.17, 125.08],
+                        "close": [125.07, 126.36],
+                        "volume": [112117500, 89113600]
+                    }
+                ]
+            }
+        }
+    }
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from .price_row import PriceDataRow
+
+
+class PricesPage(BaseModel):
+    """
+    One keyset page of /market-data/ohlcv/query results, grouped by symbol
+    (in symbol_id order, like every other format) and ordered by date.
+    """
+    rows: List[PriceDataRow]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass back as 'cursor' to fetch the next page; null on the last page"
+    )
@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+
+class PriceReturnRow(BaseModel):
+    """
+    One row of the derived dbo.price_returns table.
+    Volatilities are the sample std of daily log returns, not annualized.
+    """
+    symbol: str = Field(..., max_length=32, description="Ticker symbol")
+    date: datetime = Field(..., description="Trading day")
+    simple_return: Optional[float] = Field(None, description="close / previous close - 1")
+    log_return: Optional[float] = Field(None, description="ln(close / previous close)")
+    vol_20: Optional[float] = Field(None, description="Std of log returns over the last 20 rows")
+    vol_60: Optional[float] = Field(None, description="Std of log returns over the last 60 rows")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbol": "AAPL",
+                "date": "2023-03-31T00:00:00Z",
+                "simple_return": 0.0156,
+                "log_return": 0.0155,
+                "vol_20": 0.0142,
+                "vol_60": 0.0171
+            }
+        }
+    }
+
+
+class GetReturnsPayload(BaseModel):
+    """
+    Payload for querying stored daily returns; same filters as GetPricesPayload.
+    """
+    symbols: List[str] = Field(..., min_length=1, description="List of ticker symbols to query")
+    start: Optional[date] = Field(default=None, description="Optional start date (inclusive)")
+    end: Optional[date] = Field(default=None, description="Optional end date (inclusive)")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "symbols": ["AAPL", "MSFT"],
+                "start": "2023-01-01",
+                "end": "2023-12-31"
+            }
+        }
+    }
+
+    @field_validator("symbols")
+    def normalize_symbols(cls, v: List[str]) -> List[str]:
+        normalized = [s.strip().upper() for s in v if s.strip()]
+        if not normalized:
+            raise ValueError("symbols list cannot be empty after normalization")
+        return normalized
+
+    @field_validator("end")
+    def validate_date_range(cls, v: Optional[date], info) -> Optional[date]:
+        start = info.data.get("start")
+        if start and v and v < start:
+            raise ValueError("end date must be >= start date")
+        return v
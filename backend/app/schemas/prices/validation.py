@@ -1,11 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class ValidationIssueRow(BaseModel):
     code: str
     description: str
     affected_dates: Optional[List[date]] = None
+    # (first, last) trading-day runs, sent instead of affected_dates when compact_dates is set
+    affected_ranges: Optional[List[Tuple[date, date]]] = None
     count: int
 
 class ValidationResultRow(BaseModel):
@@ -15,9 +17,82 @@ class ValidationResultRow(BaseModel):
     coverage: float
     first_date: Optional[date] = None
     last_date: Optional[date] = None
+    missing_ranges: Optional[List[Tuple[date, date]]] = None
     issues: List[ValidationIssueRow]
 
 class ValidatePricesRequest(BaseModel):
     symbols: List[str]
     start: date
     end: date
+    # Also check return spikes, stale closes, volume outliers and OHLC
+    # inconsistencies; reads the prices themselves, so opt-in
+    anomalies: bool = False
+    # Report dates as (first, last) trading-day runs instead of one entry per date
+    compact_dates: bool = False
+
+class CoverageBitmapRequest(BaseModel):
+    symbols: List[str]
+    start: date
+    end: date
+
+class CoverageBitmapRow(BaseModel):
+    symbol: str
+    coverage: float
+    # base64 of the packed bitmap: trading day j is bit (j % 8) of byte (j // 8)
+    bits: str
+
+class CoverageBitmapResponse(BaseModel):
+    start: date
+    end: date
+    # Trading days the bitmap columns refer to, in order
+    trading_days: List[date]
+    rows: List[CoverageBitmapRow]
+
+class RepairPricesRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1)
+    start: date
+    end: date
+    interval: str = "1d"
+    max_attempts: int = Field(3, ge=1, le=10)
+    max_concurrent: int = Field(5, ge=1, le=20)
+    coverage_threshold: float = Field(0.95, ge=0.0, le=1.0)
+    # Plan and fetch, but do not write
+    dry_run: bool = False
+
+    @field_validator("symbols")
+    def normalize_symbols(cls, v: List[str]) -> List[str]:
+        normalized = [s.strip().upper() for s in v if s.strip()]
+        if not normalized:
+            raise ValueError("symbols list cannot be empty after normalization")
+        return normalized
+
+    @field_validator("end")
+    def validate_date_range(cls, v: date, info) -> date:
+        start = info.data.get("start")
+        if start and v < start:
+            raise ValueError("end date must be >= start date")
+        return v
+
+class RepairFetchRow(BaseModel):
+    symbols: List[str]
+    start: date
+    end: date
+
+class SymbolRepairRow(BaseModel):
+    symbol: str
+    coverage_before: float
+    coverage_after: float
+    missing_before: int
+    missing_after: int
+    flagged_before: int
+    flagged_after: int
+    rows_inserted: int
+    rows_revised: int
+
+class RepairPricesResponse(BaseModel):
+    start: date
+    end: date
+    dry_run: bool
+    fetches: List[RepairFetchRow]
+    results: List[SymbolRepairRow]
+    elapsed_ms: int
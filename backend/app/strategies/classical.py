@@ -1 +1,47 @@
-# Moving averages, RSI, etc.
\ No newline at end of file
+# Moving averages, RSI, etc.
+#
+# Signal functions take a dates x symbols close panel and return a panel of
+# the same shape, valued at each day's close (NaN/0 = no position). Feed
+# them through app.backtest.engine.normalize_signals to get target weights.
+import numpy as np
+
+
+def equal_weight_signal(prices: np.ndarray) -> np.ndarray:
+    """1 for every symbol with a price that day."""
+    return np.where(np.isnan(prices), 0.0, 1.0)
+
+
+def momentum_signal(prices: np.ndarray, lookback: int = 252, skip: int = 21) -> np.ndarray:
+    """
+    Sign of the return from `lookback` to `skip` days ago (12-1 momentum by
+    default); 0 until enough history exists.
+    """
+    signal = np.zeros_like(prices)
+    if lookback >= len(prices) or skip >= lookback:
+        return signal
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = prices[lookback - skip:len(prices) - skip] / prices[:len(prices) - lookback] - 1.0
+    signal[lookback:] = np.nan_to_num(np.sign(change))
+    return signal
+
+
+def moving_average(prices: np.ndarray, window: int) -> np.ndarray:
+    """Trailing simple moving average per column; NaN where the window holds a missing price."""
+    out = np.full_like(prices, np.nan)
+    if window > len(prices):
+        return out
+    sums = np.cumsum(np.nan_to_num(prices), axis=0)
+    gaps = np.cumsum(np.isnan(prices), axis=0)
+    out[window - 1:] = sums[window - 1:]
+    out[window:] -= sums[:-window]
+    out[window - 1:] /= window
+    window_gaps = gaps[window - 1:].copy()
+    window_gaps[1:] -= gaps[:-window]
+    out[window - 1:][window_gaps > 0] = np.nan
+    return out
+
+
+def moving_average_crossover_signal(prices: np.ndarray, fast: int = 50, slow: int = 200) -> np.ndarray:
+    """+1 while the fast average is above the slow one, -1 below, 0 before both exist."""
+    with np.errstate(invalid="ignore"):
+        return np.nan_to_num(np.sign(moving_average(prices, fast) - moving_average(prices, slow)))
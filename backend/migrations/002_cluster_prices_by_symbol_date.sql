@@ -0,0 +1,48 @@
+-- Make (symbol, date) the clustered key of dbo.prices.
+-- Range reads become a single clustered seek (no key lookups) and inserts
+-- maintain one B-tree instead of three. The id column is kept, unindexed
+-- and no longer read by the application.
+
+IF EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE object_id = OBJECT_ID('dbo.prices') AND name = 'idx_prices_symbol_date'
+)
+    DROP INDEX idx_prices_symbol_date ON dbo.prices;
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE object_id = OBJECT_ID('dbo.prices') AND name = 'pk_prices_symbol_date'
+)
+BEGIN
+    -- The original PK on id has a generated name
+    DECLARE @pk SYSNAME = (
+        SELECT name FROM sys.key_constraints
+        WHERE parent_object_id = OBJECT_ID('dbo.prices') AND type = 'PK'
+    );
+    IF @pk IS NOT NULL
+    BEGIN
+        DECLARE @drop_pk NVARCHAR(MAX) = N'ALTER TABLE dbo.prices DROP CONSTRAINT ' + QUOTENAME(@pk);
+        EXEC sp_executesql @drop_pk;
+    END;
+
+    IF EXISTS (
+        SELECT 1 FROM sys.key_constraints
+        WHERE parent_object_id = OBJECT_ID('dbo.prices') AND name = 'uix_symbol_date'
+    )
+        ALTER TABLE dbo.prices DROP CONSTRAINT uix_symbol_date;
+
+    ALTER TABLE dbo.prices
+        ADD CONSTRAINT pk_prices_symbol_date PRIMARY KEY CLUSTERED (symbol, [date])
+        WITH (DATA_COMPRESSION = PAGE);
+END;
+
+-- Page compression (includes row compression) if the key already existed uncompressed
+IF EXISTS (
+    SELECT 1
+    FROM sys.partitions p
+    JOIN sys.indexes i ON i.object_id = p.object_id AND i.index_id = p.index_id
+    WHERE p.object_id = OBJECT_ID('dbo.prices')
+      AND i.name = 'pk_prices_symbol_date'
+      AND p.data_compression_desc <> 'PAGE'
+)
+    ALTER INDEX pk_prices_symbol_date ON dbo.prices REBUILD WITH (DATA_COMPRESSION = PAGE);
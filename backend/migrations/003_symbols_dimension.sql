@@ -0,0 +1,52 @@
+-- Move the ticker string out of dbo.prices into a dbo.symbols dimension.
+-- dbo.prices is rebuilt keyed (clustered, page-compressed) on
+-- (symbol_id INT, date), which shrinks every row and index key.
+-- The conversion runs as dynamic SQL so the batch still compiles once
+-- dbo.prices no longer has a symbol column (re-runs are no-ops).
+
+IF OBJECT_ID('dbo.symbols', 'U') IS NULL
+    CREATE TABLE dbo.symbols (
+        symbol_id INT IDENTITY(1,1) NOT NULL,
+        symbol NVARCHAR(32) NOT NULL,
+
+        CONSTRAINT pk_symbols PRIMARY KEY CLUSTERED (symbol_id),
+        CONSTRAINT uix_symbols_symbol UNIQUE (symbol)
+    );
+
+IF COL_LENGTH('dbo.prices', 'symbol') IS NOT NULL
+BEGIN
+    EXEC sp_executesql N'
+        INSERT INTO dbo.symbols (symbol)
+        SELECT DISTINCT p.symbol
+        FROM dbo.prices p
+        WHERE NOT EXISTS (SELECT 1 FROM dbo.symbols s WHERE s.symbol = p.symbol);
+
+        CREATE TABLE dbo.prices_by_id (
+            symbol_id INT NOT NULL,
+            [date] DATE NOT NULL,
+            id BIGINT IDENTITY(1,1) NOT NULL,
+
+            [open] FLOAT NOT NULL,
+            [high] FLOAT NOT NULL,
+            [low] FLOAT NOT NULL,
+            [close] FLOAT NOT NULL,
+            [volume] BIGINT NOT NULL,
+
+            CONSTRAINT pk_prices_symbol_id_date PRIMARY KEY CLUSTERED (symbol_id, [date])
+                WITH (DATA_COMPRESSION = PAGE),
+            CONSTRAINT fk_prices_symbol FOREIGN KEY (symbol_id) REFERENCES dbo.symbols (symbol_id)
+        );
+
+        SET IDENTITY_INSERT dbo.prices_by_id ON;
+
+        INSERT INTO dbo.prices_by_id (symbol_id, [date], id, [open], [high], [low], [close], [volume])
+        SELECT s.symbol_id, p.[date], p.id, p.[open], p.[high], p.[low], p.[close], p.[volume]
+        FROM dbo.prices p
+        JOIN dbo.symbols s ON s.symbol = p.symbol;
+
+        SET IDENTITY_INSERT dbo.prices_by_id OFF;
+
+        DROP TABLE dbo.prices;
+        EXEC sp_rename ''dbo.prices_by_id'', ''prices'';
+    ';
+END;
@@ -0,0 +1,53 @@
+-- Derived daily returns per symbol, maintained by the insert path
+-- (app/db/crud/price_returns.py) which recomputes only the tail affected
+-- by newly inserted rows. Volatilities are the sample standard deviation
+-- of daily log returns over the trailing 20 / 60 rows; NULL until the
+-- window is full.
+
+IF OBJECT_ID('dbo.price_returns', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.price_returns (
+        symbol_id INT NOT NULL,
+        [date] DATE NOT NULL,
+
+        simple_return FLOAT NULL,
+        log_return FLOAT NULL,
+        vol_20 FLOAT NULL,
+        vol_60 FLOAT NULL,
+
+        CONSTRAINT pk_price_returns PRIMARY KEY CLUSTERED (symbol_id, [date])
+            WITH (DATA_COMPRESSION = PAGE),
+        CONSTRAINT fk_price_returns_symbol FOREIGN KEY (symbol_id) REFERENCES dbo.symbols (symbol_id)
+    );
+
+    -- One-off backfill of existing history
+    WITH r AS (
+        SELECT
+            symbol_id,
+            [date],
+            [close] / NULLIF(LAG([close]) OVER (PARTITION BY symbol_id ORDER BY [date]), 0) AS ratio
+        FROM dbo.prices
+    ),
+    l AS (
+        SELECT symbol_id, [date], ratio - 1 AS simple_return,
+               CASE WHEN ratio > 0 THEN LOG(ratio) END AS log_return
+        FROM r
+    )
+    INSERT INTO dbo.price_returns (symbol_id, [date], simple_return, log_return, vol_20, vol_60)
+    SELECT
+        symbol_id,
+        [date],
+        simple_return,
+        log_return,
+        CASE WHEN COUNT(log_return) OVER (
+                PARTITION BY symbol_id ORDER BY [date] ROWS BETWEEN 19 PRECEDING AND CURRENT ROW) = 20
+             THEN STDEV(log_return) OVER (
+                PARTITION BY symbol_id ORDER BY [date] ROWS BETWEEN 19 PRECEDING AND CURRENT ROW)
+        END,
+        CASE WHEN COUNT(log_return) OVER (
+                PARTITION BY symbol_id ORDER BY [date] ROWS BETWEEN 59 PRECEDING AND CURRENT ROW) = 60
+             THEN STDEV(log_return) OVER (
+                PARTITION BY symbol_id ORDER BY [date] ROWS BETWEEN 59 PRECEDING AND CURRENT ROW)
+        END
+    FROM l;
+END;
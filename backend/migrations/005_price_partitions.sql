@@ -0,0 +1,52 @@
+-- Per-(symbol, month) partition index of dbo.prices, maintained by the
+-- write paths (app/db/crud/price_partitions.py). day_mask has bit (day - 1)
+-- set for every calendar day with a stored row; version is bumped by every
+-- write that touches the month, so cached derived results can tell
+-- whether they are stale.
+--
+-- validation_partitions caches per-partition validation findings as day
+-- bitmasks together with the partition version (and validation rules
+-- version) they were computed against.
+
+IF OBJECT_ID('dbo.price_partitions', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.price_partitions (
+        symbol_id INT NOT NULL,
+        [month] DATE NOT NULL,
+
+        day_mask INT NOT NULL,
+        row_count INT NOT NULL,
+        version INT NOT NULL,
+
+        CONSTRAINT pk_price_partitions PRIMARY KEY CLUSTERED (symbol_id, [month]),
+        CONSTRAINT fk_price_partitions_symbol FOREIGN KEY (symbol_id) REFERENCES dbo.symbols (symbol_id)
+    );
+
+    -- One-off backfill of existing history; (symbol_id, date) is unique, so SUM is a bitwise OR
+    INSERT INTO dbo.price_partitions (symbol_id, [month], day_mask, row_count, version)
+    SELECT
+        symbol_id,
+        DATEFROMPARTS(YEAR([date]), MONTH([date]), 1),
+        CAST(SUM(POWER(CAST(2 AS BIGINT), DAY([date]) - 1)) AS INT),
+        COUNT(*),
+        1
+    FROM dbo.prices
+    GROUP BY symbol_id, DATEFROMPARTS(YEAR([date]), MONTH([date]), 1);
+END;
+
+IF OBJECT_ID('dbo.validation_partitions', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.validation_partitions (
+        symbol_id INT NOT NULL,
+        [month] DATE NOT NULL,
+
+        version INT NOT NULL,
+        rules_version INT NOT NULL,
+        missing_fields_mask INT NOT NULL,
+        suspicious_mask INT NOT NULL,
+        computed_at DATETIME2(0) NOT NULL,
+
+        CONSTRAINT pk_validation_partitions PRIMARY KEY CLUSTERED (symbol_id, [month]),
+        CONSTRAINT fk_validation_partitions_symbol FOREIGN KEY (symbol_id) REFERENCES dbo.symbols (symbol_id)
+    );
+END;
@@ -0,0 +1,11 @@
+-- Record when each price partition was last written. get_data_versions
+-- reads every symbol's row count, version sum and latest modified_at from
+-- dbo.price_partitions per request, so ETag / Last-Modified reflect writes
+-- made by any worker or process, not only the one serving the request.
+-- Existing partitions get the migration time: at least as late as their
+-- real last write, so no client is told a newer copy is current.
+
+IF COL_LENGTH('dbo.price_partitions', 'modified_at') IS NULL
+    ALTER TABLE dbo.price_partitions
+        ADD modified_at DATETIME2(0) NOT NULL
+            CONSTRAINT df_price_partitions_modified_at DEFAULT SYSUTCDATETIME();
@@ -0,0 +1,17 @@
+-- SQLite equivalent of ../001_create_market_data.sql
+CREATE TABLE IF NOT EXISTS prices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    date DATE NOT NULL,
+
+    [open] REAL NOT NULL,
+    [high] REAL NOT NULL,
+    [low] REAL NOT NULL,
+    [close] REAL NOT NULL,
+    [volume] INTEGER NOT NULL,
+
+    CONSTRAINT uix_symbol_date UNIQUE (symbol, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_prices_symbol_date
+    ON prices (symbol, date);
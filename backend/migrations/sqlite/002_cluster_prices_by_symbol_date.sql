@@ -0,0 +1,27 @@
+-- SQLite equivalent of ../002_cluster_prices_by_symbol_date.sql
+-- A WITHOUT ROWID table is stored as a B-tree on its primary key, i.e.
+-- clustered on (symbol, date). SQLite has no page compression; dropping
+-- the rowid B-tree and both secondary indexes is the size win here.
+-- Rebuilding is idempotent: rerunning copies the table onto itself.
+
+CREATE TABLE IF NOT EXISTS prices_clustered (
+    symbol TEXT NOT NULL,
+    date DATE NOT NULL,
+    id INTEGER,
+
+    [open] REAL NOT NULL,
+    [high] REAL NOT NULL,
+    [low] REAL NOT NULL,
+    [close] REAL NOT NULL,
+    [volume] INTEGER NOT NULL,
+
+    CONSTRAINT pk_prices_symbol_date PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO prices_clustered (symbol, date, id, [open], [high], [low], [close], [volume])
+SELECT symbol, date, id, [open], [high], [low], [close], [volume]
+FROM prices;
+
+DROP TABLE prices;
+
+ALTER TABLE prices_clustered RENAME TO prices;
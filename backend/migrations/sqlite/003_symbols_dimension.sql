@@ -0,0 +1,36 @@
+-- SQLite equivalent of ../003_symbols_dimension.sql
+-- SQLite has no conditional DDL, so unlike the SQL Server file this one
+-- relies on schema_migrations to run exactly once.
+
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL COLLATE NOCASE,
+
+    CONSTRAINT uix_symbols_symbol UNIQUE (symbol)
+);
+
+INSERT OR IGNORE INTO symbols (symbol)
+SELECT DISTINCT symbol FROM prices;
+
+CREATE TABLE prices_by_id (
+    symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+    date DATE NOT NULL,
+    id INTEGER,
+
+    [open] REAL NOT NULL,
+    [high] REAL NOT NULL,
+    [low] REAL NOT NULL,
+    [close] REAL NOT NULL,
+    [volume] INTEGER NOT NULL,
+
+    CONSTRAINT pk_prices_symbol_id_date PRIMARY KEY (symbol_id, date)
+) WITHOUT ROWID;
+
+INSERT INTO prices_by_id (symbol_id, date, id, [open], [high], [low], [close], [volume])
+SELECT s.symbol_id, p.date, p.id, p.[open], p.[high], p.[low], p.[close], p.[volume]
+FROM prices p
+JOIN symbols s ON s.symbol = p.symbol;
+
+DROP TABLE prices;
+
+ALTER TABLE prices_by_id RENAME TO prices;
@@ -0,0 +1,15 @@
+-- SQLite equivalent of ../004_price_returns.sql
+-- SQLite has no STDEV window aggregate, so existing history is not
+-- backfilled here; rows are filled in as prices are (re)ingested.
+
+CREATE TABLE IF NOT EXISTS price_returns (
+    symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+    date DATE NOT NULL,
+
+    simple_return REAL,
+    log_return REAL,
+    vol_20 REAL,
+    vol_60 REAL,
+
+    CONSTRAINT pk_price_returns PRIMARY KEY (symbol_id, date)
+) WITHOUT ROWID;
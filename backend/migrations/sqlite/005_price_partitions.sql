@@ -0,0 +1,35 @@
+-- SQLite equivalent of ../005_price_partitions.sql
+
+CREATE TABLE IF NOT EXISTS price_partitions (
+    symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+    month DATE NOT NULL,
+
+    day_mask INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+
+    CONSTRAINT pk_price_partitions PRIMARY KEY (symbol_id, month)
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO price_partitions (symbol_id, month, day_mask, row_count, version)
+SELECT
+    symbol_id,
+    strftime('%Y-%m-01', date),
+    SUM(1 << (CAST(strftime('%d', date) AS INTEGER) - 1)),
+    COUNT(*),
+    1
+FROM prices
+GROUP BY symbol_id, strftime('%Y-%m-01', date);
+
+CREATE TABLE IF NOT EXISTS validation_partitions (
+    symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+    month DATE NOT NULL,
+
+    version INTEGER NOT NULL,
+    rules_version INTEGER NOT NULL,
+    missing_fields_mask INTEGER NOT NULL,
+    suspicious_mask INTEGER NOT NULL,
+    computed_at TEXT NOT NULL,
+
+    CONSTRAINT pk_validation_partitions PRIMARY KEY (symbol_id, month)
+) WITHOUT ROWID;
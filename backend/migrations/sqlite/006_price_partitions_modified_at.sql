@@ -0,0 +1,7 @@
+-- SQLite equivalent of ../006_price_partitions_modified_at.sql
+-- ADD COLUMN cannot default to CURRENT_TIMESTAMP, so existing rows are
+-- stamped by an UPDATE; relies on schema_migrations to run exactly once.
+
+ALTER TABLE price_partitions ADD COLUMN modified_at TEXT;
+
+UPDATE price_partitions SET modified_at = strftime('%Y-%m-%d %H:%M:%S', 'now') WHERE modified_at IS NULL;
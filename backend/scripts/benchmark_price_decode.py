@@ -0,0 +1,175 @@
+"""
+Decode benchmark: the original per-row reader (one PriceDataRow per cursor
+row -> DataFrame) versus get_prices_arrays (cursor batches -> preallocated
+NumPy columns). get_prices, which streams rows from the cursor on a cache
+miss, is reported as well.
+
+All readers run against an in-memory fake pool whose cursor serves the
+same pre-built driver tuples (date objects, floats, ints), so only decoding
+cost is measured, not the database. The price cache is disabled so every
+run decodes.
+
+Usage:
+    python scripts/benchmark_price_decode.py --symbols 400 --days 2500 [--memory]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import app.db.async_pool as async_pool
+from app.db.crud import symbols as symbols_module
+from app.db.crud.data_versions import DataVersion
+from app.db.crud.price_cache import price_cache
+from app.db.connection import get_connection, release_connection
+from app.schemas.prices.price_row import PriceDataRow
+
+get_prices_module = sys.modules["app.db.crud.get_prices"]
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self._rows = rows
+        self._pos = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def execute(self, sql, params=None):
+        self._pos = 0
+
+    async def fetchmany(self, size):
+        batch = self._rows[self._pos:self._pos + size]
+        self._pos += size
+        return batch
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pos >= len(self._rows):
+            raise StopAsyncIteration
+        self._pos += 1
+        return self._rows[self._pos - 1]
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def cursor(self):
+        return FakeCursor(self._rows)
+
+
+class FakePool:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def acquire(self):
+        return FakeConn(self._rows)
+
+    async def release(self, conn):
+        return None
+
+
+def _rows(symbols, days):
+    rng = random.Random(42)
+    start = date(2010, 1, 4)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    rows = []
+    for s in symbols:
+        for d in dates:
+            p = 100 + rng.random()
+            rows.append((s, d, p, p * 1.01, p * 0.99, p, rng.randint(1_000, 1_000_000)))
+    return rows, dates[0], dates[-1]
+
+
+async def _baseline_rows(symbols, start, end):
+    """The reader get_prices replaced: iterate the cursor, one PriceDataRow per row."""
+    conn = await get_connection()
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT ...", symbols + [start, end])
+            async for row in cursor:
+                yield PriceDataRow(
+                    symbol=row[0],
+                    date=row[1],
+                    open=row[2],
+                    high=row[3],
+                    low=row[4],
+                    close=row[5],
+                    volume=row[6]
+                )
+    finally:
+        await release_connection(conn)
+
+
+async def _via_baseline(symbols, start, end):
+    records = [r.model_dump() async for r in _baseline_rows(symbols, start, end)]
+    return pd.DataFrame.from_records(records)
+
+
+async def _via_rows(symbols, start, end):
+    records = [r.model_dump() async for r in get_prices_module.get_prices(symbols, start, end)]
+    return pd.DataFrame.from_records(records)
+
+
+async def _via_arrays(symbols, start, end):
+    return await get_prices_module.get_prices_arrays(symbols, start, end)
+
+
+async def _measure(label, fn, *args, memory=False):
+    if memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    await fn(*args)
+    elapsed = time.perf_counter() - t0
+    line = f"{label:<28} {elapsed:8.2f} s"
+    if memory:
+        # tracemalloc slows allocation-heavy code; compare timings from runs without --memory
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"   peak {peak / 2**20:8.1f} MiB"
+    print(line)
+    return elapsed
+
+
+async def main(n_symbols: int, days: int, memory: bool) -> None:
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    rows, start, end = _rows(symbols, days)
+    print(f"{len(rows):,} rows ({n_symbols} symbols x {days} days)")
+
+    async_pool._pool = FakePool(rows)
+    for i, s in enumerate(symbols, start=1):
+        symbols_module._remember(i, s)
+
+    async def versions(wanted):
+        return {s: DataVersion(days, 0, None) for s in wanted}
+
+    get_prices_module.get_data_versions = versions
+    price_cache.max_bytes = 0
+
+    baseline = await _measure("per-row reader -> DataFrame", _via_baseline, symbols, start, end, memory=memory)
+    await _measure("get_prices -> DataFrame", _via_rows, symbols, start, end, memory=memory)
+    fast = await _measure("get_prices_arrays", _via_arrays, symbols, start, end, memory=memory)
+    print(f"speedup over the per-row reader x{baseline / fast:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=400)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--memory", action="store_true", help="also report peak traced allocations")
+    args = parser.parse_args()
+    asyncio.run(main(args.symbols, args.days, args.memory))
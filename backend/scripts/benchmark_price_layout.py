@@ -0,0 +1,127 @@
+"""
+Before/after benchmark for migration 002 (clustered (symbol, date) layout).
+
+Builds two synthetic SQLite price tables from the migration files themselves:
+  - before: migrations/sqlite/001 (rowid heap + UNIQUE + redundant index)
+  - after:  migrations/sqlite/001 + 002 (WITHOUT ROWID, clustered on (symbol, date))
+then measures bulk insert throughput, on-disk size and random per-symbol
+range reads (the shape of get_prices / get_price_keys).
+
+Usage:
+    python scripts/benchmark_price_layout.py --symbols 1000 --days 2520
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+MIGRATIONS_DIR = os.path.join("migrations", "sqlite")
+LAYOUTS = {
+    "before": ["001_create_market_data.sql"],
+    "after": ["001_create_market_data.sql", "002_cluster_prices_by_symbol_date.sql"],
+}
+
+INSERT_SQL = """
+    INSERT INTO prices (symbol, date, [open], [high], [low], [close], [volume])
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+RANGE_SQL = """
+    SELECT symbol, date, [open], [high], [low], [close], volume
+    FROM prices
+    WHERE symbol = ? AND date >= ? AND date <= ?
+    ORDER BY symbol, date ASC
+"""
+
+
+def _trading_days(n: int):
+    d, days = date(2010, 1, 4), []
+    while len(days) < n:
+        if d.weekday() < 5:
+            days.append(d.isoformat())
+        d += timedelta(days=1)
+    return days
+
+
+def _rows(symbols, days, order: str):
+    rng = random.Random(42)
+    pairs = (
+        ((s, d) for d in days for s in symbols) if order == "date"
+        else ((s, d) for s in symbols for d in days)
+    )
+    for s, d in pairs:
+        p = 100 + rng.random()
+        yield (s, d, p, p * 1.01, p * 0.99, p, rng.randint(1_000, 1_000_000))
+
+
+def _build(path: str, layout: str):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for name in LAYOUTS[layout]:
+        with open(os.path.join(MIGRATIONS_DIR, name)) as f:
+            conn.executescript(f.read())
+    return conn
+
+
+def _write(conn, symbols, days, order: str, chunk: int = 1000) -> float:
+    t0 = time.perf_counter()
+    batch = []
+    for row in _rows(symbols, days, order):
+        batch.append(row)
+        if len(batch) == chunk:
+            conn.executemany(INSERT_SQL, batch)
+            conn.commit()
+            batch.clear()
+    if batch:
+        conn.executemany(INSERT_SQL, batch)
+        conn.commit()
+    return time.perf_counter() - t0
+
+
+def _read(conn, symbols, days, queries: int, window: int) -> tuple[float, int]:
+    rng = random.Random(7)
+    t0 = time.perf_counter()
+    rows = 0
+    for _ in range(queries):
+        s = rng.choice(symbols)
+        i = rng.randrange(0, len(days) - window)
+        rows += len(conn.execute(RANGE_SQL, (s, days[i], days[i + window - 1])).fetchall())
+    return time.perf_counter() - t0, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=2520, help="trading days per symbol (2520 ~ 10 years)")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=252, help="trading days per range read")
+    parser.add_argument("--order", choices=["date", "symbol"], default="date",
+                        help="insert day-by-day (nightly ingestion) or symbol-by-symbol (backfill)")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+    days = _trading_days(args.days)
+    total = len(symbols) * len(days)
+    print(f"{total:,} rows ({args.symbols} symbols x {args.days} days), insert order={args.order}")
+    print(f"{'layout':<8} {'write s':>9} {'rows/s':>10} {'size MiB':>9} {'read ms/q':>10} {'rows/q':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in LAYOUTS:
+            path = os.path.join(tmp, f"{layout}.db")
+            conn = _build(path, layout)
+            write_s = _write(conn, symbols, days, args.order)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            size = os.path.getsize(path) / 2**20
+            read_s, rows = _read(conn, symbols, days, args.queries, args.window)
+            conn.close()
+            print(
+                f"{layout:<8} {write_s:>9.1f} {total / write_s:>10,.0f} {size:>9.1f} "
+                f"{read_s * 1000 / args.queries:>10.3f} {rows // args.queries:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
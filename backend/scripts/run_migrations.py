@@ -1,11 +1,32 @@
 import os
 import glob
 import asyncio
+from app.core.config import DB_ENGINE
 from app.db import async_pool
 from app.db.async_pool import init_db_pool, close_db_pool, _pool
 from app.db.connection import get_connection, release_connection
 
 MIGRATIONS_DIR = "migrations"
+# SQLite keeps its own dialect of each migration under the same file name
+SQLITE_MIGRATIONS_DIR = os.path.join(MIGRATIONS_DIR, "sqlite")
+
+SCHEMA_MIGRATIONS_DDL = {
+    "mssql": """
+            IF NOT EXISTS (
+                SELECT * FROM sysobjects WHERE name='schema_migrations'
+            )
+            CREATE TABLE dbo.schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+            )
+        """,
+    "sqlite": """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """,
+}
 
 async def run_migrations(pool=None):
     # Initialize the pool
@@ -25,23 +46,18 @@ async def run_migrations(pool=None):
         conn = await get_connection()
         cursor = await conn.cursor()
 
+        sqlite = DB_ENGINE == "sqlite"
+        migrations_dir = SQLITE_MIGRATIONS_DIR if sqlite else MIGRATIONS_DIR
+
         # Create schema_migrations table if it doesn't exist
-        await cursor.execute("""
-            IF NOT EXISTS (
-                SELECT * FROM sysobjects WHERE name='schema_migrations'
-            )
-            CREATE TABLE dbo.schema_migrations (
-                version VARCHAR(255) PRIMARY KEY,
-                applied_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
-            )
-        """)
+        await cursor.execute(SCHEMA_MIGRATIONS_DDL["sqlite" if sqlite else "mssql"])
 
         # Get applied migrations
         await cursor.execute("SELECT version FROM schema_migrations")
         applied = {row[0] for row in await cursor.fetchall()}
 
         # Apply pending migrations
-        for path in sorted(glob.glob(f"{MIGRATIONS_DIR}/*.sql")):
+        for path in sorted(glob.glob(f"{migrations_dir}/*.sql")):
             version = os.path.basename(path)
             if version in applied:
                 continue
@@ -49,7 +65,11 @@ async def run_migrations(pool=None):
             print(f"Applying migration: {version}")
             with open(path) as f:
                 sql = f.read()
-            await cursor.execute(sql)
+            if sqlite:
+                # sqlite3 only runs multi-statement scripts via executescript
+                await conn.executescript(sql)
+            else:
+                await cursor.execute(sql)
             await cursor.execute(
                 "INSERT INTO schema_migrations (version) VALUES (?)",
                 (version,)
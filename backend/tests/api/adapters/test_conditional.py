@@ -0,0 +1,57 @@
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from app.api.routes.data.adapters import is_not_modified, price_etag
+from app.db.crud.data_versions import DataVersion
+
+
+MODIFIED = datetime(2024, 1, 5, 21, 0, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    raw = [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def _versions(generation=0, row_count=10):
+    return {"AAPL": DataVersion(row_count, generation, MODIFIED)}
+
+
+def test_etag_changes_with_version_and_query():
+    base = price_etag(_versions(), date(2024, 1, 1), None)
+
+    assert base == price_etag(_versions(), date(2024, 1, 1), None)
+    assert base != price_etag(_versions(generation=1), date(2024, 1, 1), None)
+    assert base != price_etag(_versions(row_count=11), date(2024, 1, 1), None)
+    assert base != price_etag(_versions(), date(2024, 1, 2), None)
+
+
+def test_if_none_match_list_and_weak_tags():
+    etag = price_etag(_versions())
+
+    assert is_not_modified(_request(if_none_match=f'"x", W/{etag}'), etag, MODIFIED)
+    assert is_not_modified(_request(if_none_match="*"), etag, MODIFIED)
+    assert not is_not_modified(_request(if_none_match='"x"'), etag, MODIFIED)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    etag = price_etag(_versions())
+    request = _request(
+        if_none_match='"x"',
+        if_modified_since=format_datetime(MODIFIED, usegmt=True),
+    )
+
+    assert not is_not_modified(request, etag, MODIFIED)
+
+
+def test_if_modified_since():
+    etag = price_etag(_versions())
+    header = format_datetime(MODIFIED, usegmt=True)
+
+    assert is_not_modified(_request(if_modified_since=header), etag, MODIFIED)
+    assert not is_not_modified(
+        _request(if_modified_since=header), etag, MODIFIED.replace(hour=22)
+    )
+    assert not is_not_modified(_request(if_modified_since="garbage"), etag, MODIFIED)
@@ -151,3 +151,50 @@ def test_adapt_orchestration_partial_fetch():
     assert aapl.coverage == 0.3  # min coverage across runs
     assert aapl.missing_dates == [date(2024,1,2), date(2024,1,3)]
 
+
+
+def test_adapt_orchestration_result_rows_revised():
+    fetch_results = [[make_mock_result("AAPL")], [make_mock_result("MSFT")]]
+
+    response = adapt_orchestration_result(
+        symbols=["AAPL", "MSFT"],
+        start=date(2024, 1, 1),
+        end=date(2024, 1, 5),
+        interval="1d",
+        dry_run=False,
+        fetch_results=fetch_results,
+        rows_inserted={"AAPL": 1, "MSFT": 0},
+        rows_revised={"AAPL": 3},
+    )
+
+    aapl, msft = response.results
+    assert aapl.rows_revised == 3
+    assert msft.rows_revised == 0
+
+
+def test_adapt_orchestration_result_compact_missing_ranges():
+    # Overlapping attempts; Jan 5 (Fri) -> Jan 8 (Mon) is one trading-day run
+    fetch_results = [[
+        make_mock_result("AAPL", missing_dates=[date(2024, 1, 3), date(2024, 1, 5), date(2024, 1, 8)]),
+        make_mock_result("AAPL", missing_dates=[date(2024, 1, 5), date(2024, 1, 2)]),
+    ]]
+
+    kwargs = dict(
+        symbols=["AAPL"],
+        start=date(2024, 1, 1),
+        end=date(2024, 1, 10),
+        interval="1d",
+        dry_run=False,
+        fetch_results=fetch_results,
+        rows_inserted={"AAPL": 0},
+    )
+    expanded = adapt_orchestration_result(**kwargs).results[0]
+    compact = adapt_orchestration_result(**kwargs, compact=True).results[0]
+
+    assert expanded.missing_dates == [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 5), date(2024, 1, 8)]
+    assert expanded.missing_ranges is None
+    assert compact.missing_dates == []
+    assert compact.missing_ranges == [
+        (date(2024, 1, 2), date(2024, 1, 3)),
+        (date(2024, 1, 5), date(2024, 1, 8)),
+    ]
@@ -0,0 +1,33 @@
+import pytest
+from datetime import date
+
+from fastapi import HTTPException
+
+from app.api.routes.data.adapters import decode_page_cursor, encode_page_cursor
+
+
+SYMBOLS = ["AAPL", "MSFT"]
+START, END = date(2024, 1, 1), date(2024, 12, 31)
+
+
+def test_cursor_round_trip():
+    token = encode_page_cursor(SYMBOLS, START, END, ("AAPL", date(2024, 3, 1)))
+
+    assert decode_page_cursor(token, SYMBOLS, START, END) == ("AAPL", date(2024, 3, 1))
+    # Symbol order does not matter
+    assert decode_page_cursor(token, ["MSFT", "AAPL"], START, END) == ("AAPL", date(2024, 3, 1))
+
+
+def test_cursor_rejected_for_other_query():
+    token = encode_page_cursor(SYMBOLS, START, END, ("AAPL", date(2024, 3, 1)))
+
+    with pytest.raises(HTTPException) as exc:
+        decode_page_cursor(token, SYMBOLS, START, date(2024, 6, 30))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "eyJmb28iOiAxfQ"])
+def test_malformed_cursor_rejected(token):
+    with pytest.raises(HTTPException) as exc:
+        decode_page_cursor(token, SYMBOLS, START, END)
+    assert exc.value.status_code == 400
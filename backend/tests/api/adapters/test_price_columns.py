@@ -0,0 +1,75 @@
+import gzip
+import json
+import pytest
+from datetime import date
+
+from app.api.routes.data.adapters import build_columnar_prices, render_columnar_prices
+from app.schemas import ColumnarPricesResponse
+
+
+def _batches(*batches):
+    async def gen():
+        for b in batches:
+            yield b
+    return gen()
+
+
+@pytest.mark.asyncio
+async def test_columnar_groups_rows_per_symbol_across_batches():
+    batches = _batches(
+        [
+            ("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 100),
+            ("AAPL", date(2024, 1, 3), 1.5, 2.5, 1.0, 2.0, 200),
+        ],
+        [
+            ("AAPL", date(2024, 1, 4), 2.0, 3.0, 1.5, 2.5, 300),
+            ("MSFT", date(2024, 1, 2), 10.0, 11.0, 9.0, 10.5, 50),
+        ],
+    )
+
+    payload = await build_columnar_prices(batches)
+
+    assert [s["symbol"] for s in payload["series"]] == ["AAPL", "MSFT"]
+    aapl = payload["series"][0]
+    assert aapl["dates"] == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert aapl["close"] == [1.5, 2.0, 2.5]
+    assert aapl["volume"] == [100, 200, 300]
+
+    # Shape matches the documented response model
+    ColumnarPricesResponse.model_validate(payload)
+
+
+@pytest.mark.asyncio
+async def test_columnar_float32_rounding():
+    batches = _batches([("AAPL", "2024-01-02", 185.64000701904297, 1.0, 1.0, 1.0 / 3.0, 1)])
+
+    payload = await build_columnar_prices(batches, float32=True)
+
+    series = payload["series"][0]
+    assert series["open"] == [185.64]
+    assert series["close"] == [0.3333333]
+    assert series["dates"] == ["2024-01-02"]
+
+
+@pytest.mark.asyncio
+async def test_columnar_empty_result():
+    payload = await build_columnar_prices(_batches())
+    response = render_columnar_prices(payload)
+
+    assert json.loads(response.body) == {"format": "columnar", "float32": False, "series": []}
+
+
+@pytest.mark.asyncio
+async def test_columnar_gzip_only_when_requested_and_large_enough():
+    rows = [("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, i) for i in range(200)]
+    payload = await build_columnar_prices(_batches(rows))
+
+    plain = render_columnar_prices(payload)
+    compressed = render_columnar_prices(payload, compress=True)
+
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.body)) == json.loads(plain.body)
+
+    small = render_columnar_prices(await build_columnar_prices(_batches()), compress=True)
+    assert "content-encoding" not in small.headers
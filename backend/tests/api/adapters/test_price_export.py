@@ -0,0 +1,61 @@
+import io
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date
+
+from app.api.routes.data.adapters import (
+    PRICES_ARROW_SCHEMA,
+    price_rows_to_record_batch,
+    stream_arrow_ipc,
+    stream_parquet,
+)
+
+
+ROWS = [("AAPL", date(2024, 1, d), 1.0, 2.0, 0.5, 1.5, 100 + d) for d in range(2, 12)]
+
+
+def _batches(*batches):
+    async def gen():
+        for b in batches:
+            yield b
+    return gen()
+
+
+async def _collect(gen) -> bytes:
+    return b"".join([chunk async for chunk in gen])
+
+
+def test_record_batch_schema_and_string_dates():
+    batch = price_rows_to_record_batch([("AAPL", "2024-01-02", 1.0, 2.0, 0.5, 1.5, 10.0)])
+
+    assert batch.schema == PRICES_ARROW_SCHEMA
+    assert batch.column(1).to_pylist() == [date(2024, 1, 2)]
+    assert batch.column(6).to_pylist() == [10]
+
+
+@pytest.mark.asyncio
+async def test_arrow_ipc_stream_round_trip():
+    data = await _collect(stream_arrow_ipc(_batches(ROWS[:4], ROWS[4:])))
+
+    table = pa.ipc.open_stream(data).read_all()
+    assert table.num_rows == len(ROWS)
+    assert table.column("volume").to_pylist() == [r[6] for r in ROWS]
+
+
+@pytest.mark.asyncio
+async def test_parquet_one_row_group_per_batch():
+    data = await _collect(stream_parquet(_batches(ROWS[:4], ROWS[4:])))
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_rows == len(ROWS)
+    assert parquet.num_row_groups == 2
+
+
+@pytest.mark.asyncio
+async def test_arrow_ipc_empty_export_is_valid_stream():
+    data = await _collect(stream_arrow_ipc(_batches()))
+
+    table = pa.ipc.open_stream(data).read_all()
+    assert table.num_rows == 0
+    assert table.schema == PRICES_ARROW_SCHEMA
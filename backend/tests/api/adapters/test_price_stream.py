@@ -0,0 +1,43 @@
+import json
+import pytest
+from datetime import date, datetime
+
+from app.api.routes.data.adapters import price_rows_to_ndjson, stream_price_ndjson
+from app.schemas import PriceDataRow
+
+
+ROW = ("AAPL", date(2024, 1, 2), 185.64, 188.44, 183.89, 185.64, 82488700)
+
+
+def test_ndjson_matches_price_row_json():
+    """NDJSON lines should carry the same fields and values as PriceDataRow JSON."""
+    line = price_rows_to_ndjson([ROW]).decode().strip()
+
+    expected = PriceDataRow(
+        symbol=ROW[0], date=ROW[1], open=ROW[2], high=ROW[3],
+        low=ROW[4], close=ROW[5], volume=ROW[6]
+    ).model_dump(mode="json")
+
+    assert json.loads(line) == expected
+
+
+def test_ndjson_accepts_datetime_and_string_dates():
+    rows = [
+        ("AAPL", datetime(2024, 1, 2), 1.0, 1.0, 1.0, 1.0, 1),
+        ("AAPL", "2024-01-03", 1.0, 1.0, 1.0, 1.0, 1),
+    ]
+    lines = price_rows_to_ndjson(rows).decode().splitlines()
+
+    assert [json.loads(l)["date"] for l in lines] == ["2024-01-02T00:00:00", "2024-01-03T00:00:00"]
+
+
+@pytest.mark.asyncio
+async def test_stream_price_ndjson_one_chunk_per_batch():
+    async def batches():
+        yield [ROW]
+        yield [ROW, ROW]
+
+    chunks = [c async for c in stream_price_ndjson(batches())]
+
+    assert len(chunks) == 2
+    assert chunks[1].count(b"\n") == 2
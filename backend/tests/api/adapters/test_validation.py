@@ -96,3 +96,32 @@ def test_adapt_validation_result_multiple():
         assert adapted_result.symbol == f"SYM{i}"
         assert len(adapted_result.issues) == 1
         assert adapted_result.issues[0].code == f"ISSUE_{i}"
+
+
+def test_adapt_validation_result_compact():
+    """
+    compact=True reports issue dates and missing dates as trading-day runs.
+    """
+    dates = [date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 9)]
+    result = ValidationResult(
+        symbol="AAPL",
+        start=date(2024, 1, 1),
+        end=date(2024, 1, 10),
+        status=None,
+        coverage=0.5,
+        expected_days=7,
+        observed_days=4,
+        first_date=date(2024, 1, 2),
+        last_date=date(2024, 1, 10),
+        missing_dates=dates,
+        issues=[ValidationIssue(code="MISSING_DAYS", description="3 missing trading days", affected_dates=dates, count=3)],
+        elapsed_ms=10
+    )
+
+    (adapted,) = adapt_validation_result([result], compact=True)
+
+    runs = [(date(2024, 1, 3), date(2024, 1, 4)), (date(2024, 1, 9), date(2024, 1, 9))]
+    assert adapted.missing_ranges == runs
+    assert adapted.issues[0].affected_ranges == runs
+    assert adapted.issues[0].affected_dates is None
+    assert adapted.issues[0].count == 3
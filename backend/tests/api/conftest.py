@@ -4,6 +4,12 @@ import app.db.async_pool as async_pool
 from app.data_ingestion import orchestrator as orch
 from app.api.routes.data import prices as prices_module
 import pandas as pd
+from datetime import datetime, timezone
+import sys
+from app.db.crud import symbols as symbols_module
+from app.db.crud.data_versions import DataVersion
+
+LAST_MODIFIED = datetime(2023, 2, 1, tzinfo=timezone.utc)
 
 @pytest.fixture(autouse=True)
 def override_dependencies(monkeypatch):
@@ -34,16 +40,26 @@ def override_dependencies(monkeypatch):
         return {"AAPL": 10}, [[row]]
 
     monkeypatch.setattr("app.api.routes.data.prices.orchestrate_fetch_and_insert", dummy_orchestrator)
+
+    async def dummy_upsert_orchestrator(*args, **kwargs):
+        inserted, fetch_results = await dummy_orchestrator(*args, **kwargs)
+        return inserted, {"AAPL": 2}, fetch_results
+    monkeypatch.setattr("app.api.routes.data.prices.orchestrate_fetch_and_upsert", dummy_upsert_orchestrator)
     app.dependency_overrides["app.api.routes.data.prices.orchestrate_fetch_and_insert"] = dummy_orchestrator
 
     # --- 2️⃣ Dummy DB pool ---
     class DummyCursor:
+        def __init__(self):
+            self._batches = [[("AAPL", "2023-01-01", 100.0, 110.0, 90.0, 105.0, 1000)]]
         async def __aenter__(self): return self
         async def __aexit__(self, exc_type, exc_val, exc_tb): return None
         async def execute(self, sql, params=None): return self
         async def fetchall(self):
             # Return one dummy row
             return [("AAPL", "2023-01-01", 100.0, 110.0, 90.0, 105.0, 1000)]
+        async def fetchmany(self, size):
+            # One batch, then exhausted
+            return self._batches.pop(0) if self._batches else []
         def __aiter__(self):
             async def gen():
                 yield ("AAPL", "2023-01-01", 100.0, 110.0, 90.0, 105.0, 1000)
@@ -58,7 +74,22 @@ def override_dependencies(monkeypatch):
 
     async_pool._pool = DummyPool()
 
-    # --- 3️⃣ Dummy background ingestion ---
+    # Known symbol ids, so the dummy cursor is never asked to resolve them
+    for symbol_id, symbol in enumerate(["AAPL", "MSFT"], start=1):
+        symbols_module._remember(symbol_id, symbol)
+
+    # --- 3️⃣ Fixed data versions (no DB lookup) ---
+    async def dummy_versions(symbols):
+        return {
+            s: DataVersion(row_count=1, generation=0, last_modified=LAST_MODIFIED)
+            for s in symbols
+        }
+    monkeypatch.setattr(prices_module, "get_data_versions", dummy_versions)
+    # The package re-exports the get_prices function under the module's name
+    monkeypatch.setattr(sys.modules["app.db.crud.get_prices"], "get_data_versions", dummy_versions)
+    monkeypatch.setattr(sys.modules["app.db.crud.price_resample"], "get_data_versions", dummy_versions)
+
+    # --- 4️⃣ Dummy background ingestion ---
     async def dummy_bg_task(req):
         return
     monkeypatch.setattr(prices_module, "run_background_ingestion", dummy_bg_task)
@@ -67,4 +98,5 @@ def override_dependencies(monkeypatch):
 
     # Cleanup
     async_pool._pool = None
+    symbols_module.clear_symbol_cache()
     app.dependency_overrides = {}
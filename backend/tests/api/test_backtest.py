@@ -0,0 +1,50 @@
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import backtest
+from app.core.dates import trading_day_ordinals
+
+app = FastAPI()
+app.include_router(backtest.router)
+
+
+def test_run_backtest_endpoint():
+    """
+    POST /backtest/run loads the price panel once and returns stats and curves from the start date on.
+    """
+    days = trading_day_ordinals(date(2023, 12, 1), date(2024, 1, 31))
+    prices = np.column_stack([np.linspace(100, 120, len(days)), np.linspace(50, 40, len(days))])
+    payload = {"symbols": ["AAPL", "MSFT"], "start": "2024-01-02", "end": "2024-01-31", "cost_bps": 0}
+
+    with patch("app.backtest.engine.load_price_panel", new_callable=AsyncMock) as mock_load:
+        mock_load.return_value = (days, prices)
+        response = TestClient(app).post("/backtest/run", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["dates"][0] == "2024-01-02"
+    assert len(data["equity"]) == len(data["dates"]) == len(data["turnover"])
+    # Equal weight is already held on the first day
+    assert data["turnover"][0] > 0
+    assert set(data["stats"]) >= {"total_return", "sharpe", "max_drawdown"}
+    assert mock_load.await_args.args[0] == ["AAPL", "MSFT"]
+    assert mock_load.await_args.args[1] < date(2024, 1, 2)
+
+
+def test_duplicate_symbols_load_one_column_each():
+    """Repeated and mixed-case tickers are merged, so no symbol gets double weight."""
+    days = trading_day_ordinals(date(2023, 12, 1), date(2024, 1, 31))
+    prices = np.column_stack([np.linspace(100, 120, len(days)), np.linspace(50, 40, len(days))])
+    payload = {"symbols": ["aapl", "AAPL", " MSFT ", "msft"], "start": "2024-01-02", "end": "2024-01-31"}
+
+    with patch("app.backtest.engine.load_price_panel", new_callable=AsyncMock) as mock_load:
+        mock_load.return_value = (days, prices)
+        response = TestClient(app).post("/backtest/run", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["symbols"] == ["AAPL", "MSFT"]
+    assert mock_load.await_args.args[0] == ["AAPL", "MSFT"]
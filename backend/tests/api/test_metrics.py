@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from app.core.metrics import CONTENT_TYPE, MetricsRegistry
+from app.main import app
+
+
+def test_registry_renders_prometheus_text():
+    reg = MetricsRegistry()
+    hits = reg.counter("hits_total", "Hits", ("cache",))
+    latency = reg.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    reg.callback("pool_connections", "Pool", "gauge", ("state",), lambda: {("free",): 3})
+
+    hits.labels("prices").inc(2)
+    latency.labels("/x").observe(0.05)
+    latency.labels("/x").observe(0.5)
+    latency.labels("/x").observe(5)
+
+    text = reg.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{cache="prices"} 2.0' in text
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/x",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/x"} 3' in text
+    assert 'pool_connections{state="free"} 3' in text
+
+
+def test_registry_skips_failing_callbacks():
+    reg = MetricsRegistry()
+    reg.counter("ok_total", "Ok").inc()
+    reg.callback("broken", "Broken", "gauge", (), lambda: 1 / 0)
+    text = reg.render()
+    assert "ok_total 1.0" in text
+    assert "broken" not in text
+
+
+def test_registry_is_idempotent_by_name():
+    reg = MetricsRegistry()
+    assert reg.counter("c_total", "C") is reg.counter("c_total", "C")
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_reports_route_latency():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.get("/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    text = response.text
+    # Labelled by route template, not the raw path
+    assert 'route="/market-data/ohlcv/{symbol}"' in text
+    assert "db_pool_acquire_duration_seconds_count" in text
+    assert 'price_cache_hits_total{cache="prices"}' in text
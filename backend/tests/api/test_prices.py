@@ -1,6 +1,7 @@
 import pytest
 from httpx import AsyncClient, ASGITransport
-from app.schemas import GetPricesPayload, PriceDataRow
+from app.schemas import GetPricesPayload, PriceDataRow, PriceReturnRow
+from app.api.routes.data import prices as prices_module
 from app.main import app
 
 
@@ -74,3 +75,156 @@ async def test_ingest_prices_async():
     json_data = response.json()
     assert json_data["status"] == "accepted"
     assert json_data["symbols"] == ["AAPL"]
+
+
+@pytest.mark.asyncio
+async def test_get_prices_bulk_ndjson():
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/market-data/ohlcv/query",
+            json=payload,
+            headers={"Accept": "application/x-ndjson", "Accept-Encoding": "gzip"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    # Never buffered by a compressor, so lines reach the client as they are written
+    assert "content-encoding" not in response.headers
+    lines = [l for l in response.text.splitlines() if l]
+    assert len(lines) == 1
+    assert '"symbol": "AAPL"' in lines[0]
+
+
+@pytest.mark.asyncio
+async def test_get_prices_single_ndjson():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31",
+            headers={"Accept": "application/x-ndjson"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+
+@pytest.mark.asyncio
+async def test_get_prices_bulk_columnar():
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31", "format": "columnar"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/ohlcv/query", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["format"] == "columnar"
+    assert data["series"][0]["symbol"] == "AAPL"
+    assert data["series"][0]["dates"] == ["2023-01-01"]
+
+
+@pytest.mark.asyncio
+async def test_export_prices_arrow():
+    import pyarrow as pa
+
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/export", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("symbol").to_pylist() == ["AAPL"]
+
+
+@pytest.mark.asyncio
+async def test_get_prices_single_conditional_get():
+    transport = ASGITransport(app=app)
+    url = "/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31"
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get(url)
+        etag = first.headers["etag"]
+
+        cached = await ac.get(url, headers={"If-None-Match": etag})
+        stale = await ac.get(url, headers={"If-None-Match": '"other"'})
+        since = await ac.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    assert stale.status_code == 200
+    assert since.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_prices_bulk_paginated():
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31", "page_size": 100}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/ohlcv/query", json=payload)
+        bad_cursor = await ac.post("/market-data/ohlcv/query", json={**payload, "cursor": "garbage"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rows"][0]["symbol"] == "AAPL"
+    assert data["next_cursor"] is None
+    assert bad_cursor.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_get_returns_bulk(monkeypatch):
+    async def dummy_returns(symbols, start, end, lookback=0):
+        for symbol in symbols:
+            yield PriceReturnRow(
+                symbol=symbol,
+                date="2023-01-03",
+                simple_return=0.01,
+                log_return=0.00995,
+                vol_20=None,
+                vol_60=None,
+            )
+
+    monkeypatch.setattr(prices_module, "get_returns", dummy_returns)
+    payload = {"symbols": ["aapl", "MSFT"], "start": "2023-01-01", "end": "2023-01-31"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/returns/query", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["symbol"] for r in data] == ["AAPL", "MSFT"]
+    assert data[0]["vol_20"] is None
+
+
+@pytest.mark.anyio
+async def test_get_prices_bulk_resampled():
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31", "interval": "1w"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/ohlcv/query", json=payload)
+        rejected = await ac.post("/market-data/ohlcv/query", json={**payload, "page_size": 10})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["symbol"] == "AAPL"
+    assert data[0]["close"] == 105.0
+    assert rejected.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_ingest_prices_revise():
+    payload = {"symbols": ["AAPL"], "start": "2023-01-01", "end": "2023-01-31", "revise": True}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/market-data/ingest", json=payload)
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert result["rows_inserted"] == 10
+    assert result["rows_revised"] == 2
+
+
+@pytest.mark.anyio
+async def test_request_id_is_echoed_or_generated():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        echoed = await ac.get("/", headers={"X-Request-ID": "abc-123"})
+        generated = await ac.get("/")
+    assert echoed.headers["x-request-id"] == "abc-123"
+    assert len(generated.headers["x-request-id"]) == 16
@@ -0,0 +1,89 @@
+import logging
+import pytest
+from httpx import AsyncClient, ASGITransport
+from app.core.timing import ServerTimingMiddleware, add_phase, timed
+from app.db.crud import price_cache
+from app.main import app
+
+
+def _phases(header: str) -> dict:
+    phases = {}
+    for entry in header.split(", "):
+        name, dur = entry.split(";dur=")
+        phases[name] = float(dur)
+    return phases
+
+
+def test_helpers_are_noops_outside_a_timed_request():
+    add_phase("sql", 1.0)
+    with timed("render"):
+        pass
+
+
+@pytest.fixture
+def force_token(monkeypatch):
+    monkeypatch.setattr(ServerTimingMiddleware, "force_token", "s3cret")
+    return "s3cret"
+
+
+@pytest.fixture
+def no_sampling(monkeypatch):
+    monkeypatch.setattr("app.core.timing.random.random", lambda: 1.0)
+
+
+@pytest.mark.asyncio
+async def test_forced_request_gets_server_timing_header(force_token):
+    # A cache hit would skip the pool and SQL phases
+    price_cache.clear()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31",
+            headers={"X-Server-Timing": force_token},
+        )
+    assert response.status_code == 200
+    phases = _phases(response.headers["server-timing"])
+    # A cold row read streams from the cursor, so there is no array decode phase
+    for name in ("pool", "sql", "validate", "serialize", "total"):
+        assert name in phases
+    assert phases["total"] >= phases["serialize"]
+
+
+@pytest.mark.asyncio
+async def test_unsampled_request_has_no_header(monkeypatch):
+    monkeypatch.setattr(ServerTimingMiddleware, "_sampled", lambda self, scope: False)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31")
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("token, sent", [("", "1"), ("s3cret", "guess")])
+async def test_force_header_needs_the_configured_token(monkeypatch, no_sampling, token, sent):
+    monkeypatch.setattr(ServerTimingMiddleware, "force_token", token)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31",
+            headers={"X-Server-Timing": sent},
+        )
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_reports_render_in_log(caplog, force_token):
+    caplog.set_level(logging.INFO, logger="app.core.timing")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/market-data/ohlcv/AAPL?start=2023-01-01&end=2023-01-31",
+            headers={"Accept": "application/x-ndjson", "X-Server-Timing": force_token},
+        )
+    assert response.status_code == 200
+    line = next(r.getMessage() for r in caplog.records if r.getMessage().startswith("request timing"))
+    assert "route=/market-data/ohlcv/{symbol}" in line
+    assert "render_ms=" in line
+    assert "serialize_ms=" not in line
@@ -6,7 +6,7 @@ from fastapi.testclient import TestClient
 
 from app.api.routes.data import validation  # replace with actual router module
 from app.data_validation.models import ValidationResult, ValidationIssue, ValidationStatus
-from app.schemas.prices.validation import ValidatePricesRequest, ValidationResultRow
+from app.schemas.prices.validation import RepairPricesRequest, ValidatePricesRequest, ValidationResultRow
 
 # Create a minimal FastAPI app for testing
 app = FastAPI()
@@ -72,6 +72,8 @@ def test_validate_prices_endpoint():
         response = client.post("/market-data/validate/", json=payload)
 
         assert response.status_code == 200
+        # Anomaly checks are opt-in
+        assert mock_service.await_args.kwargs["anomalies"] is False
 
         data = response.json()
         assert isinstance(data, list)
@@ -82,6 +84,9 @@ def test_validate_prices_endpoint():
         assert aapl_result["symbol"] == "AAPL"
         assert aapl_result["coverage"] == 1.0
         assert aapl_result["issues"] == []
+        # Request options are not echoed back per result
+        assert "anomalies" not in aapl_result
+        assert "compact_dates" not in aapl_result
 
         # Check second result (GOOG)
         goog_result = data[1]
@@ -92,3 +97,126 @@ def test_validate_prices_endpoint():
         assert issue["code"] == "MISSING_DAYS"
         assert issue["count"] == 1
         assert issue["affected_dates"] == ["2024-01-03"]
+
+
+def test_coverage_bitmap_endpoint():
+    """
+    POST /market-data/validate/coverage packs the partition index into one base64 bitset per symbol.
+    """
+    import base64
+
+    # AAPL has Jan 2, 3 and 5 2024; GOOG only Jan 4; NOPE is unknown
+    january = date(2024, 1, 1).toordinal()
+    partitions = [
+        (1, january, (1 << 1) | (1 << 2) | (1 << 4), 7),
+        (2, january, 1 << 3, 2),
+    ]
+    payload = {"symbols": ["AAPL", "GOOG", "NOPE"], "start": "2024-01-01", "end": "2024-01-05"}
+
+    with patch("app.data_validation.validators.resolve_symbol_ids", new_callable=AsyncMock) as mock_ids, \
+         patch("app.data_validation.validators.get_price_partitions", new_callable=AsyncMock) as mock_partitions:
+        mock_ids.return_value = {"AAPL": 1, "GOOG": 2}
+        mock_partitions.return_value = partitions
+
+        client = TestClient(app)
+        response = client.post("/market-data/validate/coverage", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+
+    # Jan 1 is a holiday: columns are Jan 2..5
+    assert data["trading_days"] == ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+    rows = {row["symbol"]: row for row in data["rows"]}
+    assert [row["symbol"] for row in data["rows"]] == ["AAPL", "GOOG", "NOPE"]
+
+    # Day j is bit j of the packed bytes
+    assert base64.b64decode(rows["AAPL"]["bits"]) == bytes([0b1011])
+    assert base64.b64decode(rows["GOOG"]["bits"]) == bytes([0b0100])
+    assert base64.b64decode(rows["NOPE"]["bits"]) == bytes([0])
+    assert rows["AAPL"]["coverage"] == 0.75
+    assert rows["NOPE"]["coverage"] == 0.0
+
+
+def _stream_results(*symbols):
+    async def results(*args, **kwargs):
+        for symbol in symbols:
+            yield ValidationResult(
+                symbol=symbol,
+                start=date(2024, 1, 1),
+                end=date(2024, 1, 5),
+                status=ValidationStatus.PARTIAL if symbol == "GOOG" else ValidationStatus.OK,
+                coverage=1.0,
+                expected_days=4,
+                observed_days=4,
+                first_date=date(2024, 1, 2),
+                last_date=date(2024, 1, 5),
+                missing_dates=[],
+                issues=[],
+                elapsed_ms=5
+            )
+    return results
+
+
+def test_validate_stream_ndjson_progress():
+    """
+    POST /market-data/validate/stream emits one NDJSON line per symbol, then a done line.
+    """
+    import json
+
+    payload = {"symbols": ["AAPL", "GOOG"], "start": "2024-01-01", "end": "2024-01-05"}
+    with patch("app.api.routes.data.validation.iter_validate_symbols", _stream_results("GOOG", "AAPL")):
+        client = TestClient(app)
+        response = client.post("/market-data/validate/stream", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line["type"] for line in lines] == ["result", "result", "done"]
+    assert [line["completed"] for line in lines] == [1, 2, 2]
+    assert all(line["total"] == 2 for line in lines)
+    assert lines[0]["result"]["symbol"] == "GOOG"
+    assert lines[0]["result"]["first_date"] == "2024-01-02"
+    assert lines[-1]["status_counts"] == {"ok": 1, "partial": 1, "fail": 0}
+
+
+def test_validate_stream_sse_and_error_event():
+    """
+    With Accept: text/event-stream the same events are sent as SSE; a failure ends with an error event.
+    """
+    async def failing(*args, **kwargs):
+        async for result in _stream_results("AAPL")():
+            yield result
+        raise RuntimeError("db went away")
+
+    payload = {"symbols": ["AAPL", "GOOG"], "start": "2024-01-01", "end": "2024-01-05"}
+    with patch("app.api.routes.data.validation.iter_validate_symbols", failing):
+        client = TestClient(app)
+        response = client.post(
+            "/market-data/validate/stream", json=payload, headers={"Accept": "text/event-stream"}
+        )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [e[0] for e in events] == ["event: result", "event: error"]
+    assert '"completed": 1' in events[1][1]
+    assert '"error": "db went away"' in events[1][1]
+
+
+def test_repair_request_is_validated():
+    """Out-of-range knobs and inverted windows are rejected before anything is fetched."""
+    client = TestClient(app)
+    base = {"symbols": [" aapl "], "start": "2024-01-01", "end": "2024-01-31"}
+
+    invalid = [
+        {"max_concurrent": 0},
+        {"max_attempts": 0},
+        {"coverage_threshold": 1.5},
+        {"end": "2023-12-31"},
+        {"symbols": [" "]},
+    ]
+    for override in invalid:
+        response = client.post("/market-data/validate/repair", json={**base, **override})
+        assert response.status_code == 422, override
+
+    assert RepairPricesRequest(**base).symbols == ["AAPL"]
@@ -0,0 +1,52 @@
+from datetime import date
+
+from app.core.dates import expand_trading_day_runs, trading_day_ordinals, trading_day_runs, unique_ordinals
+
+
+def test_trading_day_runs_bridge_weekends_and_holidays():
+    dates = [
+        date(2024, 1, 12),  # Fri
+        date(2024, 1, 16),  # Tue, after the weekend and MLK day
+        date(2024, 1, 12),  # duplicate
+        date(2024, 1, 18),  # Thu: Jan 17 missing breaks the run
+    ]
+
+    runs = trading_day_runs(unique_ordinals(dates))
+
+    assert runs == [(date(2024, 1, 12), date(2024, 1, 16)), (date(2024, 1, 18), date(2024, 1, 18))]
+    assert expand_trading_day_runs(runs) == [date(2024, 1, 12), date(2024, 1, 16), date(2024, 1, 18)]
+
+
+def test_a_decade_of_trading_days_is_one_run():
+    ordinals = trading_day_ordinals(date(2010, 1, 1), date(2019, 12, 31))
+
+    runs = trading_day_runs(ordinals)
+
+    assert runs == [(date(2010, 1, 4), date(2019, 12, 31))]
+    assert [d.toordinal() for d in expand_trading_day_runs(runs)] == ordinals.tolist()
+
+
+def test_empty_inputs():
+    assert trading_day_runs(unique_ordinals([])) == []
+    assert expand_trading_day_runs([]) == []
+
+
+def test_non_trading_dates_round_trip_as_their_own_runs():
+    """A flagged Saturday or holiday is kept, not folded into the next trading day."""
+    dates = [
+        date(2024, 1, 12),  # Fri
+        date(2024, 1, 13),  # Sat
+        date(2024, 1, 15),  # MLK day
+        date(2024, 1, 16),  # Tue
+        date(2024, 1, 17),  # Wed
+    ]
+
+    runs = trading_day_runs(unique_ordinals(dates))
+
+    assert runs == [
+        (date(2024, 1, 12), date(2024, 1, 12)),
+        (date(2024, 1, 13), date(2024, 1, 13)),
+        (date(2024, 1, 15), date(2024, 1, 15)),
+        (date(2024, 1, 16), date(2024, 1, 17)),
+    ]
+    assert expand_trading_day_runs(runs) == dates
@@ -0,0 +1,68 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app.core.logging import (
+    RateLimitedLogger,
+    configure_logging,
+    correlation_scope,
+    get_logger,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def json_stream():
+    stream = io.StringIO()
+    configure_logging(fmt="json", level="INFO", stream=stream)
+    yield stream
+    shutdown_logging()
+    logging.getLogger("app").propagate = True
+
+
+def _lines(stream):
+    # Stopping the listener drains the queue before we read
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_written_by_listener_with_correlation_id(json_stream):
+    logger = get_logger("app.tests.logging")
+    with correlation_scope("req-123"):
+        logger.info("hello %s", "world")
+    logger.info("outside")
+
+    lines = _lines(json_stream)
+    assert lines[0]["message"] == "hello world"
+    assert lines[0]["correlation_id"] == "req-123"
+    assert lines[0]["logger"] == "app.tests.logging"
+    assert lines[1]["correlation_id"] == "-"
+
+
+def test_exception_traceback_survives_the_queue(json_stream):
+    logger = get_logger("app.tests.logging")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    (line,) = _lines(json_stream)
+    assert line["message"] == "failed"
+    assert "ValueError: boom" in line["exc"]
+
+
+def test_rate_limited_logger_counts_suppressed(monkeypatch, json_stream):
+    now = [100.0]
+    monkeypatch.setattr("app.core.logging.time.monotonic", lambda: now[0])
+    limited = RateLimitedLogger(get_logger("app.tests.logging"), interval=1.0)
+
+    assert limited.info("tick %d", 1)
+    assert not limited.info("tick %d", 2)
+    assert not limited.info("tick %d", 3)
+    now[0] += 1.5
+    assert limited.info("tick %d", 4)
+
+    messages = [line["message"] for line in _lines(json_stream)]
+    assert messages == ["tick 1", "tick 4 (+2 similar suppressed)"]
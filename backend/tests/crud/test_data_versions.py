@@ -0,0 +1,47 @@
+import pytest
+from datetime import datetime, timezone
+
+from app.db.crud import data_versions
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """dbo.price_partitions with two partitions (3 rows, versions 2 + 5) for AAPL (symbol_id 1)."""
+    queries = []
+
+    async def fake_ids(symbols):
+        return {s: 1 for s in symbols if s.upper() == "AAPL"}
+
+    async def fake_fetch(name, ids, build):
+        queries.append(list(ids))
+        return [(1, 3, 7, datetime(2024, 1, 5, 21, 0, 0, 123456))] if 1 in ids else []
+
+    monkeypatch.setattr(data_versions, "resolve_symbol_ids", fake_ids)
+    monkeypatch.setattr(data_versions, "fetchall_chunked", fake_fetch)
+    return queries
+
+
+@pytest.mark.asyncio
+async def test_versions_shared_across_symbol_spellings(fake_db):
+    versions = await data_versions.get_data_versions(["aapl", "AAPL"])
+
+    assert versions["aapl"] == versions["AAPL"]
+    assert versions["aapl"].row_count == 3
+    assert versions["aapl"].generation == 7
+    assert versions["aapl"].last_modified == datetime(2024, 1, 5, 21, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_versions_read_from_db_on_every_call(fake_db):
+    """Nothing is cached in-process, so writes from other workers show up on the next request."""
+    await data_versions.get_data_versions(["AAPL"])
+    await data_versions.get_data_versions(["AAPL"])
+
+    assert fake_db == [[1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbol_has_empty_version(fake_db):
+    version = (await data_versions.get_data_versions(["NOPE"]))["NOPE"]
+
+    assert (version.row_count, version.generation) == (0, 0)
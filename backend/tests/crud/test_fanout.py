@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+
+import app.db.async_pool as async_pool
+from app.db.crud.fanout import fetchall_chunked, in_chunks, stream_chunked
+
+
+class FakeCursor:
+    def __init__(self, pool):
+        self.pool = pool
+        self.rows = []
+
+    async def __aenter__(self): return self
+    async def __aexit__(self, *exc): return None
+
+    async def execute(self, sql, params):
+        assert len(params) <= 3
+        self.pool.active += 1
+        self.pool.peak = max(self.pool.peak, self.pool.active)
+        # Later chunks answer first, so ordering must come from the merge
+        await asyncio.sleep(0.01 * (10 - params[0]))
+        self.pool.active -= 1
+        self.rows = [(p, i) for p in params for i in range(2)]
+
+    async def fetchall(self):
+        return self.rows
+
+    async def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConn:
+    def __init__(self, pool): self.pool = pool
+    def cursor(self): return FakeCursor(self.pool)
+
+
+class FakePool:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+        return FakeConn(self)
+
+    async def release(self, conn):
+        self.acquired -= 1
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(async_pool, "_pool", pool)
+    return pool
+
+
+def _build(chunk):
+    return "SELECT ...", list(chunk)
+
+
+def test_in_chunks_preserves_order():
+    assert in_chunks(range(7), 3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert in_chunks([], 3) == []
+
+
+@pytest.mark.asyncio
+async def test_fetchall_chunked_merges_in_chunk_order(fake_pool):
+    rows = await fetchall_chunked("test", list(range(8)), _build, chunk_size=3, concurrency=2)
+
+    assert rows == [(p, i) for p in range(8) for i in range(2)]
+    assert fake_pool.peak == 2
+    assert fake_pool.acquired == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_chunked_yields_one_ordered_stream(fake_pool):
+    batches = [
+        batch
+        async for batch in stream_chunked("test", list(range(8)), _build, batch_size=4, chunk_size=3, concurrency=3)
+    ]
+
+    assert [row for batch in batches for row in batch] == [(p, i) for p in range(8) for i in range(2)]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert fake_pool.peak > 1
+    assert fake_pool.acquired == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_chunked_releases_connections_on_early_exit(fake_pool):
+    stream = stream_chunked("test", list(range(8)), _build, batch_size=1, chunk_size=3, concurrency=3)
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first == [(0, 0)]
+    assert fake_pool.acquired == 0
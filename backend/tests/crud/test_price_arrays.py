@@ -0,0 +1,49 @@
+import numpy as np
+from datetime import date, timedelta
+
+from app.db.crud.price_arrays import PriceArrays, PriceArraysBuilder
+
+
+def _rows(symbol, start, days):
+    return [
+        (symbol, start + timedelta(days=i), 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 1000 + i)
+        for i in range(days)
+    ]
+
+
+def test_builder_matches_from_rows_across_batches():
+    rows = _rows("AAPL", date(2024, 1, 1), 50)
+    builder = PriceArraysBuilder("AAPL", capacity=50)
+    for lo in range(0, 50, 20):
+        _, dates, o, h, l, c, v = zip(*rows[lo:lo + 20])
+        builder.extend(dates, o, h, l, c, v)
+
+    built = builder.build()
+    expected = PriceArrays.from_rows("AAPL", rows)
+    for name in ("days", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(getattr(built, name), getattr(expected, name))
+    assert built.days.dtype == np.int32
+    assert built.volume.dtype == np.int64
+
+
+def test_builder_grows_past_a_stale_capacity_hint():
+    rows = _rows("AAPL", date(2024, 1, 1), 100)
+    builder = PriceArraysBuilder("AAPL", capacity=3)
+    _, dates, o, h, l, c, v = zip(*rows)
+    builder.extend(dates, o, h, l, c, v)
+
+    built = builder.build()
+    assert len(built) == 100
+    assert built.close[-1] == 100.5 + 99
+    assert date.fromordinal(int(built.days[-1])) == date(2024, 1, 1) + timedelta(days=99)
+
+
+def test_builder_trims_oversized_buffers():
+    builder = PriceArraysBuilder("AAPL", capacity=10_000)
+    _, dates, o, h, l, c, v = zip(*_rows("AAPL", date(2024, 1, 1), 5))
+    builder.extend(dates, o, h, l, c, v)
+
+    built = builder.build()
+    assert len(built) == 5
+    assert built.nbytes == 5 * (4 + 8 * 4 + 8)
+    assert built.days.base is None
@@ -0,0 +1,228 @@
+import importlib
+import numpy as np
+import pytest
+from datetime import date, datetime, timedelta
+
+from app.schemas.prices.price_row import PriceDataRow
+from app.db.crud.data_versions import DataVersion
+from app.db.crud.price_arrays import PriceArrays
+from app.db.crud import symbols as symbols_module
+from app.db.crud.price_cache import PriceSliceCache
+
+# The package re-exports the get_prices function under the module's name
+get_prices_module = importlib.import_module("app.db.crud.get_prices")
+
+
+@pytest.fixture
+def stored_generation(monkeypatch):
+    """Stub get_data_versions; set generation["value"] to simulate a write elsewhere."""
+    generation = {"value": 0}
+
+    async def versions(symbols):
+        return {s: DataVersion(0, generation["value"], datetime(2024, 1, 1)) for s in symbols}
+
+    monkeypatch.setattr(get_prices_module, "get_data_versions", versions)
+    return generation
+
+
+def _arrays(symbol, start, days):
+    rows = [
+        (symbol, start + timedelta(days=i), 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 1000 + i)
+        for i in range(days)
+    ]
+    return PriceArrays.from_rows(symbol, rows)
+
+
+def test_exact_hit_and_miss_counters():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    start, end = date(2024, 1, 1), date(2024, 1, 10)
+
+    assert cache.get("AAPL", start, end) is None
+    cache.put("AAPL", start, end, _arrays("AAPL", start, 10))
+
+    assert len(cache.get("AAPL", start, end)) == 10
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_subrange_served_from_superset():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    start = date(2024, 1, 1)
+    cache.put("AAPL", start, date(2024, 1, 10), _arrays("AAPL", start, 10))
+
+    sliced = cache.get("aapl", date(2024, 1, 3), date(2024, 1, 5))
+
+    assert [date.fromordinal(d) for d in sliced.days.tolist()] == [
+        date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 5)
+    ]
+    np.testing.assert_array_equal(sliced.close, [102.5, 103.5, 104.5])
+    # Range extending past the cached one is a miss
+    assert cache.get("AAPL", date(2024, 1, 3), date(2024, 1, 20)) is None
+
+
+def test_unbounded_entry_covers_everything():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    start = date(2024, 1, 1)
+    cache.put("AAPL", None, None, _arrays("AAPL", start, 10))
+
+    assert len(cache.get("AAPL", None, date(2024, 1, 2))) == 2
+    assert len(cache.get("AAPL", date(2024, 1, 9), None)) == 2
+
+
+def test_lru_eviction_by_bytes():
+    one = _arrays("A", date(2024, 1, 1), 10)
+    cache = PriceSliceCache(max_bytes=one.nbytes * 4)
+
+    for i, symbol in enumerate(["A", "B", "C", "D"]):
+        cache.put(symbol, None, None, _arrays(symbol, date(2024, 1, 1), 10))
+    cache.get("A", None, None)  # refresh A
+    cache.put("E", None, None, _arrays("E", date(2024, 1, 1), 10))
+
+    assert cache.get("B", None, None) is None
+    assert cache.get("A", None, None) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_only_overlapping_ranges():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    jan = (date(2024, 1, 1), date(2024, 1, 31))
+    mar = (date(2024, 3, 1), date(2024, 3, 31))
+    cache.put("AAPL", *jan, _arrays("AAPL", jan[0], 5))
+    cache.put("AAPL", *mar, _arrays("AAPL", mar[0], 5))
+    cache.put("MSFT", *mar, _arrays("MSFT", mar[0], 5))
+
+    cache.invalidate("AAPL", date(2024, 3, 15), date(2024, 3, 15))
+
+    assert cache.get("AAPL", *jan) is not None
+    assert cache.get("AAPL", *mar) is None
+    assert cache.get("MSFT", *mar) is not None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_put_skipped_after_invalidation_since_generation():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    generation = cache.generation("AAPL")
+
+    cache.invalidate("aapl", date(2024, 1, 2), date(2024, 1, 2))
+    cache.put("AAPL", None, None, _arrays("AAPL", date(2024, 1, 1), 3), generation)
+    assert cache.get("AAPL", None, None) is None
+
+    cache.put("AAPL", None, None, _arrays("AAPL", date(2024, 1, 1), 3), cache.generation("AAPL"))
+    assert cache.get("AAPL", None, None) is not None
+
+
+def test_clear_changes_every_generation():
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    generation = cache.generation("MSFT")
+
+    cache.clear()
+
+    assert cache.generation("MSFT") != generation
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_write_is_not_cached(monkeypatch, stored_generation):
+    """A slice read before a write committed must not be cached after the write invalidated."""
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    stale = _arrays("AAPL", date(2024, 1, 1), 3)
+
+    async def read_while_writing(symbols, start, end, versions=None):
+        # The write commits and invalidates while this read is in flight
+        cache.invalidate("AAPL", date(2024, 1, 2), date(2024, 1, 2))
+        return {"AAPL": stale}
+
+    monkeypatch.setattr(get_prices_module, "price_cache", cache)
+    monkeypatch.setattr(get_prices_module, "_fetch_price_arrays", read_while_writing)
+
+    result = await get_prices_module.get_prices_arrays(["AAPL"], None, None)
+
+    assert result["AAPL"] is stale
+    assert cache.get("AAPL", None, None) is None
+
+
+@pytest.mark.asyncio
+async def test_get_prices_streams_cursor_rows_on_a_miss(monkeypatch, stored_generation):
+    """A cache miss streams rows batch by batch instead of decoding arrays first."""
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    cache.put("AAPL", None, None, _arrays("AAPL", date(2024, 1, 1), 3))
+    day = datetime(2024, 1, 1)
+
+    async def batches(symbols, start, end):
+        yield [("AAPL", day, 1.0, 2.0, 0.5, 1.5, 10)]
+        yield [("MSFT", day, 3.0, 4.0, 2.5, 3.5, 20)]
+
+    async def no_arrays(*args):
+        raise AssertionError("a miss must not build PriceArrays")
+
+    monkeypatch.setattr(get_prices_module, "price_cache", cache)
+    monkeypatch.setattr(get_prices_module, "iter_price_batches", batches)
+    monkeypatch.setattr(get_prices_module, "_fetch_price_arrays", no_arrays)
+
+    rows = [r async for r in get_prices_module.get_prices(["AAPL", "MSFT"], None, None)]
+
+    assert [(r.symbol, r.close) for r in rows] == [("AAPL", 1.5), ("MSFT", 3.5)]
+    assert cache.get("MSFT", None, None) is None
+
+
+@pytest.mark.asyncio
+async def test_get_prices_serves_cached_slices_as_rows(monkeypatch, stored_generation):
+    """Cached slices come back in symbol_id order, like rows streamed from the DB."""
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    cache.put("AAPL", None, None, _arrays("AAPL", date(2024, 1, 1), 3))
+    cache.put("MSFT", None, None, _arrays("MSFT", date(2024, 1, 1), 3))
+    # MSFT was added first, so it sorts before AAPL
+    symbols_module._remember(1, "MSFT")
+    symbols_module._remember(2, "AAPL")
+
+    async def no_batches(*args):
+        raise AssertionError("a full cache hit must not read the DB")
+        yield
+
+    monkeypatch.setattr(get_prices_module, "price_cache", cache)
+    monkeypatch.setattr(get_prices_module, "iter_price_batches", no_batches)
+
+    try:
+        rows = [r async for r in get_prices_module.get_prices(["aapl", "MSFT"], date(2024, 1, 3), None)]
+    finally:
+        symbols_module.clear_symbol_cache()
+
+    assert [(r.symbol, r.date) for r in rows] == [("MSFT", datetime(2024, 1, 3)), ("aapl", datetime(2024, 1, 3))]
+
+
+@pytest.mark.asyncio
+async def test_write_from_another_process_drops_cached_slices(monkeypatch, stored_generation):
+    """A stored data generation this process never saw bumped invalidates its cached slices."""
+    cache = PriceSliceCache(max_bytes=1 << 20)
+    reads = []
+
+    async def fetch(symbols, start, end, versions=None):
+        reads.append(versions[symbols[0]].generation)
+        return {"AAPL": _arrays("AAPL", date(2024, 1, 1), 3)}
+
+    monkeypatch.setattr(get_prices_module, "price_cache", cache)
+    monkeypatch.setattr(get_prices_module, "_fetch_price_arrays", fetch)
+
+    await get_prices_module.get_prices_arrays(["AAPL"], None, None)
+    await get_prices_module.get_prices_arrays(["AAPL"], None, None)
+    stored_generation["value"] = 1
+    await get_prices_module.get_prices_arrays(["AAPL"], None, None)
+
+    assert reads == [0, 1]
+
+
+def test_disabled_cache_never_stores():
+    cache = PriceSliceCache(max_bytes=0)
+    cache.put("AAPL", None, None, _arrays("AAPL", date(2024, 1, 1), 3))
+
+    assert cache.get("AAPL", None, None) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_price_arrays_round_trip_to_rows():
+    arrays = _arrays("AAPL", date(2024, 1, 1), 2)
+
+    rows = list(arrays.to_rows())
+
+    assert all(isinstance(r, PriceDataRow) for r in rows)
+    assert [r.date for r in rows] == [datetime(2024, 1, 1), datetime(2024, 1, 2)]
+    assert rows[1].volume == 1001
@@ -0,0 +1,25 @@
+import numpy as np
+from datetime import date
+
+from app.db.crud.price_partitions import expand_day_masks, next_month
+
+
+def test_next_month_rolls_over_the_year():
+    assert next_month(date(2024, 1, 31)) == date(2024, 2, 1)
+    assert next_month(date(2024, 12, 15)) == date(2025, 1, 1)
+
+
+def test_expand_day_masks_unpacks_days_in_order():
+    jan, feb = date(2024, 1, 1).toordinal(), date(2024, 2, 1).toordinal()
+    # Jan 2 and Jan 31 (highest bit), Feb 1
+    masks = [(1 << 1) | (1 << 30), 1]
+
+    partition, ordinals = expand_day_masks(np.array([jan, feb]), np.array(masks))
+
+    np.testing.assert_array_equal(partition, [0, 0, 1])
+    assert [date.fromordinal(int(o)) for o in ordinals] == [date(2024, 1, 2), date(2024, 1, 31), date(2024, 2, 1)]
+
+
+def test_expand_day_masks_empty():
+    partition, ordinals = expand_day_masks(np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+    assert len(partition) == 0 and len(ordinals) == 0
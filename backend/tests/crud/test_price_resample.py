@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date, datetime
+
+from app.core.dates import trading_days
+from app.db.crud import price_resample
+from app.db.crud import symbols as symbols_module
+from app.db.crud.data_versions import DataVersion
+from app.db.crud.price_arrays import PriceArrays
+from app.db.crud.price_resample import (
+    ResampledBarCache,
+    get_resampled_arrays,
+    period_bounds,
+    period_keys,
+    resample_arrays,
+)
+
+
+@pytest.fixture(autouse=True)
+def stored_versions(monkeypatch):
+    async def versions(symbols):
+        return {s: DataVersion(0, 0, datetime(2023, 1, 1)) for s in symbols}
+
+    monkeypatch.setattr(price_resample, "get_data_versions", versions)
+
+
+def _daily(symbol, start, end):
+    days = trading_days(start, end)
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, len(days)))
+    rows = [
+        (symbol, d.date(), c - 0.5, c + 1.0 + i % 3, c - 1.0 - i % 2, c, 1000 + i)
+        for i, (d, c) in enumerate(zip(days, close))
+    ]
+    return PriceArrays.from_rows(symbol, rows)
+
+
+def _pandas_resample(arrays, rule):
+    df = pd.DataFrame(
+        {
+            "open": arrays.open,
+            "high": arrays.high,
+            "low": arrays.low,
+            "close": arrays.close,
+            "volume": arrays.volume,
+        },
+        index=pd.to_datetime([date.fromordinal(d) for d in arrays.days.tolist()]),
+    )
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    return df.resample(rule).agg(agg).dropna()
+
+
+@pytest.mark.parametrize("interval,rule", [("1w", "W-SUN"), ("1mo", "MS")])
+def test_resample_matches_pandas(interval, rule):
+    arrays = _daily("AAPL", "2023-01-01", "2023-12-31")
+    bars = resample_arrays(arrays, interval)
+    expected = _pandas_resample(arrays, rule)
+
+    assert len(bars) == len(expected)
+    np.testing.assert_allclose(bars.open, expected["open"])
+    np.testing.assert_allclose(bars.high, expected["high"])
+    np.testing.assert_allclose(bars.low, expected["low"])
+    np.testing.assert_allclose(bars.close, expected["close"])
+    np.testing.assert_array_equal(bars.volume, expected["volume"].astype(np.int64))
+
+
+def test_n_day_bars_follow_trading_calendar():
+    arrays = _daily("AAPL", "2024-06-01", "2024-07-31")
+    bars = resample_arrays(arrays, "5d")
+
+    # Every full bar spans exactly five trading days, holidays included
+    keys = period_keys(arrays.days, "5d")
+    _, counts = np.unique(keys, return_counts=True)
+    assert set(counts[1:-1]) == {5}
+    assert len(bars) == len(counts)
+
+    # Anchored globally: a later start does not shift the bar boundaries
+    later = resample_arrays(arrays.slice(date(2024, 7, 1), None), "5d")
+    assert set(later.days.tolist()[1:]) <= set(bars.days.tolist())
+
+
+def test_period_bounds_contain_their_dates():
+    days = np.array([date(2024, 2, 29).toordinal(), date(2024, 7, 5).toordinal()])
+    for interval in ("1w", "1mo", "3d"):
+        first, last = period_bounds(period_keys(days, interval), interval)
+        assert np.all(first <= days) and np.all(days <= last)
+
+
+def test_cache_merges_adjacent_runs_and_invalidates():
+    cache = ResampledBarCache(max_bytes=1 << 20)
+    bars = resample_arrays(_daily("AAPL", "2023-01-01", "2023-12-31"), "1mo")
+    keys = period_keys(bars.days, "1mo")
+
+    cache.put("AAPL", "1mo", int(keys[0]), int(keys[5]), bars.slice(None, date(2023, 6, 30)))
+    cache.put("AAPL", "1mo", int(keys[6]), int(keys[-1]), bars.slice(date(2023, 7, 1), None))
+
+    hit = cache.get("aapl", "1mo", int(keys[2]), int(keys[8]))
+    assert len(hit) == 7
+    assert cache.get("AAPL", "1w", int(keys[0]), int(keys[1])) is None
+
+    cache.invalidate("AAPL", date(2023, 3, 15), date(2023, 3, 15))
+    assert cache.get("AAPL", "1mo", int(keys[0]), int(keys[1])) is None
+
+
+@pytest.mark.asyncio
+async def test_completed_periods_served_from_cache(monkeypatch):
+    daily = _daily("AAPL", "2023-01-01", "2023-03-31")
+    calls = []
+
+    async def fake_get_prices_arrays(symbols, start, end):
+        calls.append((start, end))
+        return {s: daily.slice(start, end) for s in symbols}
+
+    monkeypatch.setattr(price_resample, "get_prices_arrays", fake_get_prices_arrays)
+    monkeypatch.setattr(price_resample, "resample_cache", ResampledBarCache(max_bytes=1 << 20))
+    today = date(2023, 3, 20)
+
+    first = await get_resampled_arrays(["AAPL"], date(2023, 1, 10), date(2023, 3, 31), "1mo", today=today)
+    second = await get_resampled_arrays(["AAPL"], date(2023, 1, 10), date(2023, 3, 31), "1mo", today=today)
+
+    # Widened to whole months; the second call only re-reads the open month
+    assert calls == [(date(2023, 1, 1), date(2023, 3, 31)), (date(2023, 3, 1), date(2023, 3, 31))]
+    np.testing.assert_array_equal(first["AAPL"].close, second["AAPL"].close)
+    assert len(second["AAPL"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_bars_from_read_racing_a_write_are_not_cached(monkeypatch):
+    daily = _daily("AAPL", "2023-01-01", "2023-03-31")
+    cache = ResampledBarCache(max_bytes=1 << 20)
+
+    async def read_while_writing(symbols, start, end):
+        # An older bar is inserted and invalidated while this read is in flight
+        cache.invalidate("AAPL", date(2023, 1, 5), date(2023, 1, 5))
+        return {s: daily.slice(start, end) for s in symbols}
+
+    monkeypatch.setattr(price_resample, "get_prices_arrays", read_while_writing)
+    monkeypatch.setattr(price_resample, "resample_cache", cache)
+
+    result = await get_resampled_arrays(["AAPL"], date(2023, 1, 10), date(2023, 3, 31), "1mo", today=date(2023, 3, 20))
+
+    assert len(result["AAPL"]) == 3
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_resampled_batches_follow_symbol_id_order(monkeypatch):
+    """Bars list symbols in the same symbol_id order as rows streamed from the DB."""
+    bars = {s: resample_arrays(_daily(s, "2023-01-01", "2023-03-31"), "1mo") for s in ("AAPL", "MSFT")}
+
+    async def fake_resampled_arrays(symbols, start, end, interval):
+        return bars
+
+    monkeypatch.setattr(price_resample, "get_resampled_arrays", fake_resampled_arrays)
+    symbols_module._remember(1, "MSFT")
+    symbols_module._remember(2, "AAPL")
+    try:
+        batches = [
+            batch async for batch in price_resample.iter_resampled_batches(["AAPL", "MSFT"], None, None, "1mo")
+        ]
+    finally:
+        symbols_module.clear_symbol_cache()
+
+    assert [batch[0][0] for batch in batches] == ["MSFT", "AAPL"]
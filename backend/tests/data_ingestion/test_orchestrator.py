@@ -4,7 +4,14 @@ from datetime import date
 from unittest.mock import AsyncMock
 
 from app.core.dates import trading_days
-from app.data_ingestion.orchestrator import fetch_missing_prices, fetch_symbols_parallel, orchestrate_fetch_and_insert
+from app.data_ingestion.orchestrator import (
+    fetch_batches_parallel,
+    fetch_missing_prices,
+    fetch_symbols_parallel,
+    orchestrate_fetch_and_insert,
+    orchestrate_batched_upsert,
+    orchestrate_fetch_and_upsert,
+)
 from app.data_ingestion.models import FetchRequest, FetchResult
 
 
@@ -133,4 +140,95 @@ async def test_orchestrator_inserts_only_missing(monkeypatch, full_price_df):
     )
 
     assert inserted["AAPL"] == len(full_price_df)
-    assert mock_insert.call_count == 1
\ No newline at end of file
+    assert mock_insert.call_count == 1
+
+@pytest.mark.asyncio
+async def test_fetch_symbols_parallel_refetch_stored(monkeypatch):
+    start = date(2023, 1, 2)
+    end = date(2023, 1, 10)
+
+    mock_missing = AsyncMock()
+    mock_full = AsyncMock(return_value=[{"symbol": "A", "result": "R"}])
+    monkeypatch.setattr("app.data_ingestion.orchestrator.fetch_missing_prices", mock_missing)
+    monkeypatch.setattr("app.data_ingestion.orchestrator.fetch_range_resilient", mock_full)
+
+    results = await fetch_symbols_parallel(["A"], start, end, refetch_stored=True)
+
+    assert results == [[{"symbol": "A", "result": "R"}]]
+    assert mock_missing.call_count == 0
+    assert mock_full.call_args.kwargs["start"] == start
+    assert mock_full.call_args.kwargs["end"] == end
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_upsert_sends_stored_dates(monkeypatch, full_price_df):
+    start = date(2023, 1, 2)
+    end = date(2023, 1, 10)
+
+    mock_fetch_results = [
+        [
+            {
+                "symbol": "AAPL",
+                "result": FetchResult(
+                    request=FetchRequest("AAPL", start, end),
+                    data=full_price_df,
+                    empty=False,
+                    exception=None,
+                    elapsed_ms=5,
+                ),
+            }
+        ]
+    ]
+
+    mock_parallel = AsyncMock(return_value=mock_fetch_results)
+    monkeypatch.setattr("app.data_ingestion.orchestrator.fetch_symbols_parallel", mock_parallel)
+
+    mock_upsert = AsyncMock(return_value=({"AAPL": 0}, {"AAPL": 2}))
+    monkeypatch.setattr("app.data_ingestion.orchestrator.upsert_prices_chunked", mock_upsert)
+
+    inserted, revised, results = await orchestrate_fetch_and_upsert(["AAPL"], start, end)
+
+    # Every fetched bar is compared, including dates already stored
+    assert len(mock_upsert.call_args.args[0]) == len(full_price_df)
+    assert mock_parallel.call_args.kwargs["refetch_stored"] is True
+    assert revised == {"AAPL": 2}
+    assert results is mock_fetch_results
+
+
+@pytest.mark.asyncio
+async def test_fetch_batches_parallel_one_download_per_batch(monkeypatch):
+    mock_full = AsyncMock(return_value=[{"symbol": "A B", "result": "R"}])
+    monkeypatch.setattr("app.data_ingestion.orchestrator.fetch_range_resilient", mock_full)
+
+    batches = [(["A", "B"], date(2023, 1, 2), date(2023, 1, 4)), (["C"], date(2023, 1, 9), date(2023, 1, 10))]
+    results = await fetch_batches_parallel(batches)
+
+    assert len(results) == 2
+    assert [c.kwargs["symbol"] for c in mock_full.call_args_list] == ["A B", "C"]
+    assert mock_full.call_args_list[1].kwargs["start"] == date(2023, 1, 9)
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_batched_upsert_drops_padding_rows(monkeypatch, full_price_df):
+    start = date(2023, 1, 2)
+    end = date(2023, 1, 10)
+
+    # Two tickers in one download; MSFT has no bar on the first day
+    msft = full_price_df.rename(columns={"AAPL": "MSFT"}, level=0)
+    msft.iloc[0] = float("nan")
+    df = pd.concat([full_price_df, msft], axis=1)
+
+    mock_parallel = AsyncMock(return_value=[[{
+        "symbol": "AAPL MSFT",
+        "result": FetchResult(FetchRequest("AAPL MSFT", start, end), df, False, None, 5),
+    }]])
+    monkeypatch.setattr("app.data_ingestion.orchestrator.fetch_batches_parallel", mock_parallel)
+    mock_upsert = AsyncMock(return_value=({"AAPL": 0, "MSFT": 1}, {"AAPL": 0}))
+    monkeypatch.setattr("app.data_ingestion.orchestrator.upsert_prices_chunked", mock_upsert)
+
+    inserted, revised, _ = await orchestrate_batched_upsert([(["AAPL", "MSFT"], start, end)])
+
+    rows = mock_upsert.call_args.args[0]
+    assert sum(r.symbol == "AAPL" for r in rows) == len(full_price_df)
+    assert sum(r.symbol == "MSFT" for r in rows) == len(full_price_df) - 1
+    assert inserted == {"AAPL": 0, "MSFT": 1}
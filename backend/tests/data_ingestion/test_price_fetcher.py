@@ -3,7 +3,7 @@ import pytest
 from datetime import date
 from unittest.mock import patch
 
-from app.data_ingestion.fetchers.prices import fetch_prices
+from app.data_ingestion.fetchers.prices import _download_sync, fetch_prices
 from app.data_ingestion.models import FetchRequest, FetchResult
 
 
@@ -52,3 +52,19 @@ async def test_fetch_prices_exception(monkeypatch):
     assert result.data is None
     assert isinstance(result.exception, RuntimeError)
     assert str(result.exception) == "network failure"
+
+
+def test_download_includes_the_end_date(monkeypatch):
+    """yfinance treats end as exclusive; a one-day request must still cover its day."""
+    calls = {}
+
+    def fake_download(**kwargs):
+        calls.update(kwargs)
+        return pd.DataFrame()
+
+    monkeypatch.setattr("app.data_ingestion.fetchers.prices.yf.download", fake_download)
+
+    _download_sync(FetchRequest(symbol="AAPL", start=date(2024, 1, 5), end=date(2024, 1, 5)))
+
+    assert calls["start"] == date(2024, 1, 5)
+    assert calls["end"] == date(2024, 1, 6)
@@ -0,0 +1,91 @@
+from datetime import date
+
+import numpy as np
+
+from app.core.dates import trading_day_ordinals
+from app.data_validation.anomalies import (
+    STALE_CLOSE_RUN,
+    anomaly_issues,
+    detect_anomalies,
+    price_panel,
+)
+from app.db.crud.price_arrays import PriceArrays
+
+START, END = date(2024, 1, 1), date(2024, 2, 29)
+
+
+def _arrays(symbol, days, close, volume=None, high=None, low=None, open_=None):
+    close = np.asarray(close, dtype=np.float64)
+    return PriceArrays(
+        symbol=symbol,
+        days=np.asarray(days, dtype=np.int32),
+        open=close.copy() if open_ is None else np.asarray(open_, dtype=np.float64),
+        high=close * 1.01 if high is None else np.asarray(high, dtype=np.float64),
+        low=close * 0.99 if low is None else np.asarray(low, dtype=np.float64),
+        close=close,
+        volume=np.full(len(close), 1_000_000, dtype=np.int64) if volume is None else np.asarray(volume, dtype=np.int64),
+    )
+
+
+def _clean(symbol, days, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    return _arrays(symbol, days, close)
+
+
+def test_price_panel_aligns_rows_on_trading_days():
+    expected = trading_day_ordinals(START, END)
+    saturday = date(2024, 1, 6).toordinal()
+    days = [expected[0], saturday, expected[2]]
+    panel = price_panel([_arrays("AAA", days, [1.0, 2.0, 3.0]), PriceArrays.empty("BBB")], expected)
+
+    assert panel.close.shape == (2, len(expected))
+    assert panel.close[0, 0] == 1.0 and panel.close[0, 2] == 3.0
+    assert np.isnan(panel.close[0, 1])
+    assert np.isnan(panel.close[1]).all()
+
+
+def test_clean_series_has_no_anomalies():
+    expected = trading_day_ordinals(START, END)
+    panel = price_panel([_clean("AAA", expected, 1), _clean("BBB", expected, 2)], expected)
+
+    flags = detect_anomalies(panel)
+
+    assert all(not matrix.any() for matrix in flags.values())
+
+
+def test_each_anomaly_is_flagged_on_its_day():
+    expected = trading_day_ordinals(START, END)
+    spiky, stale, noisy, broken = (_clean(s, expected, i) for i, s in enumerate("ABCD"))
+
+    spiky.close[10] *= 2.0
+    stale.close[20:20 + STALE_CLOSE_RUN] = stale.close[20]
+    noisy.volume[5] = 50_000_000
+    broken.close[7] = broken.high[7] * 1.05
+
+    panel = price_panel([spiky, stale, noisy, broken], expected)
+    flags = detect_anomalies(panel)
+
+    def flagged(code, row):
+        return np.flatnonzero(flags[code][row]).tolist()
+
+    # The jump up and the return to trend the next day
+    assert flagged("RETURN_SPIKE", 0) == [10, 11]
+    assert flagged("STALE_CLOSE", 1) == list(range(21, 20 + STALE_CLOSE_RUN))
+    assert flagged("VOLUME_OUTLIER", 2) == [5]
+    assert flagged("OHLC_INCONSISTENT", 3) == [7]
+
+    issues = anomaly_issues(flags, 3, panel.days)
+    assert [(i.code, i.count, i.affected_dates) for i in issues] == [
+        ("OHLC_INCONSISTENT", 1, [date.fromordinal(int(expected[7]))])
+    ]
+
+
+def test_short_stale_run_is_not_flagged():
+    expected = trading_day_ordinals(START, END)
+    series = _clean("AAA", expected, 3)
+    series.close[20:20 + STALE_CLOSE_RUN - 1] = series.close[20]
+
+    flags = detect_anomalies(price_panel([series], expected))
+
+    assert not flags["STALE_CLOSE"].any()
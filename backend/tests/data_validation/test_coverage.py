@@ -0,0 +1,38 @@
+from datetime import date
+
+import numpy as np
+
+from app.core.dates import trading_day_ordinals
+from app.data_validation.coverage import coverage_of, missing_dates_of, presence_matrix
+
+
+def test_presence_matrix_marks_trading_days_per_symbol():
+    expected = trading_day_ordinals(date(2024, 1, 1), date(2024, 1, 10))
+    assert [date.fromordinal(int(o)) for o in expected[:2]] == [date(2024, 1, 2), date(2024, 1, 3)]
+
+    rows = [
+        (0, date(2024, 1, 2)),
+        (0, date(2024, 1, 3)),
+        (0, date(2024, 1, 6)),  # Saturday: no column, ignored
+        (1, date(2024, 1, 10)),
+    ]
+    present = presence_matrix(
+        expected,
+        np.array([r[0] for r in rows]),
+        np.array([r[1].toordinal() for r in rows]),
+        n_symbols=3,
+    )
+
+    assert present.shape == (3, 7)
+    assert present[0].sum() == 2
+    assert present[1].tolist() == [False] * 6 + [True]
+    assert not present[2].any()
+    np.testing.assert_allclose(coverage_of(present), [2 / 7, 1 / 7, 0.0])
+    assert missing_dates_of(present[1], expected)[0] == date(2024, 1, 2)
+
+
+def test_empty_range_has_zero_coverage():
+    expected = trading_day_ordinals(date(2024, 1, 6), date(2024, 1, 7))
+    present = presence_matrix(expected, np.array([0]), np.array([date(2024, 1, 6).toordinal()]), n_symbols=1)
+    assert present.shape == (1, 0)
+    assert coverage_of(present).tolist() == [0.0]
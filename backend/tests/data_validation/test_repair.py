@@ -0,0 +1,99 @@
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock
+
+from app.data_validation import repair
+from app.data_validation.models import ValidationIssue, ValidationResult, ValidationStatus
+
+START, END = date(2024, 1, 1), date(2024, 1, 31)
+
+
+def _result(symbol, missing=(), suspicious=(), coverage=0.5):
+    issues = []
+    if suspicious:
+        issues.append(ValidationIssue("SUSPICIOUS_PRICE", len(suspicious), list(suspicious), "suspicious"))
+    return ValidationResult(
+        symbol=symbol,
+        start=START,
+        end=END,
+        status=ValidationStatus.PARTIAL if missing or suspicious else ValidationStatus.OK,
+        coverage=coverage,
+        expected_days=21,
+        observed_days=21 - len(missing),
+        first_date=START,
+        last_date=END,
+        missing_dates=list(missing),
+        issues=issues,
+        elapsed_ms=1,
+    )
+
+
+def test_repair_ranges_merge_nearby_findings():
+    result = _result(
+        "AAPL",
+        missing=[date(2024, 1, 2), date(2024, 1, 3)],
+        # 3 trading days after the gap: merged; Jan 29 is too far
+        suspicious=[date(2024, 1, 9), date(2024, 1, 29)],
+    )
+
+    assert repair.repair_ranges(result) == [
+        (date(2024, 1, 2), date(2024, 1, 9)),
+        (date(2024, 1, 29), date(2024, 1, 29)),
+    ]
+    assert repair.repair_ranges(result, merge_gap=0) == [
+        (date(2024, 1, 2), date(2024, 1, 3)),
+        (date(2024, 1, 9), date(2024, 1, 9)),
+        (date(2024, 1, 29), date(2024, 1, 29)),
+    ]
+
+
+def test_plan_repair_groups_symbols_sharing_a_range():
+    gap = [date(2024, 1, 10), date(2024, 1, 11)]
+    results = [
+        _result("AAPL", missing=gap),
+        _result("MSFT", missing=gap),
+        _result("GOOG", missing=gap),
+        _result("IBM", suspicious=[date(2024, 1, 22)]),
+        _result("OK"),
+    ]
+
+    fetches = repair.plan_repair(results, batch_symbols=2)
+
+    assert [(f.symbols, f.start, f.end) for f in fetches] == [
+        (["AAPL", "MSFT"], date(2024, 1, 10), date(2024, 1, 11)),
+        (["GOOG"], date(2024, 1, 10), date(2024, 1, 11)),
+        (["IBM"], date(2024, 1, 22), date(2024, 1, 22)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_repair_reports_before_and_after(monkeypatch):
+    before = [_result("AAPL", missing=[date(2024, 1, 10)], suspicious=[date(2024, 1, 12)]), _result("OK", coverage=1.0)]
+    mock_upsert = AsyncMock(return_value=({"AAPL": 1}, {"AAPL": 1}, []))
+    mock_validate = AsyncMock(return_value=[_result("AAPL", coverage=1.0)])
+    monkeypatch.setattr(repair, "orchestrate_batched_upsert", mock_upsert)
+    monkeypatch.setattr(repair, "validate_symbols_batched", mock_validate)
+
+    report = await repair.orchestrate_repair(before)
+
+    assert mock_upsert.call_args.args[0] == [(["AAPL"], date(2024, 1, 10), date(2024, 1, 12))]
+    assert mock_validate.call_args.args == (["AAPL"], START, END)
+    (aapl,) = report.symbols
+    assert (aapl.coverage_before, aapl.coverage_after) == (0.5, 1.0)
+    assert (aapl.missing_before, aapl.missing_after) == (1, 0)
+    assert (aapl.flagged_before, aapl.flagged_after) == (1, 0)
+    assert (aapl.rows_inserted, aapl.rows_revised) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_repair_dry_run_does_not_revalidate(monkeypatch):
+    mock_upsert = AsyncMock(return_value=({}, {}, []))
+    mock_validate = AsyncMock()
+    monkeypatch.setattr(repair, "orchestrate_batched_upsert", mock_upsert)
+    monkeypatch.setattr(repair, "validate_symbols_batched", mock_validate)
+
+    report = await repair.orchestrate_repair([_result("AAPL", missing=[date(2024, 1, 10)])], dry_run=True)
+
+    assert mock_upsert.call_args.kwargs["dry_run"] is True
+    mock_validate.assert_not_awaited()
+    assert report.symbols[0].coverage_after == report.symbols[0].coverage_before
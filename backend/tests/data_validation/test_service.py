@@ -53,3 +53,64 @@ async def test_validate_symbols_concurrent():
 
         # Check that the results are of type ValidationResult
         assert all(isinstance(r, ValidationResult) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_iter_validate_symbols_yields_chunks_as_they_finish(monkeypatch):
+    """
+    Results stream in completion order, one batched call per chunk.
+    """
+    import asyncio
+
+    start, end = date(2024, 1, 1), date(2024, 1, 5)
+    delays = {"SLOW": 0.05, "FAST": 0.0}
+
+    async def fake_batched(chunk, s, e, anomalies=False):
+        await asyncio.sleep(max(delays.get(sym, 0.0) for sym in chunk))
+        return [
+            ValidationResult(sym, s, e, ValidationStatus.OK, 1.0, 5, 5, s, e, [], [], 1)
+            for sym in chunk
+        ]
+
+    mock_batched = AsyncMock(side_effect=fake_batched)
+    monkeypatch.setattr(service, "validate_symbols_batched", mock_batched)
+
+    symbols = ["SLOW", "A", "FAST", "B"]
+    streamed = [r.symbol async for r in service.iter_validate_symbols(symbols, start, end, chunk_size=2)]
+
+    assert streamed == ["FAST", "B", "SLOW", "A"]
+    assert [c.args[0] for c in mock_batched.call_args_list] == [["SLOW", "A"], ["FAST", "B"]]
+
+
+@pytest.mark.asyncio
+async def test_iter_validate_symbols_starts_chunks_as_slots_free(monkeypatch):
+    """
+    No more than max_concurrent chunks exist at once; stopping early cancels
+    the chunk in flight and waits for it to finish.
+    """
+    import asyncio
+
+    start, end = date(2024, 1, 1), date(2024, 1, 5)
+    started, cancelled = [], []
+
+    async def fake_batched(chunk, s, e, anomalies=False):
+        started.append(chunk[0])
+        try:
+            await asyncio.sleep(0 if chunk[0] == "A" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(chunk[0])
+            raise
+        return [ValidationResult(sym, s, e, ValidationStatus.OK, 1.0, 5, 5, s, e, [], [], 1) for sym in chunk]
+
+    monkeypatch.setattr(service, "validate_symbols_batched", fake_batched)
+
+    stream = service.iter_validate_symbols(["A", "B", "C", "D"], start, end, max_concurrent=1, chunk_size=1)
+    first = await stream.__anext__()
+    await asyncio.sleep(0)
+
+    assert first.symbol == "A"
+    assert started == ["A", "B"]
+
+    await stream.aclose()
+    assert cancelled == ["B"]
+    assert started == ["A", "B"]
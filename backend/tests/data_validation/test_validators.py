@@ -17,21 +17,29 @@ async def test_validate_symbol_all_ok(mock_validation_queries, symbol, date_rang
     assert result.start == date_range["start"]
     assert result.end == date_range["end"]
 
-    # There are missing trading days according to the mock get_existing_dates
-    assert "MISSING_DAYS" in [issue.code for issue in result.issues]
+    # The mock get_existing_dates covers every trading day (Jan 1 is a holiday)
+    assert "MISSING_DAYS" not in [issue.code for issue in result.issues]
+    assert result.missing_dates == []
+    assert result.coverage == 1.0
 
-    # Status should be PARTIAL because there are missing days
+    # Status should be PARTIAL because of the flagged rows
     assert result.status == ValidationStatus.PARTIAL
 
-    # Coverage should be between 0 and 1
-    assert 0.0 <= result.coverage <= 1.0
-
 
 @pytest.mark.asyncio
-async def test_validate_symbol_with_issues(mock_validation_queries, symbol, date_range):
+async def test_validate_symbol_with_issues(monkeypatch, mock_validation_queries, symbol, date_range):
     """
     Test validate_symbol with issues returned by the mocked queries.
     """
+    from unittest.mock import AsyncMock
+    from app.data_validation import queries
+
+    # Drop one trading day; driver values may also come back as ISO strings (SQLite)
+    monkeypatch.setattr(
+        queries,
+        "get_existing_dates",
+        AsyncMock(return_value=["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-09", "2024-01-10"]),
+    )
     result = await validators.validate_symbol(symbol, date_range["start"], date_range["end"])
 
     # Check that issues include MISSING_FIELDS and SUSPICIOUS_PRICE from conftest mocks
@@ -41,6 +49,8 @@ async def test_validate_symbol_with_issues(mock_validation_queries, symbol, date
 
     # Also, missing trading days should be detected
     assert "MISSING_DAYS" in issue_codes
+    assert result.missing_dates == [date(2024, 1, 8)]
+    assert result.coverage == 6 / 7
 
     # Status should be PARTIAL
     assert result.status == ValidationStatus.PARTIAL
@@ -51,3 +61,122 @@ async def test_validate_symbol_with_issues(mock_validation_queries, symbol, date
     assert result.first_date is not None
     assert result.last_date is not None
     assert isinstance(result.issues[0].affected_dates[0], date)
+
+
+def _mock_partitions(monkeypatch, symbol, existing, flags, cached):
+    """Jan 2024 partition of symbol_id 1 at version 3, built from the stored dates."""
+    from unittest.mock import AsyncMock
+    from app.data_validation import queries
+
+    day_mask = 0
+    for d in existing:
+        day_mask |= 1 << (d.day - 1)
+    january = date(2024, 1, 1).toordinal()
+    mocks = {
+        "partitions": AsyncMock(return_value=[(1, january, day_mask, 3)]),
+        "load": AsyncMock(return_value=cached),
+        "scan": AsyncMock(return_value=[(1, d, f) for d, f in sorted(flags.items())]),
+        "store": AsyncMock(),
+    }
+    monkeypatch.setattr(validators, "resolve_symbol_ids", AsyncMock(return_value={symbol: 1}))
+    monkeypatch.setattr(validators, "get_price_partitions", mocks["partitions"])
+    monkeypatch.setattr(queries, "load_partition_results", mocks["load"])
+    monkeypatch.setattr(queries, "scan_partition_rows", mocks["scan"])
+    monkeypatch.setattr(queries, "store_partition_results", mocks["store"])
+    return mocks
+
+
+@pytest.mark.asyncio
+async def test_batched_matches_per_symbol(monkeypatch, mock_validation_queries, symbol, date_range):
+    """
+    The incremental batch must produce the same findings as validate_symbol for the same stored rows.
+    """
+    from app.data_validation import queries
+
+    flags = {
+        date(2024, 1, 3): queries.FLAG_MISSING_FIELDS,
+        date(2024, 1, 5): queries.FLAG_MISSING_FIELDS,
+        date(2024, 1, 4): queries.FLAG_SUSPICIOUS,
+    }
+    existing = await queries.get_existing_dates(symbol, date_range["start"], date_range["end"])
+    mocks = _mock_partitions(monkeypatch, symbol, existing, flags, cached={})
+
+    single = await validators.validate_symbol(symbol, date_range["start"], date_range["end"])
+    batched, unknown = await validators.validate_symbols_batched(
+        [symbol, "NOPE"], date_range["start"], date_range["end"]
+    )
+
+    # The uncached partition is scanned once and its findings stored under its version
+    assert mocks["scan"].await_count == 1
+    assert mocks["scan"].await_args.args[0] == [(1, date(2024, 1, 1), date(2024, 2, 1))]
+    stored = mocks["store"].await_args.args[0]
+    assert stored == [(1, date(2024, 1, 1), 3, 0b10100, 0b1000)]
+
+    for field in ("status", "coverage", "expected_days", "observed_days", "first_date", "last_date", "missing_dates", "issues"):
+        assert getattr(batched, field) == getattr(single, field)
+
+    assert unknown.symbol == "NOPE"
+    assert unknown.observed_days == 0
+    assert unknown.first_date is None
+
+
+@pytest.mark.asyncio
+async def test_batched_reuses_current_partition_results(monkeypatch, mock_validation_queries, symbol, date_range):
+    """
+    A cached result computed against the partition's current version is used without rescanning;
+    a stale version or rules version triggers a rescan.
+    """
+    from app.data_validation import queries
+
+    existing = await queries.get_existing_dates(symbol, date_range["start"], date_range["end"])
+    january = date(2024, 1, 1).toordinal()
+    cached = {(1, january): (3, queries.VALIDATION_RULES_VERSION, 0b100, 0)}
+    mocks = _mock_partitions(monkeypatch, symbol, existing, {}, cached=cached)
+
+    (result,) = await validators.validate_symbols_batched([symbol], date_range["start"], date_range["end"])
+
+    mocks["scan"].assert_not_awaited()
+    mocks["store"].assert_not_awaited()
+    assert [(i.code, i.affected_dates) for i in result.issues] == [("MISSING_FIELDS", [date(2024, 1, 3)])]
+
+    cached[(1, january)] = (2, queries.VALIDATION_RULES_VERSION, 0b100, 0)
+    (result,) = await validators.validate_symbols_batched([symbol], date_range["start"], date_range["end"])
+
+    assert mocks["scan"].await_count == 1
+    assert result.issues == []
+
+
+@pytest.mark.asyncio
+async def test_batched_reports_anomalies(monkeypatch, mock_validation_queries, symbol, date_range):
+    """
+    anomalies=True appends the panel checks' issues to the symbol's result.
+    """
+    import numpy as np
+    from unittest.mock import AsyncMock
+    from app.data_validation import queries
+    from app.db.crud.price_arrays import PriceArrays
+
+    existing = await queries.get_existing_dates(symbol, date_range["start"], date_range["end"])
+    _mock_partitions(monkeypatch, symbol, existing, {}, cached={})
+    close = np.full(len(existing), 100.0)
+    close[3] = 101.0
+    arrays = PriceArrays(
+        symbol=symbol,
+        days=np.array([d.toordinal() for d in existing], dtype=np.int32),
+        open=close.copy(),
+        high=close + 1,
+        low=np.where(np.arange(len(existing)) == 3, 101.5, close - 1),
+        close=close,
+        volume=np.full(len(existing), 1000, dtype=np.int64),
+    )
+    monkeypatch.setattr(validators, "get_prices_arrays", AsyncMock(return_value={symbol: arrays}))
+
+    (plain,) = await validators.validate_symbols_batched([symbol], date_range["start"], date_range["end"])
+    (result,) = await validators.validate_symbols_batched(
+        [symbol], date_range["start"], date_range["end"], anomalies=True
+    )
+
+    assert plain.issues == []
+    assert plain.status == ValidationStatus.OK
+    assert [(i.code, i.affected_dates) for i in result.issues] == [("OHLC_INCONSISTENT", [existing[3]])]
+    assert result.status == ValidationStatus.PARTIAL
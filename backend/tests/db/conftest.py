@@ -33,8 +33,13 @@ async def clean_test_prices(db_connection, test_symbol_prefix):
     yield  
     
     async with db_connection.cursor() as cur:
+        # Symbol rows are left in dbo.symbols so cached ids stay valid
         await cur.execute(
-            "DELETE FROM dbo.prices WHERE symbol LIKE ?",
+            """
+            DELETE p FROM dbo.prices p
+            JOIN dbo.symbols s ON s.symbol_id = p.symbol_id
+            WHERE s.symbol LIKE ?
+            """,
             (f"{test_symbol_prefix}%",)
         )
         await db_connection.commit()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.prices.price_row import PriceDataRow
+from app.db.crud import bulk_insert_prices_chunked, get_data_versions
+
+
+def _rows(symbol, n, offset=0):
+    base_date = datetime(2026, 1, 1)
+    return [
+        PriceDataRow(
+            symbol=symbol,
+            date=base_date + timedelta(days=offset + i),
+            open=100 + i,
+            high=101 + i,
+            low=99 + i,
+            close=100 + i,
+            volume=1000 + i
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_data_version_loaded_from_db(test_symbol_prefix, clean_test_prices):
+    """Versions are read from dbo.price_partitions, kept current by the write path."""
+    symbol = f"{test_symbol_prefix}_LOAD"
+    await bulk_insert_prices_chunked(_rows(symbol, 3))
+
+    versions = await get_data_versions([symbol])
+    assert versions[symbol].row_count == 3
+
+
+@pytest.mark.asyncio
+async def test_data_version_bumped_by_insert(test_symbol_prefix, clean_test_prices):
+    """Inserts bump the stored version; duplicate-only inserts do not."""
+    symbol = f"{test_symbol_prefix}_BUMP"
+    await bulk_insert_prices_chunked(_rows(symbol, 3))
+    before = (await get_data_versions([symbol]))[symbol]
+    generation = before.generation
+
+    await bulk_insert_prices_chunked(_rows(symbol, 3))
+    assert (await get_data_versions([symbol]))[symbol].generation == generation
+
+    await bulk_insert_prices_chunked(_rows(symbol, 2, offset=3))
+    after = (await get_data_versions([symbol]))[symbol]
+    assert after.row_count == 5
+    assert after.generation > generation
+    assert after.last_modified >= before.last_modified
@@ -119,3 +119,33 @@ async def test_get_prices_lookback(clean_test_prices, test_symbol_prefix):
     # Should be the last 5 dates
     expected_dates = [base_date - timedelta(days=i) for i in reversed(range(5))]
     assert [r.date for r in fetched] == expected_dates
+
+
+@pytest.mark.asyncio
+async def test_get_prices_cache_invalidated_by_insert(clean_test_prices, test_symbol_prefix):
+    """A cached slice must not hide rows inserted afterwards."""
+    base_date = datetime(2026, 1, 1)
+    symbol = f"{test_symbol_prefix}_CACHE"
+
+    def make_rows(days):
+        return [
+            PriceDataRow(
+                symbol=symbol,
+                date=base_date + timedelta(days=i),
+                open=10 + i,
+                high=11 + i,
+                low=9 + i,
+                close=10 + i,
+                volume=100 + i
+            )
+            for i in days
+        ]
+
+    await bulk_insert_prices_chunked(make_rows(range(3)))
+    end = base_date + timedelta(days=4)
+    first = [r async for r in get_prices(symbols=[symbol], start=base_date, end=end)]
+    assert len(first) == 3
+
+    await bulk_insert_prices_chunked(make_rows(range(3, 5)))
+    second = [r async for r in get_prices(symbols=[symbol], start=base_date, end=end)]
+    assert len(second) == 5
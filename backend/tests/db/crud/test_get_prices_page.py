@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.prices.price_row import PriceDataRow
+from app.db.crud import bulk_insert_prices_chunked, get_prices_page
+
+
+@pytest.mark.asyncio
+async def test_get_prices_page_walks_all_rows(clean_test_prices, test_symbol_prefix):
+    """Following the keyset across pages returns every row once, in (symbol, date) order."""
+    base_date = datetime(2026, 1, 1)
+    symbols = [f"{test_symbol_prefix}_AAA", f"{test_symbol_prefix}_BBB"]
+
+    for sym in symbols:
+        rows = [
+            PriceDataRow(
+                symbol=sym,
+                date=base_date + timedelta(days=i),
+                open=50 + i,
+                high=51 + i,
+                low=49 + i,
+                close=50 + i,
+                volume=500 + i
+            )
+            for i in range(5)
+        ]
+        await bulk_insert_prices_chunked(rows)
+
+    start, end = base_date.date(), (base_date + timedelta(days=4)).date()
+    collected, after, pages = [], None, 0
+    while True:
+        rows, has_more = await get_prices_page(symbols, start, end, page_size=3, after=after)
+        collected.extend(rows)
+        pages += 1
+        if not has_more:
+            break
+        after = (rows[-1].symbol, rows[-1].date.date())
+
+    assert pages == 4
+    assert [(r.symbol, r.date) for r in collected] == [
+        (sym, base_date + timedelta(days=i)) for sym in symbols for i in range(5)
+    ]
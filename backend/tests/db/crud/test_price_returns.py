@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+
+from app.schemas.prices.price_row import PriceDataRow
+from app.db.crud.insert_prices import bulk_insert_prices_chunked
+from app.db.crud.price_returns import compute_returns, get_returns
+
+
+def test_compute_returns_matches_pandas():
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(7).normal(0, 0.01, 150)))
+    result = compute_returns(closes)
+
+    s = pd.Series(closes)
+    log = np.log(s / s.shift(1))
+    np.testing.assert_allclose(result["simple_return"], s.pct_change(), equal_nan=True)
+    np.testing.assert_allclose(result["log_return"], log, equal_nan=True)
+    np.testing.assert_allclose(result["vol_20"], log.rolling(20).std(), equal_nan=True)
+    np.testing.assert_allclose(result["vol_60"], log.rolling(60).std(), equal_nan=True)
+
+
+def test_compute_returns_short_series():
+    result = compute_returns(np.array([10.0]))
+    assert np.isnan(result["simple_return"][0])
+    assert np.isnan(result["vol_20"][0])
+
+
+def _rows(symbol, base_date, closes):
+    return [
+        PriceDataRow(
+            symbol=symbol,
+            date=base_date + timedelta(days=i),
+            open=c,
+            high=c,
+            low=c,
+            close=c,
+            volume=1000
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_returns_refreshed_on_insert(clean_test_prices, test_symbol_prefix):
+    """Appending rows fills their returns and extends the volatility windows."""
+    base_date = datetime(2026, 1, 1)
+    symbol = f"{test_symbol_prefix}_RET"
+    closes = list(100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 80))))
+
+    await bulk_insert_prices_chunked(_rows(symbol, base_date, closes[:50]))
+    await bulk_insert_prices_chunked(_rows(symbol, base_date, closes)[50:])
+
+    fetched = [r async for r in get_returns([symbol], base_date, base_date + timedelta(days=79))]
+    expected = compute_returns(np.array(closes))
+
+    assert len(fetched) == 80
+    assert fetched[0].simple_return is None
+    assert fetched[50].simple_return == pytest.approx(expected["simple_return"][50])
+    assert fetched[79].vol_60 == pytest.approx(expected["vol_60"][79])
+    assert fetched[58].vol_60 is None
@@ -0,0 +1,24 @@
+import pytest
+from app.db.crud import resolve_symbol_ids, symbol_for_id
+
+
+@pytest.mark.asyncio
+async def test_resolve_unknown_symbol_without_create(test_db_pool, test_symbol_prefix):
+    """Unknown symbols are absent unless create=True."""
+    symbol = f"{test_symbol_prefix}_NEW"
+    assert await resolve_symbol_ids([symbol]) == {}
+
+
+@pytest.mark.asyncio
+async def test_resolve_creates_and_caches(test_db_pool, test_symbol_prefix):
+    """create=True registers symbols once; later lookups return the same ids."""
+    symbols = [f"{test_symbol_prefix}_A", f"{test_symbol_prefix}_B"]
+
+    created = await resolve_symbol_ids(symbols, create=True)
+    assert set(created) == set(symbols)
+    assert len(set(created.values())) == 2
+
+    again = await resolve_symbol_ids(symbols + [symbols[0].lower()], create=True)
+    assert again[symbols[0]] == created[symbols[0]]
+    assert again[symbols[0].lower()] == created[symbols[0]]
+    assert symbol_for_id(created[symbols[1]]) == symbols[1]
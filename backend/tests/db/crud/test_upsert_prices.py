@@ -0,0 +1,68 @@
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.prices.price_row import PriceDataRow
+from app.db.crud import bulk_insert_prices_chunked, get_prices, upsert_prices_chunked
+
+
+def _rows(symbol, closes):
+    base_date = datetime(2026, 1, 1)
+    return [
+        PriceDataRow(
+            symbol=symbol,
+            date=base_date + timedelta(days=i),
+            open=c,
+            high=c + 1,
+            low=c - 1,
+            close=c,
+            volume=1000
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upsert_revises_only_changed_rows(clean_test_prices, test_symbol_prefix):
+    symbol = f"{test_symbol_prefix}_REV"
+    await bulk_insert_prices_chunked(_rows(symbol, [10.0, 11.0, 12.0]))
+
+    # Day 1 revised, day 2 float noise only, day 3 new
+    inserted, revised = await upsert_prices_chunked(
+        _rows(symbol, [10.0, 11.5, 12.0 + 1e-9, 13.0])
+    )
+
+    assert inserted[symbol] == 1
+    assert revised[symbol] == 1
+
+    stored = [r async for r in get_prices([symbol], datetime(2026, 1, 1), datetime(2026, 1, 4))]
+    assert [r.close for r in stored] == [10.0, 11.5, 12.0, 13.0]
+
+
+@pytest.mark.asyncio
+async def test_upsert_unchanged_is_noop(clean_test_prices, test_symbol_prefix):
+    symbol = f"{test_symbol_prefix}_SAME"
+    rows = _rows(symbol, [10.0, 11.0])
+    await bulk_insert_prices_chunked(rows)
+
+    inserted, revised = await upsert_prices_chunked(rows)
+
+    assert inserted[symbol] == 0
+    assert revised[symbol] == 0
+
+
+@pytest.mark.asyncio
+async def test_upsert_detects_a_change_in_any_single_column(clean_test_prices, test_symbol_prefix):
+    symbol = f"{test_symbol_prefix}_COL"
+    rows = _rows(symbol, [10.0] * 5)
+    await bulk_insert_prices_chunked(rows)
+
+    revisions = [r.model_copy() for r in rows]
+    revisions[0].open = 10.25
+    revisions[1].high = 11.25
+    revisions[2].low = 8.75
+    revisions[3].close = 10.5
+    revisions[4].volume = 1001
+
+    inserted, revised = await upsert_prices_chunked(revisions)
+
+    assert inserted[symbol] == 0
+    assert revised[symbol] == 5